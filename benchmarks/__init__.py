@@ -0,0 +1,2 @@
+"""Offline benchmarks for MochaBot subsystems"""
+# Run from the repository root, e.g. `python -m benchmarks.reminder_scheduler`
@@ -0,0 +1,110 @@
+"""Local cluster test: launcher.py clusters of real bot.py processes against a fake Discord
+
+Starts FakeDiscord (benchmarks/fake_discord.py) with G guilds over S shards
+and a Launcher running C clusters pointed at it, with a temporary database.
+Checks and times:
+  * every shard identifying, with identifies spaced out by the hub across processes
+  * the hub's cross-cluster totals matching the fake's guild and user counts
+  * !info, sent on one cluster's shard, answering with the all-cluster server count
+  * a killed cluster being restarted and its shards coming back
+  * a clean shutdown of every process
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.fake_discord import FakeDiscord
+from launcher import Launcher
+
+
+async def wait_until(condition, timeout):
+    """Seconds until `condition()` held; raises if it doesn't within `timeout`"""
+    started = time.monotonic()
+    while not condition():
+        if time.monotonic() - started > timeout:
+            raise TimeoutError(f'gave up after {timeout:.0f}s')
+        await asyncio.sleep(0.05)
+    return time.monotonic() - started
+
+
+def servers_field(message):
+    for embed in message['embeds']:
+        for field in embed.get('fields', []):
+            if field['name'] == '🏠 Servers':
+                return int(field['value'].strip('`').replace(',', ''))
+    return None
+
+
+async def run(args):
+    fake = await FakeDiscord(guilds=args.guilds, members=args.members, shard_count=args.shards).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, **fake.env, 'DATABASE_URL': f'sqlite:///{os.path.join(tmp, "bot.db")}'}
+        launcher = Launcher(args.clusters, args.shards, identify_interval=args.identify_interval, env=env)
+        hub = launcher.hub
+        await launcher.start()
+        print(f'{args.clusters} clusters, {args.shards} shards, {args.guilds} guilds '
+              f'({args.identify_interval:g}s identify interval):')
+        ok = True
+        try:
+            took = await wait_until(lambda: len(fake.ready) == args.shards, args.timeout)
+            gaps = [b[0] - a[0] for a, b in zip(fake.identifies, fake.identifies[1:])]
+            spaced = min(gaps, default=args.identify_interval) >= args.identify_interval * 0.95
+            print(f'  all shards ready after {took:.1f}s; {len(fake.identifies)} identifies, '
+                  f'smallest gap {min(gaps, default=0):.2f}s -> spaced by the hub: {spaced}')
+            ok &= spaced
+
+            users = args.guilds * args.members + 1
+            took = await wait_until(lambda: hub.totals()['guilds'] == args.guilds
+                                    and hub.totals()['clusters'] == len(launcher.processes), args.timeout)
+            totals = hub.totals()
+            print(f'  hub totals {totals["guilds"]} guilds, {totals["users"]} users (bot counted once per cluster, '
+                  f'{users} distinct), {totals["connected"]}/{totals["shards"]} shards, settled {took:.2f}s later')
+
+            for process in (launcher.processes[0], launcher.processes[-1]):
+                guild_index = process.shard_ids[0]
+                channel_id = fake.guilds[guild_index]['channels'][0]['id']
+                before = len(fake.posted[channel_id])
+                started = time.monotonic()
+                await fake.send_message(guild_index, '!info')
+                await wait_until(lambda: len(fake.posted[channel_id]) > before, args.timeout)
+                servers = servers_field(fake.posted[channel_id][-1])
+                print(f'  !info on cluster {process.cluster_id}: {servers} servers '
+                      f'(expected {args.guilds}) in {(time.monotonic() - started) * 1000:.0f}ms')
+                ok &= servers == args.guilds
+
+            victim = launcher.processes[-1]
+            identified = len(fake.identifies)
+            started = time.monotonic()
+            victim.process.kill()
+            await wait_until(lambda: victim.restarts == 1, args.timeout)
+            await wait_until(lambda: len(fake.ready) == args.shards and len(fake.identifies) >= identified + len(victim.shard_ids)
+                             and hub.totals()['guilds'] == args.guilds, args.timeout)
+            print(f'  killed cluster {victim.cluster_id} (shards {victim.shard_ids}); restarted and back to '
+                  f'{hub.totals()["guilds"]} guilds in {time.monotonic() - started:.1f}s')
+        finally:
+            started = time.monotonic()
+            await launcher.stop()
+            codes = [process.process.returncode for process in launcher.processes]
+            print(f'  shutdown in {time.monotonic() - started:.1f}s, exit codes {codes}')
+            await fake.stop()
+        print(f'\n{"PASS" if ok else "FAIL"}')
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clusters', type=int, default=2)
+    parser.add_argument('--shards', type=int, default=4)
+    parser.add_argument('--guilds', type=int, default=40)
+    parser.add_argument('--members', type=int, default=5)
+    parser.add_argument('--identify-interval', type=float, default=0.5)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+    raise SystemExit(0 if asyncio.run(run(args)) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark: cold start to first command served, against the local fake Discord
+
+Launches `python bot.py` (or another checkout's bot.py with --bot) pointed at
+FakeDiscord with a fresh database, sends `!info` as soon as the bot has
+identified, and times from spawning the process to the gateway IDENTIFY, to
+the reply being posted and to READY (discord.py holds READY until no guild
+has arrived for 2s, so commands are served well before it). --cold-bytecode
+gives every run an empty bytecode cache, so module compilation is included.
+Prints the median of --runs and the bot's own startup timeline from the
+last run.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_discord import FakeDiscord
+
+BOT_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bot.py')
+
+
+async def wait_until(condition, timeout):
+    started = time.monotonic()
+    while not condition():
+        if time.monotonic() - started > timeout:
+            raise TimeoutError(f'gave up after {timeout:.0f}s')
+        await asyncio.sleep(0.005)
+
+
+def read(path):
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+async def one_run(args, fake, tmp, run):
+    channel_id = fake.guilds[0]['channels'][0]['id']
+    env = {**os.environ, **fake.env, 'DATABASE_URL': f'sqlite:///{os.path.join(tmp, f"bot{run}.db")}'}
+    if args.cold_bytecode:
+        env['PYTHONPYCACHEPREFIX'] = os.path.join(tmp, f'pycache{run}')
+    log_path = os.path.join(tmp, f'bot{run}.log')
+    identified = len(fake.identifies)
+    answered = len(fake.posted[channel_id])
+    with open(log_path, 'wb') as log:
+        started = time.monotonic()
+        process = await asyncio.create_subprocess_exec(sys.executable, args.bot, env=env, stdout=log, stderr=log)
+        try:
+            await wait_until(lambda: len(fake.identifies) > identified and 0 in fake.ready, args.timeout)
+            identify = fake.identifies[-1][0] - started
+            await fake.send_message(0, '!info')
+            await wait_until(lambda: len(fake.posted[channel_id]) > answered, args.timeout)
+            served = time.monotonic() - started
+            await wait_until(lambda: 'is online and ready' in read(log_path), args.timeout)
+            ready = time.monotonic() - started
+        finally:
+            process.send_signal(2)
+            await process.wait()
+    return identify, served, ready, read(log_path)
+
+
+async def run(args):
+    fake = await FakeDiscord(guilds=args.guilds, latency=args.latency).start()
+    identifies, served, ready = [], [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for run_number in range(args.runs):
+            identify, first_command, ready_at, log_text = await one_run(args, fake, tmp, run_number)
+            identifies.append(identify)
+            served.append(first_command)
+            ready.append(ready_at)
+    await fake.stop()
+
+    print(f'{os.path.relpath(args.bot)}: {args.runs} runs, {args.guilds} guilds, {args.latency * 1000:.0f}ms REST latency'
+          + (', empty bytecode cache' if args.cold_bytecode else ''))
+    print(f'  spawn -> IDENTIFY             median {statistics.median(identifies) * 1000:>6.0f}ms '
+          f'(min {min(identifies) * 1000:.0f}ms)')
+    print(f'  spawn -> first command served median {statistics.median(served) * 1000:>6.0f}ms '
+          f'(min {min(served) * 1000:.0f}ms)')
+    print(f'  spawn -> READY                median {statistics.median(ready) * 1000:>6.0f}ms '
+          f'(min {min(ready) * 1000:.0f}ms)')
+    lines = log_text.splitlines()
+    start = next((i for i, line in enumerate(lines) if 'Startup timeline' in line), len(lines))
+    timeline = [lines[start].split(':', 2)[-1]] if start < len(lines) else []
+    timeline += [line for line in lines[start + 1:] if line.startswith('  ') and not line.startswith('  File')]
+    if timeline:
+        print('\nLast run, as logged by the bot:')
+        print('\n'.join(timeline))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bot', default=BOT_SCRIPT, help='bot.py to start (e.g. from another checkout)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--guilds', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.1, help='seconds added to each REST call')
+    parser.add_argument('--cold-bytecode', action='store_true')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
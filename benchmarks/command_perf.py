@@ -0,0 +1,140 @@
+"""Benchmark: what per-command latency histograms cost, in dispatch time, memory and accuracy
+
+  * dispatch: a no-op prefix command run through discord.py's real
+    get_context/invoke path (offline, no gateway), without hooks and with the
+    same before/after invoke hooks bot.py installs
+  * record: CommandStats.record alone
+  * memory: CommandStats after simulated traffic over --commands commands for
+    1h, 24h and 48h, which should stop growing once the 24h window is full
+  * accuracy: reported p50/p95/p99 against the exact values for log-normal latencies
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import tracemalloc
+
+import discord
+from discord.ext import commands
+
+from utils.perf import CommandStats
+
+
+def offline_bot():
+    """A Bot with one no-op command and a message that invokes it, no connection needed"""
+    bot = commands.Bot(command_prefix='!', intents=discord.Intents.default(), help_command=None)
+
+    @bot.command()
+    async def noop(ctx):
+        pass
+
+    state = bot._connection
+    state.user = discord.ClientUser(state=state, data={'id': '1', 'username': 'MochaBot', 'discriminator': '0',
+                                                       'avatar': None, 'bot': True})
+    message = discord.Message(state=state, channel=discord.PartialMessageable(state=state, id=5), data={
+        'id': '10', 'channel_id': '5', 'content': '!noop', 'timestamp': '2024-01-01T00:00:00+00:00',
+        'author': {'id': '2', 'username': 'user', 'discriminator': '0', 'avatar': None},
+        'edited_timestamp': None, 'tts': False, 'mention_everyone': False, 'mentions': [], 'mention_roles': [],
+        'attachments': [], 'embeds': [], 'pinned': False, 'type': 0,
+    })
+    return bot, message
+
+
+async def dispatch_time(bot, message, calls, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            await bot.invoke(await bot.get_context(message))
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+async def dispatch(args):
+    bot, message = offline_bot()
+    without = await dispatch_time(bot, message, args.calls, args.repeat)
+
+    stats = CommandStats()
+
+    @bot.before_invoke
+    async def time_command(ctx):
+        stats.started(ctx)
+
+    @bot.after_invoke
+    async def record_command(ctx):
+        stats.finished(ctx)
+
+    with_hooks = await dispatch_time(bot, message, args.calls, args.repeat)
+    assert stats.series['noop'].tiers[0][-1][1].count >= args.calls
+    return without, with_hooks
+
+
+def record_time(calls, repeat):
+    stats = CommandStats()
+    latencies = [random.lognormvariate(-3, 1) for _ in range(1000)]
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for i in range(calls):
+            stats.record('info', 'General', latencies[i % 1000])
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+def memory(commands_count, per_second):
+    """Bytes held by CommandStats after 1h, 24h and 48h of simulated traffic"""
+    names = [f'command{i}' for i in range(commands_count)]
+    tracemalloc.start()
+    stats = CommandStats()
+    now = stats.since = 0.0
+    sizes = {}
+    for hours in (1, 24, 48):
+        while now < hours * 3600:
+            for _ in range(per_second):
+                stats.record(random.choice(names), 'Cog', random.lognormvariate(-3, 1.2), random.random() < 0.01, now=now)
+            now += 1
+        sizes[hours] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return sizes, stats, now
+
+
+def accuracy(samples):
+    stats = CommandStats()
+    values = [random.lognormvariate(-2.5, 1) for _ in range(samples)]
+    for value in values:
+        stats.record('info', 'General', value, now=0.0)
+    histogram = stats.series['info'].window(300, 1.0)
+    exact = statistics.quantiles(values, n=100)
+    return [(q, exact[q - 1], histogram.percentile(q / 100)) for q in (50, 95, 99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--commands', type=int, default=60, help='distinct commands in the memory test')
+    parser.add_argument('--rate', type=int, default=5, help='commands per second in the memory test')
+    args = parser.parse_args()
+    random.seed(1)
+
+    without, with_hooks = asyncio.run(dispatch(args))
+    print(f'dispatch of a no-op command: {without * 1e6:.1f}µs without hooks, {with_hooks * 1e6:.1f}µs with '
+          f'(+{(with_hooks - without) * 1e6:.1f}µs, {(with_hooks - without) / without:+.1%})')
+    print(f'CommandStats.record alone:   {record_time(args.calls, args.repeat) * 1e6:.2f}µs')
+
+    sizes, stats, now = memory(args.commands, args.rate)
+    print(f'memory for {args.commands} commands at {args.rate}/s: '
+          + ', '.join(f'{hours}h {size / 1024:,.0f} KiB' for hours, size in sizes.items()))
+    started = time.perf_counter()
+    stats.report('24h', now=now)
+    print(f'  !perf 24h report over them: {(time.perf_counter() - started) * 1000:.1f}ms')
+
+    print('percentiles of 100,000 log-normal latencies (exact -> reported):')
+    for q, exact, reported in accuracy(100_000):
+        print(f'  p{q}: {exact * 1000:7.1f}ms -> {reported * 1000:7.1f}ms ({reported / exact - 1:+.1%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,446 @@
+"""Benchmark: every command and listener run offline, with ops/sec, latency and memory per call, against saved baselines
+
+Loads the six feature cogs into the bot from bot.py, with the real shared
+resources from open_resources() (on a throwaway database), and fills its
+connection state with one guild parsed from FakeDiscord's payloads, so
+contexts, guilds, members and messages are the real discord.py objects
+without a gateway. REST calls go to RecordingHTTP, which counts them and
+answers with the payloads Discord would; the quote and coffee image APIs
+get canned JSON. Commands run through get_context/invoke with bot.py's
+invoke hooks, and listeners are bot.py's @bot.event handlers called through
+the event profiler, the way a dispatched event runs them.
+
+Each case reports ops/sec and mean latency (best of --repeat runs of
+--calls calls), the peak bytes allocated during a call and the bytes each
+call leaves behind. --save writes them to --baseline; --check compares
+against it and exits 1 if a case got more than --tolerance slower or
+allocates more than --tolerance more, or now fails where it didn't; a case
+that looks slower is timed a second time before it counts. Timings only
+compare on the machine that saved them, so save a baseline before making a
+change and check after.
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+
+import discord
+
+from benchmarks.fake_discord import BOT_ID, EPOCH_JOINED, FakeDiscord, user
+
+COGS = ('general', 'coffee', 'mentalhealth', 'moderation', 'fun', 'utility')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'commands.json')
+AUTHOR_ID = BOT_ID + 1  # the guild owner, so every permission check passes
+
+# One message per command path worth timing; {member} and {channel} are another member and a second channel
+COMMANDS = [
+    '!ping', '!info', '!stats', '!serverinfo', '!userinfo <@{member}>', '!avatar <@{member}>',
+    '!coffee', '!brew espresso', '!coffeefact', '!coffeeapi', '!coffeequote', '!caffeine latte', '!coffeeshop',
+    '!affirmation', '!breathe', '!ground', '!mood 7 slept well', '!moodstats', '!crisis', '!crisis UK',
+    '!checkin', '!selfcare', '!therapy',
+    '!kick <@{member}> spamming', '!ban <@{member}> 0 spamming', '!unban {member} appeal accepted',
+    '!timeout <@{member}> 10m cooling off', '!untimeout <@{member}>', '!clear 10', '!slowmode 5',
+    '!warn <@{member}> be kind', '!infractions <@{member}>', '!keywords', '!keywords add wellness decaf',
+    '!keywords remove wellness decaf', '!keywords rate wellness 50', '!keywords reset', '!channels',
+    '!channels set welcome <#{channel}>', '!channels clear welcome', '!wellnesstime 09:00 Europe/London', '!lockdown',
+    '!joke', '!8ball Will my latte be good?', '!roll 2d20', '!flip', '!choose latte, mocha, cortado', '!rps rock',
+    '!inspire', '!trivia', '!trivia leaderboard', '!trivia categories',
+    '!poll "Best brew?" Latte Mocha "Flat white"', '!remind 10m stretch', '!reminders', '!reminders cancel 1',
+    '!weather London', '!translate es good morning', '!qr https://example.com', '!shorten example.com/a/long/path',
+    '!base64 encode hello', '!hash sha256 hello', '!timestamp', '!color #8B4513',
+]
+
+
+class RecordingHTTP:
+    """Stands in for discord.py's HTTPClient: counts every call and answers like Discord would
+
+    Routes whose answer a command reads get a payload; every other route returns None.
+    """
+
+    def __init__(self, channels):
+        self.calls = Counter()
+        self.channels = channels  # channel id -> payload, so edits answer with the whole channel
+        self._ids = itertools.count(discord.utils.time_snowflake(datetime.now(timezone.utc)))
+
+    def __getattr__(self, route):
+        async def call(*args, **kwargs):
+            self.calls[route] += 1
+        return call
+
+    def message(self, channel_id, payload=None, message_id=None):
+        payload = payload or {}
+        return {
+            'id': str(message_id or next(self._ids)), 'channel_id': str(channel_id), 'author': user(BOT_ID, 'MochaBot', bot=True),
+            'content': payload.get('content') or '', 'embeds': payload.get('embeds') or [],
+            'components': payload.get('components') or [], 'timestamp': EPOCH_JOINED, 'edited_timestamp': None,
+            'tts': False, 'mention_everyone': False, 'mentions': [], 'mention_roles': [], 'attachments': [],
+            'pinned': False, 'type': 0,
+        }
+
+    async def send_message(self, channel_id, *, params):
+        self.calls['send_message'] += 1
+        return self.message(channel_id, params.payload)
+
+    async def edit_message(self, channel_id, message_id, *, params):
+        self.calls['edit_message'] += 1
+        return self.message(channel_id, params.payload, message_id)
+
+    async def logs_from(self, channel_id, limit, **kwargs):
+        self.calls['logs_from'] += 1
+        return [self.message(channel_id) for _ in range(limit)]
+
+    async def start_private_message(self, user_id):
+        self.calls['start_private_message'] += 1
+        return {'id': str(next(self._ids)), 'type': 1, 'recipients': [user(user_id)]}
+
+    async def get_user(self, user_id):
+        self.calls['get_user'] += 1
+        return user(user_id)
+
+    async def edit_member(self, guild_id, user_id, **fields):
+        self.calls['edit_member'] += 1
+        return {'user': user(user_id), 'roles': [], 'joined_at': EPOCH_JOINED, 'deaf': False, 'mute': False, 'flags': 0,
+                'communication_disabled_until': None}
+
+    async def edit_channel(self, channel_id, **options):
+        self.calls['edit_channel'] += 1
+        return self.channels[str(channel_id)]
+
+
+class CannedResponse:
+    status = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return self.data
+
+
+class CannedWebClient:
+    """WebClient's get() with a fixed answer per service instead of the network"""
+
+    ANSWERS = {
+        'coffee': {'file': 'https://coffee.alexflipnote.dev/abc123_coffee.jpg'},
+        'quotes': {'content': 'Stay hungry, stay foolish.', 'author': 'Steve Jobs'},
+    }
+
+    def get(self, url, service=None, **kwargs):
+        return CannedResponse(self.ANSWERS.get(service, {}))
+
+    def pool_stats(self):
+        return {}
+
+    async def close(self):
+        pass
+
+
+def guild_payload():
+    """FakeDiscord's guild with an author who owns it and an admin role for the bot"""
+    guild = FakeDiscord(guilds=1, members=20).guilds[0]
+    role_id = str(int(guild['id']) + 100)
+    guild = {key: value for key, value in guild.items() if not key.startswith('_')} | {'members': guild['_members']}
+    guild['roles'] = guild['roles'] + [{'id': role_id, 'name': 'MochaBot', 'permissions': '8', 'position': 1,
+                                        'color': 0, 'hoist': False, 'managed': True, 'mentionable': False}]
+    for member in guild['members']:
+        if member['user']['id'] == str(BOT_ID):
+            member['roles'] = [role_id]
+    guild['members'].append(FakeDiscord._member(AUTHOR_ID))
+    return guild
+
+
+def message_payload(guild, content, message_id):
+    channel = guild['channels'][0]
+    mentions = [member['user'] for member in guild['members'] if f'<@{member["user"]["id"]}>' in content]
+    return {
+        'id': str(message_id), 'channel_id': channel['id'], 'guild_id': guild['id'], 'author': user(AUTHOR_ID),
+        'member': {'roles': [], 'joined_at': EPOCH_JOINED, 'deaf': False, 'mute': False, 'flags': 0},
+        'content': content, 'timestamp': EPOCH_JOINED, 'edited_timestamp': None, 'tts': False,
+        'mention_everyone': False, 'mentions': mentions, 'mention_roles': [], 'attachments': [], 'embeds': [],
+        'pinned': False, 'type': 0,
+    }
+
+
+def import_bot(tmp):
+    """bot.py as a module, using a database in `tmp`"""
+    os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+    import bot as mochabot
+
+    mochabot.startup.stop_tracking_imports()
+    logging.getLogger().setLevel(logging.WARNING)
+    return mochabot
+
+
+async def go_offline(mochabot):
+    """Give the bot its shared resources and the six cogs, on one parsed guild and RecordingHTTP"""
+    bot = mochabot.bot
+    await mochabot.open_resources()
+    await bot.web_client.close()
+    bot.web_client = CannedWebClient()
+
+    state = bot._connection
+    state.user = discord.ClientUser(state=state, data=user(BOT_ID, 'MochaBot', bot=True))
+    data = guild_payload()
+    bot.http = state.http = RecordingHTTP({channel['id']: channel | {'guild_id': data['id']} for channel in data['channels']})
+    guild = state._add_guild_from_data(data)
+    bot.member_counters.initialize(guild)
+
+    for cog in COGS:
+        await bot.load_extension(f'cogs.{cog}')
+    return guild, data
+
+
+class Case:
+    """One command or listener call; `run()` awaits it once and returns whether it failed"""
+
+    def __init__(self, name, run, after=None):
+        self.name = name
+        self._run = run
+        self.after = after
+
+    async def run(self):
+        failed = await self._run()
+        if self.after:
+            self.after()
+        return failed
+
+
+def command_cases(mochabot, guild, data):
+    bot = mochabot.bot
+    errors = {}
+
+    async def record_error(ctx, error):
+        errors[ctx.message.content] = error
+
+    # A listener of its own also stops discord.py printing a traceback for every failed call
+    bot.add_listener(record_error, 'on_command_error')
+    target = next(member for member in guild.members if not member.bot and member.id != AUTHOR_ID)
+    channel = guild.text_channels[-1]
+    fun = bot.get_cog('Fun')
+
+    def end_trivia():
+        game = fun.trivia_engine.running(guild.text_channels[0].id)
+        if game is not None:
+            fun.trivia_engine.cancel(game)
+
+    cases = []
+    for i, template in enumerate(COMMANDS):
+        content = template.format(member=target.id, channel=channel.id)
+        message = discord.Message(state=bot._connection, channel=guild.text_channels[0],
+                                  data=message_payload(data, content, 100 + i))
+
+        async def run(message=message):
+            ctx = await bot.get_context(message)
+            await bot.invoke(ctx)
+            return ctx.command_failed or ctx.command is None
+
+        cases.append(Case(template, run, end_trivia if template == '!trivia' else None))
+    return cases, errors
+
+
+def listener_cases(mochabot, guild, data):
+    bot = mochabot.bot
+    profiler = bot.event_profiler
+    channel = guild.text_channels[0]
+    member = next(member for member in guild.members if not member.bot and member.id != AUTHOR_ID)
+    chat = discord.Message(state=bot._connection, channel=channel, data=message_payload(data, 'just brewed a pour over ☕', 1))
+    keyword = discord.Message(state=bot._connection, channel=channel,
+                              data=message_payload(data, 'feeling a bit anxious and stressed today', 2))
+    command = discord.Message(state=bot._connection, channel=channel, data=message_payload(data, '!flip', 3))
+
+    def listener(name, event, handler, *args):
+        profiled = profiler.wrap(handler, event)
+
+        async def run():
+            try:
+                await profiled(*args)
+            except Exception:
+                return True
+            return False
+        return Case(name, run)
+
+    return [
+        listener('on_message (chat)', 'message', mochabot.on_message, chat),
+        listener('on_message (keyword)', 'message', mochabot.on_message, keyword),
+        listener('on_message (!flip)', 'message', mochabot.on_message, command),
+        listener('on_member_join', 'member_join', mochabot.on_member_join, member),
+        listener('on_member_remove', 'member_remove', mochabot.on_member_remove, member),
+        listener('on_presence_update', 'presence_update', mochabot.on_presence_update, member, member),
+        listener('on_guild_channel_update', 'guild_channel_update', mochabot.on_guild_channel_update, channel, channel),
+    ]
+
+
+async def batch_time(case, calls):
+    """Seconds for `calls` calls, with the collector off (like timeit) so a GC pass doesn't land in one case"""
+    random.seed(1)
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(calls):
+            await case.run()
+        return time.perf_counter() - started
+    finally:
+        gc.enable()
+        # Let anything the calls scheduled (delayed deletes, timers) run before the next batch
+        await asyncio.sleep(0)
+
+
+async def allocations(case, calls):
+    """(average peak bytes allocated during a call, bytes still held per call afterwards)"""
+    tracemalloc.start()
+    peaks = []
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(calls):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await case.run()
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return round(sum(peaks) / calls), round(retained / calls)
+
+
+async def measure(cases, calls, repeat):
+    """{case name: result}; each round times one batch of every case, so a busy spell on the machine
+    slows one round of everything rather than every batch of a few cases, and each keeps its best"""
+    failed = {case.name: await case.run() for case in cases}
+    best = dict.fromkeys(failed, float('inf'))
+    for _ in range(repeat):
+        for case in cases:
+            best[case.name] = min(best[case.name], await batch_time(case, calls))
+    results = {}
+    for case in cases:
+        peak, retained = await allocations(case, max(1, calls // 10))
+        results[case.name] = {
+            'ops': round(calls / best[case.name], 1),
+            'mean_us': round(best[case.name] / calls * 1e6, 2),
+            'peak_bytes': peak,
+            'retained_bytes': retained,
+            'failed': failed[case.name],
+        }
+    return results
+
+
+def slower(result, base, tolerance):
+    return base is not None and result['mean_us'] > base['mean_us'] * (1 + tolerance)
+
+
+def regressions(name, result, base, tolerance):
+    if base is None:
+        return []
+    problems = []
+    if slower(result, base, tolerance):
+        problems.append(f'{result["mean_us"] / base["mean_us"] - 1:+.0%} mean latency')
+    # A little absolute slack, so tiny allocations that move by a few objects don't trip it
+    if result['peak_bytes'] > base['peak_bytes'] * (1 + tolerance) + 512:
+        problems.append(f'{result["peak_bytes"] / max(1, base["peak_bytes"]) - 1:+.0%} peak allocation')
+    if result['failed'] and not base['failed']:
+        problems.append('now fails')
+    return [f'{name}: {problem}' for problem in problems]
+
+
+async def run(args, baseline):
+    with tempfile.TemporaryDirectory() as tmp:
+        mochabot = import_bot(tmp)
+        async with mochabot.bot:
+            guild, data = await go_offline(mochabot)
+            try:
+                cases, errors = command_cases(mochabot, guild, data)
+                cases += listener_cases(mochabot, guild, data)
+                if args.only:
+                    cases = [case for case in cases if args.only in case.name]
+                results = await measure(cases, args.calls, args.repeat)
+                # A busy spell on the machine can still slow a case in every round; only a second slow timing counts
+                retry = [case for case in cases if slower(results[case.name], baseline.get(case.name), args.tolerance)]
+                if retry:
+                    print(f'timing {len(retry)} case(s) that look slower than the baseline again')
+                    for name, again in (await measure(retry, args.calls, args.repeat)).items():
+                        if again['mean_us'] < results[name]['mean_us']:
+                            results[name].update(ops=again['ops'], mean_us=again['mean_us'])
+                print(f'{"case":<46}{"ops/sec":>10}{"mean":>11}{"peak/call":>12}{"kept/call":>12}')
+                for name, result in results.items():
+                    flag = '  FAILED' if result['failed'] else ''
+                    print(f'{name[:45]:<46}{result["ops"]:>10,.0f}{result["mean_us"]:>9.1f}µs'
+                          f'{result["peak_bytes"]:>10,} B{result["retained_bytes"]:>10,} B{flag}')
+                for content, error in errors.items():
+                    print(f'  {content}: {type(error).__name__}: {error}')
+                calls = mochabot.bot.http.calls
+                print('REST calls recorded: ' + ', '.join(f'{route} {count:,}' for route, count in calls.most_common()))
+            finally:
+                for cog in COGS:
+                    await mochabot.bot.unload_extension(f'cogs.{cog}')
+                await mochabot.close_resources()
+    return results
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['cases']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--only', help='run only the cases whose name contains this')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--check', action='store_true', help='exit 1 on a regression against the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='allowed slowdown or extra allocation (0.3 = 30%%)')
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline) if args.check else {}
+    results = asyncio.run(run(args, baseline))
+
+    if args.check:
+        problems = [problem for name, result in results.items()
+                    for problem in regressions(name, result, baseline.get(name), args.tolerance)]
+        missing = [name for name in results if name not in baseline]
+        if missing:
+            print(f'not in the baseline yet: {", ".join(missing)}')
+        if problems:
+            print(f'{len(problems)} regression(s) against {args.baseline}:')
+            for problem in problems:
+                print(f'  {problem}')
+            sys.exit(1)
+        print(f'no regressions against {args.baseline} (tolerance {args.tolerance:.0%})')
+
+    if args.save:
+        saved = load_baseline(args.baseline) if args.only and os.path.exists(args.baseline) else {}
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'discord.py': discord.__version__,
+                'machine': platform.platform(),
+                'calls': args.calls,
+                'cases': saved | results,
+            }, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f'saved {len(results)} cases to {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: static informational embeds, built per call vs rendered from templates
+
+For each templated command (!brew, !caffeine, !coffeeshop, !breathe, !ground,
+!crisis, !therapy) compares calling the builder on every invocation, which is
+what the commands used to do, with `EmbedTemplates.render()`. Reports CPU time
+per invocation and the memory each response embed holds on to (measured with
+tracemalloc while keeping the results alive).
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+
+from cogs.coffee import Coffee
+from cogs.mentalhealth import MentalHealth
+from utils.content import ContentPack, ContentStore
+
+
+def cases(coffee, mental):
+    yield 'brew espresso', 'brew', 'espresso', coffee._brew_embed
+    yield 'caffeine (table)', 'caffeine', None, coffee._caffeine_embed
+    yield 'caffeine latte', 'caffeine', 'latte', coffee._caffeine_embed
+    yield 'coffeeshop', 'coffeeshop', None, coffee._coffee_shop_embed
+    yield 'breathe', 'breathe', 'Box Breathing', mental._breathe_embed
+    yield 'ground', 'ground', '5-4-3-2-1 Technique', mental._ground_embed
+    yield 'crisis US', 'crisis', 'US', mental._crisis_embed
+    yield 'therapy', 'therapy', None, mental._therapy_embed
+
+
+def per_call(builder, key):
+    def build():
+        embed = builder(key)
+        embed.timestamp = datetime.utcnow()
+        return embed
+    return build
+
+
+def cpu_time(fn, calls, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.process_time() - started)
+    return best / calls
+
+
+def retained_bytes(fn, calls):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = [fn() for _ in range(calls)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return (after - before) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    content = ContentStore()
+    content.pack = ContentPack.load()
+    bot = SimpleNamespace(db=None, content=content)
+    coffee, mental = Coffee(bot), MentalHealth(bot)
+
+    print(f'{"":<18}{"built per call":>22}{"template render":>22}')
+    print(f'{"":<18}{"cpu":>10}{"memory":>12}{"cpu":>10}{"memory":>12}')
+    for label, name, key, builder in cases(coffee, mental):
+        templates = coffee.templates if builder.__self__ is coffee else mental.templates
+        old = per_call(builder, key)
+        new = lambda: templates.render(name, key)
+        row = []
+        for fn in (old, new):
+            row.append(f'{cpu_time(fn, args.calls, args.repeat) * 1e6:>8.1f}µs')
+            row.append(f'{retained_bytes(fn, args.calls // 4):>10,.0f} B')
+        print(f'{label:<18}' + ''.join(row))
+
+
+if __name__ == '__main__':
+    main()
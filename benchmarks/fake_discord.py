@@ -0,0 +1,389 @@
+"""A local stand-in for Discord's gateway and REST API, for starting the bot and load testing it
+
+Serves `/api/v10/...` and a websocket gateway at `/gateway` from one aiohttp
+app. The gateway speaks plain JSON text frames (discord.py only decompresses
+binary frames): HELLO, heartbeat ACKs, READY and a GUILD_CREATE per guild on
+IDENTIFY, RESUMED on RESUME, and member chunks on request. Guild ids are
+spread so that guild i lands on shard i % shard_count, the way Discord
+routes them. Point a bot at it with DISCORD_API_BASE and DISCORD_GATEWAY_URL.
+
+Traffic goes the other way through send_message, member_join, interaction
+and add_guild. Every REST call is counted by route; messages, interaction
+responses and follow-ups the bot posts are answered like Discord would and
+passed to `watchers`, and anything else gets an empty 204. Per-route rate
+limits send Discord's X-RateLimit headers and answer 429 once a bucket is
+spent, and `throttle` answers that share of calls with a 429 regardless, the
+way a shared limit catches a bot out.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+from collections import Counter, defaultdict
+
+from aiohttp import WSMsgType, web
+
+BOT_ID = 1
+EPOCH_JOINED = '2024-01-01T00:00:00+00:00'
+GUILD_BASE = 1_009_008_000
+API = '/api/v10'
+# What the bot's members get in interactions: everything but administrator
+MEMBER_PERMISSIONS = '2248473465835073'
+SNOWFLAKE = re.compile(r'\d{15,}')
+DISCORD_EPOCH_MS = 1_420_070_400_000
+
+
+def reply(payload=None, status=200):
+    if payload is None:
+        return web.Response(status=status)
+    # discord.py only parses bodies whose content-type is exactly application/json
+    return web.Response(body=json.dumps(payload).encode(), status=status, headers={'Content-Type': 'application/json'})
+
+
+def user(user_id, name=None, bot=False):
+    return {'id': str(user_id), 'username': name or f'user{user_id}', 'discriminator': '0',
+            'global_name': None, 'avatar': None, 'bot': bot}
+
+
+class FakeDiscord:
+    """`guilds` guilds of `members` members each, served over `shard_count` shards
+
+    `latency` seconds are added to every REST response, like the round trip to Discord.
+    `rate_limits` maps routes like 'POST /channels/{channel_id}/messages' to
+    (requests, per seconds), kept per channel, guild or webhook like Discord's
+    buckets; `throttle` is the share of all REST calls answered with a 429.
+    """
+
+    def __init__(self, guilds=20, members=5, shard_count=1, max_concurrency=1, latency=0.0,
+                 rate_limits=None, throttle=0.0, seed=None):
+        self.latency = latency
+        self.shard_count = shard_count
+        self.max_concurrency = max_concurrency
+        self.members = members
+        self.rate_limits = rate_limits or {}
+        self.throttle = throttle
+        self.guilds = [self._guild(i, members) for i in range(guilds)]
+        self.identifies = []  # (monotonic time, shard_id)
+        self.ready = {}  # shard_id -> websocket of the live session
+        self._seq = {}  # shard_id -> last sequence number sent
+        self.resumes = 0
+        self.posted = defaultdict(list)  # channel_id -> message payloads the bot sent
+        self.calls = Counter()  # 'METHOD /route/{param}' -> requests
+        self.rate_limited = Counter()  # route -> 429s answered
+        self.watchers = []  # callables(kind, key, payload) for every reply: ('message', channel_id) or ('interaction', id)
+        self._buckets = {}  # (route, channel/guild/webhook id) -> [remaining, resets at]
+        self._random = random.Random(seed)
+        self._ids = itertools.count(10_000)
+        self._runner = None
+        self.url = None
+
+    @staticmethod
+    def guild_id(i):
+        # Snowflakes route to shard (id >> 22) % shard_count; the base is divisible by every
+        # shard count up to 16 and makes real-length ids, which mention converters insist on
+        return (GUILD_BASE + i) << 22
+
+    def shard_for(self, guild_id):
+        return (guild_id >> 22) % self.shard_count
+
+    def _guild(self, i, members):
+        guild_id = self.guild_id(i)
+        return {
+            'id': str(guild_id),
+            'name': f'Guild {i}',
+            'owner_id': str(BOT_ID + 1),
+            'member_count': members + 1,
+            'large': False,
+            'features': [],
+            'roles': [{'id': str(guild_id), 'name': '@everyone', 'permissions': '2248473465835073',
+                       'position': 0, 'color': 0, 'hoist': False, 'managed': False, 'mentionable': False}],
+            'channels': [{'id': str(guild_id + 1), 'type': 0, 'name': 'general', 'position': 0,
+                          'permission_overwrites': [], 'nsfw': False, 'parent_id': None},
+                         {'id': str(guild_id + 2), 'type': 0, 'name': 'welcome', 'position': 1,
+                          'permission_overwrites': [], 'nsfw': False, 'parent_id': None}],
+            'emojis': [], 'stickers': [], 'threads': [], 'stage_instances': [],
+            'guild_scheduled_events': [], 'voice_states': [], 'presences': [], 'members': [],
+            'joined_at': EPOCH_JOINED, 'premium_tier': 0, 'verification_level': 0, 'mfa_level': 0,
+            'explicit_content_filter': 0, 'default_message_notifications': 0, 'nsfw_level': 0,
+            'system_channel_flags': 0, 'preferred_locale': 'en-US', 'unavailable': False,
+            '_members': [self._member(guild_id * 10 + n) for n in range(members)] + [self._member(BOT_ID, bot=True)],
+        }
+
+    @staticmethod
+    def _member(user_id, bot=False):
+        return {'user': user(user_id, bot=bot), 'roles': [], 'joined_at': EPOCH_JOINED, 'deaf': False, 'mute': False, 'flags': 0}
+
+    @web.middleware
+    async def rest(self, request, handler):
+        """Round trip latency, call counts and rate limits for every REST route"""
+        if not request.path.startswith(API):
+            return await handler(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        canonical = request.match_info.route.resource.canonical
+        path = canonical[len(API):] if canonical != f'{API}/{{tail}}' else SNOWFLAKE.sub('{id}', request.path[len(API):])
+        route = f'{request.method} {path}'
+        self.calls[route] += 1
+        if self.throttle and self._random.random() < self.throttle:
+            self.rate_limited[route] += 1
+            return self._too_many(0.05, {'X-RateLimit-Scope': 'shared'})
+        limit = self.rate_limits.get(route)
+        if limit is None:
+            return await handler(request)
+        requests, per = limit
+        info = request.match_info
+        key = (route, info.get('channel_id') or info.get('guild_id') or info.get('application_id'))
+        now = time.time()
+        bucket = self._buckets.get(key)
+        if bucket is None or now >= bucket[1]:
+            bucket = self._buckets[key] = [requests, now + per]
+        headers = {
+            'X-RateLimit-Limit': str(requests),
+            'X-RateLimit-Remaining': str(max(0, bucket[0] - 1)),
+            'X-RateLimit-Reset': f'{bucket[1]:.3f}',
+            'X-RateLimit-Reset-After': f'{bucket[1] - now:.3f}',
+            'X-RateLimit-Bucket': f'{abs(hash(route)):x}',
+        }
+        if bucket[0] <= 0:
+            self.rate_limited[route] += 1
+            return self._too_many(bucket[1] - now, {**headers, 'X-RateLimit-Scope': 'user'})
+        bucket[0] -= 1
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    @staticmethod
+    def _too_many(retry_after, headers):
+        # Without Via discord.py takes a 429 for a Cloudflare ban and gives up instead of retrying
+        return web.Response(
+            body=json.dumps({'message': 'You are being rate limited.', 'retry_after': round(retry_after, 3), 'global': False}).encode(),
+            status=429, headers={**headers, 'Via': '1.1 google', 'Retry-After': str(max(1, round(retry_after))), 'Content-Type': 'application/json'})
+
+    def app(self):
+        app = web.Application(middlewares=[self.rest])
+        app.router.add_get(f'{API}/users/@me', self.me)
+        app.router.add_get(f'{API}/oauth2/applications/@me', self.application)
+        app.router.add_get(f'{API}/gateway', self.gateway_info)
+        app.router.add_get(f'{API}/gateway/bot', self.gateway_info)
+        app.router.add_post(f'{API}/channels/{{channel_id}}/messages', self.create_message)
+        app.router.add_patch(f'{API}/channels/{{channel_id}}/messages/{{message_id}}', self.edit_message)
+        app.router.add_put(f'{API}/channels/{{channel_id}}/messages/{{message_id}}/reactions/{{emoji}}/@me', self.no_content)
+        app.router.add_post(f'{API}/interactions/{{interaction_id}}/{{token}}/callback', self.interaction_callback)
+        app.router.add_post(f'{API}/webhooks/{{application_id}}/{{token}}', self.followup)
+        app.router.add_route('*', f'{API}/webhooks/{{application_id}}/{{token}}/messages/{{message_id}}', self.followup)
+        app.router.add_route('*', f'{API}/{{tail:.*}}', self.no_content)
+        app.router.add_get('/gateway', self.gateway)
+        return app
+
+    async def start(self, host='127.0.0.1', port=0):
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.url = f'http://{host}:{site._server.sockets[0].getsockname()[1]}'
+        return self
+
+    async def stop(self):
+        for ws in list(self.ready.values()):
+            await ws.close()
+        await self._runner.cleanup()
+
+    @property
+    def env(self):
+        """Environment that points a bot process here"""
+        return {
+            'DISCORD_TOKEN': 'fake-token',
+            'DISCORD_API_BASE': f'{self.url}/api/v10',
+            'DISCORD_GATEWAY_URL': f'{self.url.replace("http", "ws", 1)}/gateway',
+        }
+
+    # REST
+
+    async def me(self, request):
+        return reply(user(BOT_ID, 'MochaBot', bot=True))
+
+    async def application(self, request):
+        return reply({'id': str(BOT_ID), 'name': 'MochaBot', 'icon': None, 'description': '', 'summary': '',
+                      'verify_key': '', 'bot_public': True, 'bot_require_code_grant': False, 'flags': 0,
+                      'owner': user(BOT_ID + 1, 'owner'), 'team': None, 'rpc_origins': []})
+
+    async def gateway_info(self, request):
+        return reply({'url': f'{self.url.replace("http", "ws", 1)}/gateway', 'shards': self.shard_count,
+                      'session_start_limit': {'total': 1000, 'remaining': 1000, 'reset_after': 0,
+                                              'max_concurrency': self.max_concurrency}})
+
+    def _message(self, channel_id, body, message_id=None):
+        return {
+            'id': str(message_id or next(self._ids)), 'channel_id': str(channel_id), 'author': user(BOT_ID, 'MochaBot', bot=True),
+            'content': body.get('content') or '', 'embeds': body.get('embeds') or [], 'components': body.get('components') or [],
+            'timestamp': EPOCH_JOINED, 'edited_timestamp': None, 'tts': False, 'mention_everyone': False, 'mentions': [],
+            'mention_roles': [], 'attachments': [], 'pinned': False, 'type': 0,
+        }
+
+    def _notify(self, kind, key, payload):
+        for watcher in self.watchers:
+            watcher(kind, key, payload)
+
+    async def create_message(self, request):
+        body = await request.json()
+        channel_id = request.match_info['channel_id']
+        message = self._message(channel_id, body)
+        self.posted[channel_id].append(message)
+        self._notify('message', channel_id, message)
+        return reply(message)
+
+    async def edit_message(self, request):
+        body = await request.json()
+        return reply(self._message(request.match_info['channel_id'], body, request.match_info['message_id']))
+
+    async def interaction_callback(self, request):
+        body = await request.json()
+        interaction_id = request.match_info['interaction_id']
+        data = body.get('data') or {}
+        self._notify('interaction', interaction_id, data)
+        answer = {'interaction': {'id': interaction_id, 'type': 2}, 'resource': {'type': body['type']}}
+        if body['type'] == 4:
+            message = self._message(0, data)
+            answer['interaction']['response_message_id'] = message['id']
+            answer['resource']['message'] = message
+        elif body['type'] == 5:
+            answer['interaction']['response_message_loading'] = True
+        return reply(answer)
+
+    async def followup(self, request):
+        body = await request.json() if request.can_read_body else {}
+        message = self._message(0, body, request.match_info.get('message_id', '').replace('@original', '') or None)
+        if request.method == 'POST':
+            self._notify('followup', request.match_info['token'], message)
+        return reply(message)
+
+    async def no_content(self, request):
+        return reply(status=204)
+
+    # Gateway
+
+    async def dispatch(self, shard_id, event, data):
+        """Send an event to whichever session holds a shard; False if it isn't connected"""
+        ws = self.ready.get(shard_id)
+        if ws is None or ws.closed:
+            return False
+        self._seq[shard_id] += 1
+        await ws.send_str(json.dumps({'op': 0, 't': event, 's': self._seq[shard_id], 'd': data}))
+        return True
+
+    async def send_message(self, guild_index, content, author_id=2):
+        """Have a member post `content` in a guild's channel, on the shard that guild belongs to"""
+        guild = self.guilds[guild_index]
+        return await self.dispatch(self.shard_for(int(guild['id'])), 'MESSAGE_CREATE', {
+            'id': str(next(self._ids)), 'channel_id': guild['channels'][0]['id'], 'guild_id': guild['id'],
+            'author': user(author_id), 'member': {'roles': [], 'joined_at': EPOCH_JOINED, 'deaf': False, 'mute': False, 'flags': 0},
+            'content': content, 'timestamp': EPOCH_JOINED, 'edited_timestamp': None, 'tts': False,
+            'mention_everyone': False, 'mentions': [], 'mention_roles': [], 'attachments': [], 'embeds': [],
+            'pinned': False, 'type': 0,
+        })
+
+    async def member_join(self, guild_index, user_id=None):
+        """Have a new member join a guild (GUILD_MEMBER_ADD); returns their id, or None if the shard isn't connected"""
+        guild = self.guilds[guild_index]
+        member = self._member(user_id or next(self._ids))
+        guild['_members'].append(member)
+        guild['member_count'] += 1
+        sent = await self.dispatch(self.shard_for(int(guild['id'])), 'GUILD_MEMBER_ADD', {**member, 'guild_id': guild['id']})
+        return int(member['user']['id']) if sent else None
+
+    async def interaction(self, guild_index, command, options=None, author_id=2):
+        """Have a member run a slash command with string options; returns the interaction id, or None if the shard isn't connected"""
+        guild = self.guilds[guild_index]
+        channel = guild['channels'][0]
+        # Interactions expire 15 minutes after the time in their id, so it has to be now
+        interaction_id = (int(time.time() * 1000) - DISCORD_EPOCH_MS) << 22 | next(self._ids) & 0x3FFFFF
+        sent = await self.dispatch(self.shard_for(int(guild['id'])), 'INTERACTION_CREATE', {
+            'id': str(interaction_id), 'application_id': str(BOT_ID), 'type': 2, 'token': f'token-{interaction_id}',
+            'version': 1, 'guild_id': guild['id'], 'channel_id': channel['id'], 'channel': {**channel, 'guild_id': guild['id']},
+            'member': {'user': user(author_id), 'roles': [], 'joined_at': EPOCH_JOINED, 'deaf': False, 'mute': False,
+                       'flags': 0, 'permissions': MEMBER_PERMISSIONS},
+            'data': {'id': str(next(self._ids)), 'name': command, 'type': 1,
+                     'options': [{'name': name, 'type': 3, 'value': value} for name, value in (options or {}).items()]},
+            'locale': 'en-US', 'guild_locale': 'en-US', 'app_permissions': MEMBER_PERMISSIONS, 'entitlements': [],
+            'authorizing_integration_owners': {'0': guild['id']}, 'context': 0, 'attachment_size_limit': 10_485_760,
+        })
+        return interaction_id if sent else None
+
+    async def add_guild(self, members=None):
+        """Have the bot join a new guild (GUILD_CREATE on the shard it belongs to); returns its index"""
+        guild = self._guild(len(self.guilds), self.members if members is None else members)
+        self.guilds.append(guild)
+        await self.dispatch(self.shard_for(int(guild['id'])), 'GUILD_CREATE', self._public(guild))
+        return len(self.guilds) - 1
+
+    def _public(self, guild):
+        return {key: value for key, value in guild.items() if not key.startswith('_')}
+
+    async def _identify(self, ws, data):
+        shard_id, shard_count = data.get('shard') or [0, 1]
+        self.identifies.append((time.monotonic(), shard_id))
+        self._seq[shard_id] = 0
+        guilds = [guild for guild in self.guilds if self.shard_for(int(guild['id'])) == shard_id]
+        self.ready[shard_id] = ws
+        await self.dispatch(shard_id, 'READY', {
+            'v': 10, 'user': user(BOT_ID, 'MochaBot', bot=True), 'session_id': f'session-{shard_id}-{time.time()}',
+            'resume_gateway_url': f'{self.url.replace("http", "ws", 1)}/gateway', 'shard': [shard_id, shard_count],
+            'guilds': [{'id': guild['id'], 'unavailable': True} for guild in guilds],
+            'application': {'id': str(BOT_ID), 'flags': 0}, 'private_channels': [], 'relationships': [],
+        })
+        for guild in guilds:
+            await self.dispatch(shard_id, 'GUILD_CREATE', self._public(guild))
+        return shard_id
+
+    async def _members(self, shard_id, data):
+        guild = next((g for g in self.guilds if g['id'] == str(data['guild_id'])), None)
+        if guild is None:
+            return
+        await self.dispatch(shard_id, 'GUILD_MEMBERS_CHUNK', {
+            'guild_id': guild['id'], 'members': guild['_members'], 'chunk_index': 0, 'chunk_count': 1,
+            'nonce': data.get('nonce'), 'presences': [],
+        })
+
+    async def gateway(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        shard_id = None
+        await ws.send_str(json.dumps({'op': 10, 'd': {'heartbeat_interval': 41_250}}))
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(message.data)
+            op, data = payload['op'], payload.get('d')
+            if op == 1:
+                await ws.send_str(json.dumps({'op': 11}))
+            elif op == 2:
+                shard_id = await self._identify(ws, data)
+            elif op == 6:
+                # Session ids are 'session-<shard>-<time>', so a resume says which shard it is
+                self.resumes += 1
+                shard_id = int(data['session_id'].split('-')[1])
+                self.ready[shard_id] = ws
+                await self.dispatch(shard_id, 'RESUMED', {})
+            elif op == 8:
+                await self._members(shard_id, data)
+        if shard_id is not None and self.ready.get(shard_id) is ws:
+            del self.ready[shard_id]
+        return ws
+
+
+async def main():
+    fake = await FakeDiscord(guilds=10, shard_count=2).start()
+    print('Fake Discord running; point a bot at it with:')
+    for key, value in fake.env.items():
+        print(f'  {key}={value}')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await fake.stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
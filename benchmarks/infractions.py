@@ -0,0 +1,75 @@
+"""Benchmark: !infractions lookups and warn escalation checks on a large ledger
+
+Seeds one guild with hundreds of thousands of historic infractions, then
+times the two queries behind `!infractions` and the cached escalation
+check that runs on every warn.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from utils.db import Database
+from utils.infractions import InfractionLedger
+
+ACTIONS = ['warn', 'warn', 'warn', 'timeout', 'kick', 'ban']
+
+
+async def run(rows, members, queries):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        await db.connect()
+        ledger = InfractionLedger(db)
+        await ledger.load()
+
+        guild_id, heavy_member = 1, 42
+        now = time.time()
+        seed = [
+            (guild_id, heavy_member if i % 100 == 0 else random.randint(1000, 1000 + members), 7,
+             random.choice(ACTIONS), 'seeded', None, now - random.uniform(0, 3 * 365 * 86400))
+            for i in range(rows)
+        ]
+        await db.executemany(
+            'INSERT INTO infractions (guild_id, member_id, moderator_id, action, reason, duration, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)', seed
+        )
+        started = time.perf_counter()
+        await ledger.load()
+        load_elapsed = time.perf_counter() - started
+
+        samples = []
+        for _ in range(queries):
+            started = time.perf_counter()
+            await ledger.totals(guild_id, heavy_member)
+            await ledger.history(guild_id, heavy_member)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+
+        started = time.perf_counter()
+        for _ in range(100_000):
+            ledger.should_escalate(guild_id, heavy_member)
+        check_elapsed = time.perf_counter() - started
+
+        print(f'ledger rows:        {rows:,} ({rows // 100:,} for the looked-up member)')
+        print(f'load + backfill:    {load_elapsed * 1000:.0f}ms')
+        print(f'!infractions:       median {statistics.median(samples):.2f}ms, '
+              f'p95 {samples[int(len(samples) * 0.95) - 1]:.2f}ms, max {samples[-1]:.2f}ms')
+        print(f'escalation check:   {check_elapsed / 100_000 * 1e6:.2f}µs')
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--members', type=int, default=50_000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.members, args.queries))
+
+
+if __name__ == '__main__':
+    main()
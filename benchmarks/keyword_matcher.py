@@ -0,0 +1,90 @@
+"""Benchmark: on_message keyword scanning, substring loops vs the compiled matcher
+
+Times the original `any(k in content ...)` loops and KeywordMatcher.match
+over synthetic chat messages, then reports the share of one CPU core each
+needs to keep up with 1k, 10k and 100k messages per second. Runs once with
+the default keyword sets and once with a guild that added extra keywords.
+"""
+
+import argparse
+import random
+import time
+
+from utils.keywords import DEFAULT_CATEGORIES, KeywordMatcher
+
+FILLER = ('hey', 'anyone', 'around', 'today', 'the', 'meeting', 'ran', 'long', 'lol', 'game', 'tonight',
+          'crusade', 'brewery', 'thanks', 'for', 'the', 'help', 'yesterday', 'weekend', 'plans', 'maybe')
+KEYWORDS = [k for category in DEFAULT_CATEGORIES.values() for k in category['keywords']]
+
+
+def make_messages(count, hit_rate=0.1, seed=1):
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(3, 25))]
+        if rng.random() < hit_rate:
+            words.insert(rng.randrange(len(words)), rng.choice(KEYWORDS))
+        messages.append(' '.join(words))
+    return messages
+
+
+def substring_loop(mental, coffee):
+    def scan(content):
+        content = content.lower()
+        if any(k in content for k in mental):
+            return 'mental'
+        elif any(k in content for k in coffee):
+            return 'coffee'
+        return None
+    return scan
+
+
+def with_extra_keywords(extra):
+    """Default categories plus `extra` made-up keywords split across them"""
+    rng = random.Random(2)
+    categories = {name: dict(category, keywords=list(category['keywords'])) for name, category in DEFAULT_CATEGORIES.items()}
+    for i in range(extra):
+        word = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9)))
+        categories['mental' if i % 2 else 'coffee']['keywords'].append(word)
+    return categories
+
+
+def measure(fn, messages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for message in messages:
+            fn(message)
+        best = min(best, time.perf_counter() - started)
+    return best / len(messages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--extra-keywords', type=int, default=200)
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages)
+    for label, categories in (('default keywords', DEFAULT_CATEGORIES),
+                              (f'+{args.extra_keywords} guild keywords', with_extra_keywords(args.extra_keywords))):
+        loop = substring_loop(categories['mental']['keywords'], categories['coffee']['keywords'])
+        matcher = KeywordMatcher(categories)
+        results = {
+            'substring loop': measure(loop, messages, args.repeat),
+            'compiled matcher': measure(matcher.match, messages, args.repeat),
+        }
+        false_hits = sum(1 for m in messages if loop(m) and not matcher.match(m))
+
+        print(f'{label}: {args.messages:,} messages, {false_hits:,} substring-only hits (e.g. "sad" in "crusade")')
+        print(f'{"":<18}{"per message":>12}{"1k msg/s":>11}{"10k msg/s":>11}{"100k msg/s":>12}')
+        for name, per_message in results.items():
+            shares = [f'{per_message * rate:.1%}' for rate in (1_000, 10_000, 100_000)]
+            print(f'{name:<18}{per_message * 1e6:>10.2f}µs{shares[0]:>11}{shares[1]:>11}{shares[2]:>12}')
+        print()
+    print('(rate columns are the share of one core spent scanning at that message rate)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""Load test: the bot under realistic gateway traffic from the local fake Discord, end to end
+
+Starts FakeDiscord and `python bot.py` pointed at it (over --shards
+shards), waits until it is ready, then sends traffic for --duration
+seconds: member messages (a --chat share of them plain chatter, the rest
+commands), slash command interactions, members joining and the bot being
+added to new guilds, each at its own rate per second. Arrivals are Poisson,
+so bursts happen the way they do for real.
+
+Command latency is end to end, from the event leaving the gateway to the
+bot's reply reaching REST: commands carry a token the bot echoes back, and
+interaction responses are matched by id. Prints latency percentiles, the
+message rate the bot sustained, REST calls by route and the 429s it was
+given (--rate-limit puts Discord's 5 per 5s per channel limit on sends,
+--throttle answers a share of all calls with a 429). --record saves the
+traffic as a JSON lines trace and --replay sends a saved trace again, at
+--speed times its pace, so two versions of the bot can be compared on
+exactly the same load.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import signal
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from benchmarks.cold_start import BOT_SCRIPT, read, wait_until
+from benchmarks.fake_discord import FakeDiscord
+
+TOKEN = re.compile(r'load-\d+')
+# Commands that echo their argument, so a reply can be matched to the message that asked for it
+COMMANDS = (
+    '!8ball is {token} going to be a good day?',
+    '!choose {token}, decaf, oat latte',
+    '!translate es {token}',
+    '!qr https://example.com/{token}',
+)
+CHAT = (
+    'morning everyone ☕',
+    'anyone tried cold brew with oat milk?',
+    'feeling a bit anxious about tomorrow',
+    'thanks, that really helped',
+    'what are you all drinking today?',
+)
+SEND_ROUTE = 'POST /channels/{channel_id}/messages'
+
+
+def generate(args):
+    """Trace events for --duration seconds of Poisson arrivals at each rate, in time order"""
+    rng = random.Random(args.seed)
+    tokens = itertools.count()
+    rates = {'message': args.messages, 'interaction': args.interactions,
+             'member_join': args.joins, 'guild_create': args.new_guilds}
+    events = []
+    for event, rate in rates.items():
+        if rate <= 0:
+            continue
+        t = rng.expovariate(rate)
+        while t < args.duration:
+            entry = {'t': round(t, 4), 'event': event}
+            if event in ('message', 'interaction', 'member_join'):
+                entry['guild'] = rng.randrange(args.guilds)
+            if event == 'message':
+                if rng.random() < args.chat:
+                    entry['content'] = rng.choice(CHAT)
+                else:
+                    entry['content'] = rng.choice(COMMANDS).format(token=f'load-{next(tokens)}')
+            elif event == 'interaction':
+                entry['command'] = '8ball'
+                entry['options'] = {'question': f'is load-{next(tokens)} ready?'}
+            events.append(entry)
+            t += rng.expovariate(rate)
+    events.sort(key=lambda entry: entry['t'])
+    return events
+
+
+def save_trace(path, header, events):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header) + '\n')
+        for entry in events:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def load_trace(path):
+    """(header, events) from a trace file; the first line describes the run it came from"""
+    with open(path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    return lines[0], lines[1:]
+
+
+def percentiles(values):
+    if len(values) < 2:
+        return None
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p90': cuts[89], 'p99': cuts[98], 'max': max(values)}
+
+
+class Tracker:
+    """Matches the bot's replies to the events that asked for them"""
+
+    def __init__(self):
+        self.sent = {}  # token or interaction id -> (kind, monotonic send time)
+        self.latencies = {'message': [], 'interaction': []}
+        self.answered_at = []
+
+    def expect(self, key, kind, at):
+        self.sent[key] = (kind, at)
+
+    def __call__(self, kind, key, payload):
+        now = time.monotonic()
+        if kind == 'message':
+            match = TOKEN.search(json.dumps(payload['embeds']) + payload['content'])
+            key = match.group() if match else None
+        expected = self.sent.pop(key, None)
+        if expected is not None:
+            self.latencies[expected[0]].append(now - expected[1])
+            self.answered_at.append(now)
+
+
+async def fire(fake, tracker, entry):
+    event = entry['event']
+    now = time.monotonic()
+    if event == 'message':
+        for token in TOKEN.findall(entry['content']):
+            tracker.expect(token, 'message', now)
+        await fake.send_message(entry['guild'], entry['content'])
+    elif event == 'interaction':
+        interaction_id = await fake.interaction(entry['guild'], entry['command'], entry.get('options'))
+        if interaction_id is not None:
+            tracker.expect(str(interaction_id), 'interaction', now)
+    elif event == 'member_join':
+        await fake.member_join(entry['guild'])
+    elif event == 'guild_create':
+        await fake.add_guild()
+
+
+async def drive(fake, tracker, events, speed):
+    """Send every event at its time (divided by `speed`); returns (seconds taken, how late events went out)"""
+    started = time.monotonic()
+    lateness = []
+    for entry in events:
+        due = started + entry['t'] / speed
+        delay = due - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        lateness.append(max(0.0, time.monotonic() - due))
+        await fire(fake, tracker, entry)
+    return time.monotonic() - started, lateness
+
+
+def report(events, tracker, fake, elapsed, lateness, speed):
+    sent = Counter(entry['event'] for entry in events)
+    lag = percentiles(lateness)
+    print(f'sent over {elapsed:.1f}s: ' + ', '.join(f'{count:,} {event}' for event, count in sent.items())
+          + (f' (driver running late by p99 {lag["p99"] * 1000:.1f}ms, max {lag["max"] * 1000:.1f}ms)' if lag else ''))
+    messages = sent['message']
+    answered = len(tracker.answered_at)
+    print(f'sustained {messages / elapsed:,.1f} messages/s in, {answered / elapsed:,.1f} commands/s answered'
+          + (f' x{speed} speed' if speed != 1 else ''))
+    for kind, values in tracker.latencies.items():
+        cuts = percentiles(values)
+        if cuts is None:
+            continue
+        print(f'  {kind:<12} command latency over {len(values):,} replies: '
+              + ', '.join(f'{name} {seconds * 1000:,.1f}ms' for name, seconds in cuts.items()))
+    unanswered = Counter(kind for kind, _ in tracker.sent.values())
+    if unanswered:
+        print('  never answered: ' + ', '.join(f'{count:,} {kind}' for kind, count in unanswered.items()))
+    welcomes = sum(len(fake.posted[guild['channels'][1]['id']]) for guild in fake.guilds)
+    print(f'  welcome messages posted for {sent["member_join"]:,} joins: {welcomes:,}')
+    print(f'REST calls: {sum(fake.calls.values()):,}, 429s answered: {sum(fake.rate_limited.values()):,}')
+    for route, count in fake.calls.most_common(8):
+        limited = fake.rate_limited.get(route)
+        print(f'  {count:>8,}  {route}' + (f'  ({limited:,} rate limited)' if limited else ''))
+
+
+async def main_async(args):
+    if args.replay:
+        header, events = load_trace(args.replay)
+        args.guilds, args.shards = header['guilds'], header['shards']
+        print(f'replaying {len(events):,} events from {args.replay} ({header["duration"]}s recorded)')
+    else:
+        header = {'trace': 1, 'guilds': args.guilds, 'shards': args.shards, 'duration': args.duration, 'seed': args.seed}
+        events = generate(args)
+    if args.record:
+        save_trace(args.record, header, events)
+        print(f'recorded {len(events):,} events to {args.record}')
+
+    rate_limits = {}
+    if args.rate_limit:
+        requests, per = args.rate_limit.split('/')
+        rate_limits[SEND_ROUTE] = (int(requests), float(per))
+    fake = await FakeDiscord(guilds=args.guilds, members=args.members, shard_count=args.shards, latency=args.latency,
+                             rate_limits=rate_limits, throttle=args.throttle, seed=args.seed).start()
+    tracker = Tracker()
+    fake.watchers.append(tracker)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, **fake.env, 'DATABASE_URL': f'sqlite:///{os.path.join(tmp, "load.db")}'}
+        if args.shards > 1:
+            env['SHARD_COUNT'] = str(args.shards)
+        log_path = args.log or os.path.join(tmp, 'bot.log')
+        with open(log_path, 'wb') as log:
+            process = await asyncio.create_subprocess_exec(sys.executable, args.bot, env=env, stdout=log, stderr=log)
+            try:
+                await wait_until(lambda: 'is online and ready' in read(log_path), args.timeout)
+                elapsed, lateness = await drive(fake, tracker, events, args.speed)
+                try:
+                    await wait_until(lambda: not tracker.sent, args.drain)
+                except TimeoutError:
+                    pass
+                report(events, tracker, fake, elapsed, lateness, args.speed)
+                if process.returncode is not None:
+                    print(f'the bot exited with {process.returncode} during the run:\n{read(log_path)[-3000:]}')
+            except TimeoutError:
+                print(read(log_path)[-3000:])
+                raise
+            finally:
+                if process.returncode is None:
+                    process.send_signal(signal.SIGINT)
+                await process.wait()
+                await fake.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bot', default=BOT_SCRIPT, help='bot.py to start (e.g. from another checkout)')
+    parser.add_argument('--guilds', type=int, default=50)
+    parser.add_argument('--members', type=int, default=20)
+    parser.add_argument('--shards', type=int, default=1)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds of traffic')
+    parser.add_argument('--messages', type=float, default=100.0, help='messages per second')
+    parser.add_argument('--chat', type=float, default=0.5, help='share of messages that are chat rather than commands')
+    parser.add_argument('--interactions', type=float, default=10.0, help='slash commands per second')
+    parser.add_argument('--joins', type=float, default=2.0, help='members joining per second')
+    parser.add_argument('--new-guilds', type=float, default=0.1, help='guilds added per second')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to each REST call')
+    parser.add_argument('--rate-limit', help='message sends allowed per channel, e.g. 5/5 (Discord\'s own limit)')
+    parser.add_argument('--throttle', type=float, default=0.0, help='share of REST calls answered with a 429')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--record', help='save the traffic to this trace file')
+    parser.add_argument('--replay', help='send the traffic from this trace file instead of generating it')
+    parser.add_argument('--speed', type=float, default=1.0, help='replay pace, 2 = twice as fast')
+    parser.add_argument('--drain', type=float, default=10.0, help='seconds to wait for outstanding replies')
+    parser.add_argument('--log', help='keep the bot\'s output in this file')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
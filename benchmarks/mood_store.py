@@ -0,0 +1,71 @@
+"""Benchmark: mood journal write-behind throughput and !moodstats query latency
+
+Seeds several years of entries for one heavy user plus background users,
+then times a burst of `log()` calls, the batched flush, and `stats()` for
+the 7d/30d/90d windows.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from utils.db import Database
+from utils.mood_store import MoodStore
+
+
+async def run(years, per_day, other_users, queries):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        await db.connect()
+        store = MoodStore(db, batch_size=1000)
+        await store.load()
+
+        now = time.time()
+        heavy_user = 1
+        days = int(years * 365)
+        started = time.perf_counter()
+        for day in range(days, 0, -1):
+            for slot in range(per_day):
+                store.log(heavy_user, 7, random.randint(1, 10), None, now - day * 86400 + slot * 3600)
+        for user_id in range(2, other_users + 2):
+            for day in range(30, 0, -1):
+                store.log(user_id, 7, random.randint(1, 10), None, now - day * 86400)
+        queued = len(store._queue)
+        enqueue_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await store.flush()
+        flush_elapsed = time.perf_counter() - started
+
+        print(f'entries:          {queued:,} ({days * per_day:,} for the heavy user)')
+        print(f'log() enqueue:    {enqueue_elapsed / queued * 1e6:.2f}µs per entry')
+        print(f'batched flush:    {flush_elapsed:.2f}s ({queued / flush_elapsed:,.0f} entries/s)')
+
+        for window in (7, 30, 90):
+            samples = []
+            for _ in range(queries):
+                started = time.perf_counter()
+                await store.stats(heavy_user, window, now=now)
+                samples.append((time.perf_counter() - started) * 1000)
+            samples.sort()
+            print(f'stats({window:>2}d):       median {statistics.median(samples):.2f}ms, '
+                  f'p95 {samples[int(len(samples) * 0.95) - 1]:.2f}ms')
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=float, default=5)
+    parser.add_argument('--per-day', type=int, default=4)
+    parser.add_argument('--other-users', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.years, args.per_day, args.other_users, args.queries))
+
+
+if __name__ == '__main__':
+    main()
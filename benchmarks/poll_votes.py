@@ -0,0 +1,81 @@
+"""Benchmark: button poll vote cost and how many message edits a burst of votes causes
+
+Drives PollManager with N votes from distinct users spread evenly over a
+window (some users change their vote), using a temporary SQLite database
+and a refresh callback that simulates a message edit taking `--edit-ms`.
+Reports per-vote latency, the number of edits, and checks the tallies
+against a recount and against a reload from the database.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from utils.db import Database
+from utils.polls import PollManager
+
+
+async def run(args):
+    edits = []
+
+    async def refresh(poll):
+        edits.append(time.monotonic())
+        await asyncio.sleep(args.edit_ms / 1000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        await db.connect()
+        manager = PollManager(db, refresh, edit_interval=args.edit_interval)
+        await manager.load()
+        options = [f'Option {i}' for i in range(args.options)]
+        poll = await manager.create(1, 2, 3, 'Best brew?', options, time.time() + 3600)
+        await manager.attach(poll, 4)
+
+        rng = random.Random(1)
+        gap = args.seconds / args.votes
+        latencies = []
+        started = time.monotonic()
+        for i in range(args.votes):
+            user_id = rng.randrange(int(args.votes * 0.8)) if rng.random() < 0.2 else 10_000 + i
+            t0 = time.perf_counter()
+            await manager.vote(poll, user_id, rng.randrange(args.options))
+            latencies.append((time.perf_counter() - t0) * 1000)
+            await asyncio.sleep(max(0.0, started + (i + 1) * gap - time.monotonic()))
+        # Let the trailing edit land
+        await asyncio.sleep(args.edit_interval + args.edit_ms / 1000 + 0.1)
+
+        latencies.sort()
+        print(f'{args.votes:,} votes over {args.seconds:g}s, {poll.total:,} distinct voters, '
+              f'edit interval {args.edit_interval:g}s')
+        print(f'vote():  median {statistics.median(latencies):.3f}ms, p99 {latencies[int(len(latencies) * 0.99) - 1]:.3f}ms')
+        print(f'edits:   {len(edits)} (undebounced would be {args.votes:,})')
+
+        recount = [0] * args.options
+        for option in poll.votes.values():
+            recount[option] += 1
+        reloaded = PollManager(db, refresh)
+        await reloaded.load()
+        print(f'tallies: {poll.tallies} (recount matches: {recount == poll.tallies}, '
+              f'reload matches: {reloaded.polls[poll.id].tallies == poll.tallies})')
+
+        manager.stop()
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--votes', type=int, default=1000)
+    parser.add_argument('--seconds', type=float, default=60)
+    parser.add_argument('--options', type=int, default=4)
+    parser.add_argument('--edit-interval', type=float, default=10.0)
+    parser.add_argument('--edit-ms', type=float, default=150)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
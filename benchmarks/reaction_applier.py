@@ -0,0 +1,154 @@
+"""Benchmark: awaited add_reaction loops vs background apply_reactions against a local REST stand-in
+
+Starts a local stand-in for Discord's reaction endpoint (aiohttp.web) with
+per-request latency and a per-channel rate-limit bucket that answers with
+real bucket headers and 429s, and points discord.py's HTTP client at it.
+For 3, 4 and 10 reactions it measures how long the command is held up and
+how long until every reaction is on the message, for the old awaited loop
+and for apply_reactions, and checks the reactions arrived in order.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import defaultdict, deque
+from urllib.parse import unquote
+
+import discord
+from aiohttp import web
+from discord.http import HTTPClient, Route
+
+from utils.reactions import apply_reactions
+
+EMOJIS = ['☕', '🥤', '🍫', '💝', '🌱', '✨', '🇦', '🇧', '🇨', '🇩']
+
+
+def reply(payload=None, status=200, headers=None):
+    if payload is None:
+        return web.Response(status=status, headers=headers)
+    # discord.py only parses bodies whose content-type is exactly application/json
+    body = json.dumps(payload).encode()
+    return web.Response(body=body, status=status, headers={**(headers or {}), 'Content-Type': 'application/json'})
+
+
+class FakeReactions:
+    """PUT .../reactions/{emoji}/@me with latency and a per-channel bucket of `limit` per `window` seconds"""
+
+    def __init__(self, latency, limit, window):
+        self.latency = latency
+        self.limit = limit
+        self.window = window
+        self.hits = defaultdict(deque)
+        self.arrivals = defaultdict(list)
+        self.rate_limited = 0
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/api/v10/users/@me', self.me)
+        app.router.add_put('/api/v10/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me', self.react)
+        return app
+
+    async def me(self, request):
+        return reply({'id': '1', 'username': 'MochaBot', 'discriminator': '0', 'avatar': None})
+
+    async def react(self, request):
+        await asyncio.sleep(self.latency / 2)
+        channel_id = request.match_info['channel_id']
+        now = time.monotonic()
+        hits = self.hits[channel_id]
+        while hits and now - hits[0] >= self.window:
+            hits.popleft()
+        if len(hits) >= self.limit:
+            self.rate_limited += 1
+            retry_after = self.window - (now - hits[0])
+            await asyncio.sleep(self.latency / 2)
+            return reply({'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': False},
+                         status=429, headers={'Via': '1.1 google', 'X-RateLimit-Limit': str(self.limit),
+                                              'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': f'{retry_after:.3f}',
+                                              'X-RateLimit-Bucket': 'reactions'})
+        hits.append(now)
+        self.arrivals[request.match_info['message_id']].append(unquote(request.match_info['emoji']))
+        reset_after = self.window - (now - hits[0])
+        await asyncio.sleep(self.latency / 2)
+        return reply(status=204, headers={'X-RateLimit-Limit': str(self.limit),
+                                          'X-RateLimit-Remaining': str(self.limit - len(hits)),
+                                          'X-RateLimit-Reset-After': f'{reset_after:.3f}',
+                                          'X-RateLimit-Bucket': 'reactions'})
+
+
+class FakeMessage:
+    def __init__(self, http, channel_id, message_id):
+        self.http = http
+        self.channel_id = channel_id
+        self.id = message_id
+
+    async def add_reaction(self, emoji):
+        await self.http.add_reaction(self.channel_id, self.id, emoji)
+
+
+async def serial(message, emojis):
+    """The old command tail: the command waits for every reaction"""
+    for emoji in emojis:
+        await message.add_reaction(emoji)
+
+
+async def measure(args, fake, http, count, next_id):
+    emojis = EMOJIS[:count]
+    rows = {'awaited loop': ([], []), 'apply_reactions': ([], [])}
+    in_order = True
+    for _ in range(args.rounds):
+        for name, (blocked, complete) in rows.items():
+            message_id = next_id()
+            # A fresh channel per message, so buckets from earlier rounds don't carry over
+            message = FakeMessage(http, message_id, message_id)
+            started = time.perf_counter()
+            if name == 'awaited loop':
+                await serial(message, emojis)
+                blocked.append(time.perf_counter() - started)
+            else:
+                task = apply_reactions(message, emojis)
+                blocked.append(time.perf_counter() - started)
+                await task
+            complete.append(time.perf_counter() - started)
+            in_order &= fake.arrivals[str(message_id)] == emojis
+    for name, (blocked, complete) in rows.items():
+        print(f'  {count:>2} reactions  {name:<16} command held {statistics.median(blocked) * 1000:>7.1f}ms   '
+              f'all applied {statistics.median(complete) * 1000:>7.1f}ms')
+    return in_order
+
+
+async def run(args):
+    ids = iter(range(1_000_000, 10_000_000))
+    for limit, window in ((1, 0.25), (5, 1.0)):
+        fake = FakeReactions(args.latency, limit, window)
+        runner = web.AppRunner(fake.app())
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        Route.BASE = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/api/v10'
+        http = HTTPClient(asyncio.get_running_loop())
+        await http.static_login('fake-token')
+
+        print(f'bucket {limit} per {window:g}s, {args.latency * 1000:.0f}ms round trip (median of {args.rounds}):')
+        in_order = True
+        for count in (3, 4, 10):
+            in_order &= await measure(args, fake, http, count, lambda: next(ids))
+        print(f'  order preserved: {in_order}, 429s: {fake.rate_limited}\n')
+
+        await http.close()
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.08)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    discord.utils.setup_logging(level=40)
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark: schedule and fire cost of the persistent reminder scheduler
+
+Schedules N reminders into a temporary SQLite database, measures the
+per-reminder cost of `schedule()`, the memory held by the heap, and the
+cost of firing them all in batches from the single dispatcher path.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+from utils.db import Database
+from utils.scheduler import ReminderScheduler
+
+
+async def run(count, batch_size):
+    delivered = 0
+
+    async def deliver(rows):
+        nonlocal delivered
+        delivered += len(rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        await db.connect()
+        scheduler = ReminderScheduler(db, deliver, batch_size=batch_size)
+        await scheduler.load()
+
+        # Schedule through the public API (one INSERT per reminder, like !remind)
+        now = time.time()
+        started = time.perf_counter()
+        for i in range(count):
+            await scheduler.schedule(1000 + i % 5000, 42, 7, f'reminder {i}', now + 3600 + i)
+        schedule_elapsed = time.perf_counter() - started
+
+        # Cold load, as after a restart; what stays allocated afterwards is the heap
+        restarted = ReminderScheduler(db, deliver, batch_size=batch_size)
+        tracemalloc.start()
+        started = time.perf_counter()
+        await restarted.load()
+        load_elapsed = time.perf_counter() - started
+        heap_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Everything is overdue as far as fire_due() is concerned: drain in batches
+        started = time.perf_counter()
+        far_future = now + 3600 + count + 1
+        while await restarted.fire_due(now=far_future):
+            pass
+        fire_elapsed = time.perf_counter() - started
+        await db.close()
+
+    print(f'reminders:        {count:,} (batch size {batch_size})')
+    print(f'schedule:         {schedule_elapsed:.2f}s total, {schedule_elapsed / count * 1e6:.1f}µs per reminder')
+    print(f'heap memory:      {heap_bytes / 1024 / 1024:.1f} MiB ({heap_bytes / count:.0f} bytes per reminder)')
+    print(f'load on restart:  {load_elapsed * 1000:.0f}ms')
+    print(f'fire:             {fire_elapsed:.2f}s total, {fire_elapsed / count * 1e6:.1f}µs per reminder')
+    print(f'delivered:        {delivered:,}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.count, args.batch_size))
+
+
+if __name__ == '__main__':
+    main()
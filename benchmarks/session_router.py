@@ -0,0 +1,190 @@
+"""Benchmark: 10k concurrent interactive sessions, wait_for checks and Views vs SessionRouter
+
+Compares three ways of keeping N interactive messages live:
+  * a `wait_for` check per session on a real discord.Client (every event runs every check)
+  * a discord.py View per session with a 180s timeout (routed by message id, one timeout task each)
+  * SessionRouter (two dict lookups per event, one heap and one task for all timeouts)
+reporting per-event routing cost, setup cost, memory, asyncio tasks, and how
+promptly the router expires all N sessions when they time out together:
+sliding ones pushed back by a press, and fixed ones like trivia rounds not.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import discord
+from discord.ui.view import ViewStore
+
+from utils.sessions import SessionRouter
+
+
+class FakeResponse:
+    async def edit_message(self, **kwargs):
+        pass
+
+    async def send_message(self, *args, **kwargs):
+        pass
+
+
+def interaction(message_id, user_id):
+    return SimpleNamespace(message=SimpleNamespace(id=message_id), user=SimpleNamespace(id=user_id), response=FakeResponse())
+
+
+def measure_setup(build):
+    """(result, seconds, bytes allocated) for a setup function"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, allocated
+
+
+async def bench_wait_for(args):
+    client = discord.Client(intents=discord.Intents.none())
+    client.loop = asyncio.get_running_loop()
+
+    def build():
+        waiters = []
+        for message_id in range(args.sessions):
+            def check(event, message_id=message_id, user_id=message_id):
+                return event.message.id == message_id and event.user.id == user_id
+            waiters.append(asyncio.ensure_future(client.wait_for('interaction', check=check, timeout=180)))
+        return waiters
+
+    waiters, setup, memory = measure_setup(build)
+    await asyncio.sleep(0)
+    tasks = len(asyncio.all_tasks())
+    # Events for messages nobody is waiting on, so every check runs and fails
+    event = interaction(-1, -1)
+    started = time.perf_counter()
+    for _ in range(args.events):
+        client.dispatch('interaction', event)
+    per_event = (time.perf_counter() - started) / args.events
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    return per_event, setup, memory, tasks
+
+
+async def bench_views(args):
+    store = ViewStore(None)
+
+    def build():
+        views = []
+        for message_id in range(args.sessions):
+            view = discord.ui.View(timeout=180.0)
+            for label in ('A', 'B', 'C', 'D'):
+                view.add_item(discord.ui.Button(label=label, custom_id=f'trivia:{label}'))
+            store.add_view(view, message_id)
+            views.append(view)
+        return views
+
+    views, setup, memory = measure_setup(build)
+    await asyncio.sleep(0)
+    tasks = len(asyncio.all_tasks())
+    for view in views:
+        view.stop()
+    await asyncio.sleep(0)
+    return None, setup, memory, tasks
+
+
+async def bench_router(args):
+    router = SessionRouter()
+    router.start()
+
+    async def on_component(interaction, action):
+        await interaction.response.edit_message(embed=None)
+
+    async def on_timeout():
+        pass
+
+    def build():
+        for message_id in range(args.sessions):
+            router.open(message_id, message_id, kind='menu', timeout=180.0,
+                        on_component=on_component, on_timeout=on_timeout)
+
+    _, setup, memory = measure_setup(build)
+    await asyncio.sleep(0)
+    tasks = len(asyncio.all_tasks())
+    events = [interaction(i % args.sessions, i % args.sessions) for i in range(args.events)]
+    timings = []
+    for event in events:
+        t0 = time.perf_counter()
+        await router.dispatch_component(event, 0)
+        timings.append(time.perf_counter() - t0)
+    per_event = statistics.median(timings)
+    assert router.routed == args.events and len(router) == args.sessions
+    router.stop()
+    return per_event, setup, memory, tasks
+
+
+async def bench_expiry(args):
+    """Open every session with the same short timeout and time how long after the deadline they all expire
+
+    Half are sliding and half fixed; a tenth of each get a press halfway
+    through, which should push only the sliding ones back by half a second.
+    """
+    router = SessionRouter()
+    router.start()
+    fired = {}
+    done = asyncio.Event()
+
+    async def on_component(interaction, action):
+        pass
+
+    def on_timeout(message_id):
+        async def expired():
+            fired[message_id] = time.monotonic()
+            if len(fired) == args.sessions:
+                done.set()
+        return expired
+
+    for message_id in range(args.sessions):
+        router.open(message_id, message_id, kind='menu' if message_id % 2 else 'trivia', timeout=1.0,
+                    sliding=bool(message_id % 2), on_component=on_component, on_timeout=on_timeout(message_id))
+    deadline = time.monotonic() + 1.0
+    await asyncio.sleep(0.5)
+    pressed = set(range(0, args.sessions, 10)) | set(range(1, args.sessions, 10))
+    for message_id in sorted(pressed):
+        await router.dispatch_component(interaction(message_id, message_id), 0)
+    await done.wait()
+    router.stop()
+    on_time = [at for message_id, at in fired.items() if not (message_id % 2 and message_id in pressed)]
+    pushed = [at for message_id, at in fired.items() if message_id % 2 and message_id in pressed]
+    return max(on_time) - deadline, max(pushed) - deadline, len(router)
+
+
+async def run(args):
+    print(f'{args.sessions:,} live sessions, {args.events:,} events:')
+    rows = (
+        ('wait_for checks', await bench_wait_for(args)),
+        ('View per session', await bench_views(args)),
+        ('SessionRouter', await bench_router(args)),
+    )
+    for name, (per_event, setup, memory, tasks) in rows:
+        route = f'{per_event * 1e6:>9.2f}µs/event' if per_event is not None else '  (by message id)'
+        print(f'  {name:<17} route {route}   setup {setup * 1000:>6.0f}ms   '
+              f'memory {memory / 1e6:>6.1f}MB   tasks {tasks:>6,}')
+
+    on_time, pushed, left = await bench_expiry(args)
+    print(f'\nExpiry ({args.sessions:,} sessions, half fixed and half sliding, 1s timeout, 10% pressed at 0.5s):')
+    print(f'  fixed and unpressed all expired {on_time * 1000:.0f}ms after the deadline, '
+          f'pressed sliding ones {pushed * 1000:.0f}ms after it (expected ~500ms), {left} left live')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=10_000)
+    parser.add_argument('--events', type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""Benchmark: trivia answers with many concurrent games, old wait_for checks vs the engine
+
+The old command parked a `wait_for('reaction_add')` check per game, so every
+reaction in the bot ran through every pending check; this drives a real
+discord.Client's dispatch with N pending checks. The engine runs each game
+as a SessionRouter session found by message id; this times button presses
+routed to answers across N running games, finishing them all
+(scores for every player written to a temporary SQLite leaderboard), the
+top-10 and rank queries on a large guild, and loading/picking from a large
+generated question bank.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+import discord
+
+from utils.db import Database
+from utils.sessions import SessionRouter
+from utils.trivia import DIFFICULTIES, UPSERT_SCORE, QuestionBank, TriviaEngine
+
+REACTIONS = ['🇦', '🇧', '🇨', '🇩']
+
+
+async def time_old(games, events):
+    """Seconds per reaction event with `games` pending wait_for checks"""
+    client = discord.Client(intents=discord.Intents.none())
+    client.loop = asyncio.get_running_loop()
+    waiters = []
+    for message_id in range(games):
+        author = SimpleNamespace(id=message_id)
+
+        def check(reaction, user, author=author, message_id=message_id):
+            return user == author and str(reaction.emoji) in REACTIONS and reaction.message.id == message_id
+        waiters.append(asyncio.ensure_future(client.wait_for('reaction_add', check=check, timeout=None)))
+
+    user = SimpleNamespace(id=-1)
+    reaction = SimpleNamespace(emoji='🇦', message=SimpleNamespace(id=-1))
+    started = time.perf_counter()
+    for _ in range(events):
+        client.dispatch('reaction_add', reaction, user)
+    elapsed = (time.perf_counter() - started) / events
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    return elapsed
+
+
+def make_bank_file(path, count):
+    rng = random.Random(1)
+    categories = [f'category{i}' for i in range(20)]
+    questions = [{
+        'category': rng.choice(categories),
+        'difficulty': rng.choice(DIFFICULTIES),
+        'question': f'Question {i}?',
+        'options': ['A', 'B', 'C', 'D'],
+        'answer': rng.choice('ABCD'),
+        'explanation': 'Because.',
+    } for i in range(count)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(questions, f)
+
+
+async def run(args):
+    print(f'Per-answer dispatch cost ({args.events:,} events):')
+    for games in args.games:
+        old = await time_old(games, args.events)
+        print(f'  {games:>4} games  wait_for checks {old * 1e6:>8.1f}µs/event')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank_path = os.path.join(tmp, 'questions.json')
+        make_bank_file(bank_path, args.questions)
+        started = time.perf_counter()
+        bank = QuestionBank.load(bank_path)
+        load_time = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(10_000):
+            bank.pick('category3', 'hard', avoid=(1, 2, 3))
+        pick_time = (time.perf_counter() - started) / 10_000
+        print(f'\nQuestion bank: {len(bank):,} questions loaded in {load_time * 1000:.0f}ms, '
+              f'pick {pick_time * 1e6:.2f}µs')
+
+        db = Database(os.path.join(tmp, 'bench.db'))
+        await db.connect()
+        finished = asyncio.Event()
+        done = []
+        target = 0
+
+        async def finish(game, results):
+            done.append(game)
+            if len(done) == target:
+                finished.set()
+
+        async def answered(interaction, game, option, previous):
+            pass
+
+        rng = random.Random(2)
+        for games in args.games:
+            sessions = SessionRouter()
+            sessions.start()
+            engine = TriviaEngine(db, sessions, finish, answered, duration=args.duration)
+            await engine.load(bank_path)
+            done.clear()
+            finished.clear()
+            target = games
+            for message_id in range(games):
+                game = engine.new_game(message_id % 50, message_id, 1)
+                engine.reserve(game)
+                engine.attach(game, message_id)
+            last_deadline = game.ends_at
+            timings = []
+            for player in range(args.players):
+                for message_id in range(games):
+                    press = SimpleNamespace(message=SimpleNamespace(id=message_id), user=SimpleNamespace(id=player))
+                    t0 = time.perf_counter()
+                    await sessions.dispatch_component(press, rng.randrange(4))
+                    timings.append(time.perf_counter() - t0)
+            await finished.wait()
+            settle = time.time() - last_deadline
+            sessions.stop()
+            print(f'  {games:>4} games  routed answer {statistics.median(timings) * 1e6:>5.2f}µs/answer, '
+                  f'all finished and {games * args.players:,} scores saved {settle * 1000:.0f}ms after the last deadline')
+
+        # A big guild's leaderboard
+        await db.executemany(UPSERT_SCORE, [(999, user_id, rng.randrange(5000), 1) for user_id in range(args.leaderboard)])
+        engine = TriviaEngine(db, SessionRouter(), finish, answered)
+        timings, ranks = [], []
+        for _ in range(50):
+            t0 = time.perf_counter()
+            await engine.top(999, 10)
+            timings.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            await engine.standing(999, rng.randrange(args.leaderboard))
+            ranks.append(time.perf_counter() - t0)
+        print(f'\nLeaderboard with {args.leaderboard:,} players: top 10 {statistics.median(timings) * 1000:.2f}ms, '
+              f'rank {statistics.median(ranks) * 1000:.2f}ms')
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--players', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=2.0)
+    parser.add_argument('--questions', type=int, default=50_000)
+    parser.add_argument('--leaderboard', type=int, default=50_000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
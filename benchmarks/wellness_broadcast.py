@@ -0,0 +1,195 @@
+"""Benchmark: daily wellness broadcast to 10k fake guilds, sequential vs the Broadcaster
+
+Starts a local stand-in for Discord's REST API (aiohttp.web) and points
+discord.py's HTTP client at it. The stand-in adds per-request latency with
+a slow tail, fails a share of requests with 500 once, forbids a share of
+channels outright, and enforces a global requests-per-second limit with
+real 429 responses. Then it times the old one-guild-at-a-time loop on a
+sample (extrapolated to all guilds) and the Broadcaster on every guild.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+
+import discord
+from aiohttp import web
+from discord.http import HTTPClient, Route, handle_message_parameters
+
+from utils.broadcast import Broadcaster
+
+
+def reply(payload, status=200, headers=None):
+    # discord.py only parses bodies whose content-type is exactly application/json
+    return web.Response(body=json.dumps(payload).encode(), status=status,
+                        headers={**(headers or {}), 'Content-Type': 'application/json'})
+
+
+class FakeDiscord:
+    """Just enough of the REST API for channel.send, with latency, errors and a global rate limit"""
+
+    def __init__(self, global_rate, latency, slow_share, error_share, forbidden_share, seed=1):
+        self.global_rate = global_rate
+        self.latency = latency
+        self.slow_share = slow_share
+        self.error_share = error_share
+        self.forbidden_share = forbidden_share
+        self.rng = random.Random(seed)
+        self.recent = deque()
+        self.counts = {'requests': 0, 'delivered': 0, '429': 0, '500': 0, '403': 0}
+        self.failed_once = set()
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/api/v10/users/@me', self.me)
+        app.router.add_post('/api/v10/channels/{channel_id}/messages', self.create_message)
+        return app
+
+    async def me(self, request):
+        return reply({'id': '1', 'username': 'MochaBot', 'discriminator': '0', 'avatar': None})
+
+    def _over_global_limit(self):
+        now = time.monotonic()
+        while self.recent and now - self.recent[0] > 1.0:
+            self.recent.popleft()
+        if len(self.recent) >= self.global_rate:
+            return 1.0 - (now - self.recent[0])
+        self.recent.append(now)
+        return None
+
+    async def create_message(self, request):
+        self.counts['requests'] += 1
+        channel_id = int(request.match_info['channel_id'])
+        retry_after = self._over_global_limit()
+        if retry_after is not None:
+            self.counts['429'] += 1
+            return reply(
+                {'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': True},
+                status=429, headers={'Via': '1.1 google', 'X-RateLimit-Global': 'true', 'Retry-After': str(retry_after)}
+            )
+
+        slow = self.rng.random() < self.slow_share
+        await asyncio.sleep(self.latency * self.rng.uniform(0.5, 1.5) * (20 if slow else 1))
+
+        rate_headers = {'X-RateLimit-Limit': '5', 'X-RateLimit-Remaining': '4',
+                        'X-RateLimit-Reset-After': '5.0', 'X-RateLimit-Bucket': f'messages-{channel_id}'}
+        roll = (channel_id * 2654435761 % 10_000) / 10_000
+        if roll < self.forbidden_share:
+            self.counts['403'] += 1
+            return reply({'message': 'Missing Permissions', 'code': 50013}, status=403, headers=rate_headers)
+        if roll < self.forbidden_share + self.error_share and channel_id not in self.failed_once:
+            self.failed_once.add(channel_id)
+            self.counts['500'] += 1
+            return reply({'message': 'Internal Server Error', 'code': 0}, status=500, headers=rate_headers)
+
+        self.counts['delivered'] += 1
+        return reply({'id': str(channel_id), 'channel_id': str(channel_id)}, headers=rate_headers)
+
+
+class FakeChannel:
+    def __init__(self, http, channel_id):
+        self.http = http
+        self.id = channel_id
+
+    async def send(self, embed):
+        with handle_message_parameters(embed=embed) as params:
+            await self.http.send_message(self.id, params=params)
+
+
+class FakeGuild:
+    def __init__(self, guild_id, channels):
+        self.id = guild_id
+        self.name = f'guild-{guild_id}'
+        self.channels = channels
+
+
+def make_embed():
+    embed = discord.Embed(title="🌸 Daily Wellness Reminder", description="💙 Check in with yourself today.", color=0x87CEEB)
+    embed.add_field(name="🛠️ Quick Tools", value="`!checkin` • `!breathe` • `!affirmation` • `!selfcare`", inline=False)
+    return embed
+
+
+async def send_wellness(guild, embed):
+    # Mirrors bot.wellness_sender: next candidate channel on Forbidden
+    error = None
+    for channel in guild.channels:
+        try:
+            await channel.send(embed=embed)
+            return True
+        except discord.Forbidden as e:
+            error = e
+    if error:
+        raise error
+    return False
+
+
+async def sequential(guilds, embed):
+    """The old daily_wellness_check loop: one guild at a time, log and move on"""
+    sent = failed = 0
+    for guild in guilds:
+        try:
+            if await send_wellness(guild, embed):
+                sent += 1
+        except Exception:
+            failed += 1
+    return sent, failed
+
+
+async def run(args):
+    fake = FakeDiscord(args.global_rate, args.latency, args.slow_share, args.error_share, args.forbidden_share)
+    runner = web.AppRunner(fake.app())
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    Route.BASE = f'http://127.0.0.1:{port}/api/v10'
+
+    http = HTTPClient(asyncio.get_running_loop())
+    await http.static_login('fake-token')
+    guilds = [FakeGuild(i, [FakeChannel(http, 10_000_000 + i)]) for i in range(1, args.guilds + 1)]
+    embed = make_embed()
+
+    print(f'stand-in API: {args.latency * 1000:.0f}ms latency ({args.slow_share:.0%} at 20x), '
+          f'{args.error_share:.0%} fail once with 500, {args.forbidden_share:.1%} forbidden, '
+          f'{args.global_rate}/s global limit')
+
+    sample = guilds[:args.sample]
+    started = time.perf_counter()
+    sent, failed = await sequential(sample, embed)
+    elapsed = time.perf_counter() - started
+    print(f'sequential loop:  {len(sample):,} guilds in {elapsed:.1f}s ({len(sample) / elapsed:,.0f}/s, '
+          f'{sent:,} sent, {failed:,} failed) -> ~{elapsed / len(sample) * len(guilds) / 60:.1f} min for {len(guilds):,}')
+
+    fake.counts = dict.fromkeys(fake.counts, 0)
+    fake.failed_once.clear()
+    broadcaster = Broadcaster(concurrency=args.concurrency, rate=args.rate, base_delay=0.5, progress_every=0)
+    report = await broadcaster.run(guilds, lambda guild: send_wellness(guild, embed), label='wellness')
+    print(f'broadcaster:      {len(guilds):,} guilds in {report.elapsed:.1f}s ({len(guilds) / report.elapsed:,.0f}/s, '
+          f'{report.sent:,} sent, {report.failed:,} failed, {report.retries:,} engine retries)')
+    print(f'  server saw {fake.counts["requests"]:,} requests: {fake.counts["429"]:,} global 429s, '
+          f'{fake.counts["500"]:,} 500s (retried by discord.py), {fake.counts["403"]:,} 403s')
+
+    await http.close()
+    await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--guilds', type=int, default=10_000)
+    parser.add_argument('--sample', type=int, default=300, help='guilds timed with the sequential loop')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--rate', type=float, default=450, help='Broadcaster requests/s (Discord default is 50)')
+    parser.add_argument('--global-rate', type=int, default=500, help='stand-in global limit, requests/s')
+    parser.add_argument('--latency', type=float, default=0.08)
+    parser.add_argument('--slow-share', type=float, default=0.01)
+    parser.add_argument('--error-share', type=float, default=0.01)
+    parser.add_argument('--forbidden-share', type=float, default=0.005)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
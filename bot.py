@@ -8,6 +8,12 @@ Combining the comfort of coffee culture with mental health resources,
 this bot provides a safe, supportive environment for community wellness.
 """
 
+from utils.startup import StartupTimeline
+
+# Started before anything else is imported, so the timeline covers the imports too
+startup = StartupTimeline()
+startup.track_imports()
+
 import discord
 from discord.ext import commands, tasks
 import asyncio
@@ -18,11 +24,31 @@ import json
 from typing import Optional
 import aiohttp
 import logging
+import yarl
+from utils.http import WebClient
+from utils.db import Database
+from utils.keywords import KeywordReactions
+from utils.templates import EmbedTemplates
+from utils.channels import ChannelIndex
+from utils.broadcast import Broadcaster
+from utils.wellness import WellnessSchedule
+from utils.metrics import MetricsSampler
+from utils.member_counts import MemberCounters
+from utils.sessions import SessionRouter
+from utils.shards import ShardMonitor, format_latency
+from utils.cluster import ClusterLink
+from utils.content import ContentStore
+from utils.perf import CommandStats
+from utils.events import EventProfiler
+
+startup.add_phase('imports', 0.0)
 
 # =========================
 # Logging Configuration (standardized)
 # =========================
-logging.basicConfig(level=logging.INFO)
+# Clusters started by launcher.py tag their lines so interleaved output stays readable
+logging.basicConfig(level=logging.INFO,
+                    format=f"[cluster {os.environ['CLUSTER_ID']}] {logging.BASIC_FORMAT}" if 'CLUSTER_ID' in os.environ else logging.BASIC_FORMAT)
 logger = logging.getLogger("mochabot")
 
 # =========================
@@ -50,40 +76,133 @@ intents.message_content = True
 intents.members = True
 intents.guilds = True
 
+# Sharding (opt-in): SHARD_COUNT=auto takes Discord's recommended count, or set a number;
+# SHARD_IDS (e.g. "0,1") runs only those shards in this process and needs a numeric SHARD_COUNT
+SHARD_COUNT = os.getenv("SHARD_COUNT", "").strip().lower()
+SHARD_IDS = os.getenv("SHARD_IDS", "").strip()
 
-class MochaHelpCommand(commands.HelpCommand):
-    """Custom help command with beautiful embeds and coffee + mental health theme"""
+# Advanced: send REST and gateway traffic elsewhere (a rate-limit proxy, or a local stand-in for testing)
+DISCORD_API_BASE = os.getenv("DISCORD_API_BASE", "")
+DISCORD_GATEWAY_URL = os.getenv("DISCORD_GATEWAY_URL", "")
+if DISCORD_API_BASE:
+    discord.http.Route.BASE = DISCORD_API_BASE
+if DISCORD_GATEWAY_URL:
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(DISCORD_GATEWAY_URL)
+
+# Event listeners taking longer than this (wall time, in ms) are logged with their event and guild
+EVENT_BUDGET_MS = float(os.getenv("EVENT_BUDGET_MS", "250"))
+
+
+def visible_commands(commands_list):
+    """Commands shown in help: not hidden, sorted by name"""
+    return sorted((c for c in commands_list if not c.hidden), key=lambda c: c.name)
+
+
+class HelpPages:
+    """Help embeds built once per prefix and rebuilt only when cogs change
     
-    def __init__(self):
-        super().__init__()
-        self.verify_checks = False
-        self.show_hidden = False
+    Every page that doesn't depend on who asked (the bot overview, each cog,
+    each command and the paged commands list) is prebuilt with EmbedTemplates
+    the first time a prefix is used. MochaBot.add_cog/remove_cog call
+    `invalidate()`, so loading, unloading or reloading an extension
+    rebuilds them on the next !help.
+    """
     
-    def get_command_signature(self, command):
-        """Get the command signature with proper formatting"""
-        return f'{self.context.clean_prefix}{command.qualified_name} {command.signature}'
+    COMMANDS_PER_PAGE = 45
     
-    async def send_bot_help(self, mapping):
-        """Send the main help page with all categories"""
+    def __init__(self, bot):
+        self.bot = bot
+        self._by_prefix = {}
+    
+    def invalidate(self):
+        self._by_prefix.clear()
+    
+    def templates(self, prefix):
+        templates = self._by_prefix.get(prefix)
+        if templates is None:
+            templates = self._by_prefix[prefix] = self._build(prefix)
+        return templates
+    
+    def render(self, prefix, name, key=None):
+        return self.templates(prefix).render(name, key)
+    
+    def command(self, prefix, command):
+        """Page for a command or group; hidden ones aren't prebuilt, so build those on demand"""
+        embed = self.render(prefix, 'command', command.qualified_name)
+        if embed is None:
+            embed = self._command_embed(prefix, command)
+            embed.timestamp = datetime.utcnow()
+        return embed
+    
+    def page_count(self, prefix):
+        return len(self.templates(prefix).keys('commands'))
+    
+    def home(self, prefix, user):
+        """The bot overview page, finished for the user who asked"""
+        embed = self.render(prefix, 'bot')
+        if self.bot.user and self.bot.user.avatar:
+            embed.set_thumbnail(url=self.bot.user.avatar.url)
+        embed.set_footer(
+            text=f"Requested by {user} | MochaBot v{BOT_VERSION} | You matter 💙",
+            icon_url=user.avatar.url if user.avatar else None
+        )
+        return embed
+    
+    def bot_info(self):
+        """Live bot stats, so never prebuilt"""
+        embed = discord.Embed(title="ℹ️ MochaBot Information", color=BOT_COLOR, timestamp=datetime.utcnow())
+        embed.add_field(name="🤖 Bot Version", value=f"v{BOT_VERSION}", inline=True)
+        embed.add_field(name="🐍 Discord.py Version", value=discord.__version__, inline=True)
+        totals = self.bot.cluster.totals if self.bot.cluster else None
+        embed.add_field(name="🏠 Servers", value=str(totals['guilds'] if totals else len(self.bot.guilds)), inline=True)
+        embed.add_field(name="👥 Users", value=str(totals['users'] if totals else len(self.bot.users)), inline=True)
+        embed.add_field(name="📡 Ping", value=format_latency(self.bot.latency), inline=True)
+        if self.bot.shard_monitor.sharded:
+            embed.add_field(name=f"🧩 Shards ({self.bot.shard_count})", value=self.bot.shard_monitor.lines(), inline=False)
+        if totals:
+            embed.add_field(name="🖧 Clusters",
+                            value=f"#{self.bot.cluster.cluster_id} of {totals['expected']} • {totals['clusters']} reporting",
+                            inline=False)
+        embed.add_field(name="☕ About MochaBot",
+                        value=("Coffee-themed community bot with mental health support: wellness tools, "
+                               "crisis resources, and supportive features."), inline=False)
+        return embed
+    
+    def _mapping(self):
+        mapping = {cog: visible_commands(cog.get_commands()) for cog in self.bot.cogs.values()}
+        mapping[None] = visible_commands(c for c in self.bot.commands if c.cog is None)
+        return mapping
+    
+    def _build(self, prefix):
+        mapping = self._mapping()
+        all_cmds = [cmd for cmds in mapping.values() for cmd in cmds]
+        pages = range(max(1, -(-len(all_cmds) // self.COMMANDS_PER_PAGE)))
+        walked = [c for c in self.bot.walk_commands() if not c.hidden]
+        
+        templates = EmbedTemplates()
+        templates.register('bot', lambda _: self._bot_embed(prefix, mapping))
+        templates.register('mental_health', lambda _: self._mental_health_embed(prefix))
+        templates.register('cog', lambda name: self._cog_embed(prefix, self.bot.get_cog(name)), keys=self.bot.cogs)
+        templates.register('command', lambda name: self._command_embed(prefix, self.bot.get_command(name)),
+                           keys=[c.qualified_name for c in walked])
+        templates.register('commands', lambda page: self._commands_page(prefix, all_cmds, page, len(pages)), keys=pages)
+        return templates
+    
+    def _bot_embed(self, prefix, mapping):
         embed = discord.Embed(
             title="☕ MochaBot Help Menu",
             description=(
                 f"**Welcome to MochaBot v{BOT_VERSION}**\n\n"
                 f"*Your friendly coffee-themed companion for mental wellness and community support!*\n\n"
                 f"**🎯 Purpose:** Combining coffee culture with mental health resources\n"
-                f"**📞 Crisis Support:** Use `{self.context.clean_prefix}crisis` for emergency resources\n"
-                f"**Prefix:** `{self.context.clean_prefix}`\n\n"
-                f"**🔍 Quick Navigation:**\nUse `{self.context.clean_prefix}help <category>` or `{self.context.clean_prefix}help <command>` for detailed information."
+                f"**📞 Crisis Support:** Use `{prefix}crisis` for emergency resources\n"
+                f"**Prefix:** `{prefix}`\n\n"
+                f"**🔍 Quick Navigation:**\nUse `{prefix}help <category>` or `{prefix}help <command>` for detailed information."
             ),
-            color=BOT_COLOR,
-            timestamp=datetime.utcnow()
+            color=BOT_COLOR
         )
         
-        if self.context.bot.user and self.context.bot.user.avatar:
-            embed.set_thumbnail(url=self.context.bot.user.avatar.url)
-        
-        for cog, commands_list in mapping.items():
-            filtered = await self.filter_commands(commands_list, sort=True)
+        for cog, filtered in mapping.items():
             if not filtered:
                 continue
             cog_name = getattr(cog, 'qualified_name', 'General')
@@ -107,27 +226,40 @@ class MochaHelpCommand(commands.HelpCommand):
         embed.add_field(
             name="🆘 Need Help?",
             value=(
-                f"Mental Health Crisis: `{self.context.clean_prefix}crisis`\n"
-                f"Daily Check-in: `{self.context.clean_prefix}checkin`\n"
-                f"Breathing Exercise: `{self.context.clean_prefix}breathe`"
+                f"Mental Health Crisis: `{prefix}crisis`\n"
+                f"Daily Check-in: `{prefix}checkin`\n"
+                f"Breathing Exercise: `{prefix}breathe`"
             ),
             inline=False
         )
-        embed.set_footer(
-            text=f"Requested by {self.context.author} | MochaBot v{BOT_VERSION} | You matter 💙",
-            icon_url=self.context.author.avatar.url if self.context.author.avatar else None
-        )
-        view = HelpMenuView(self.context, mapping)
-        await self.get_destination().send(embed=embed, view=view)
+        return embed
     
-    async def send_command_help(self, command):
+    def _mental_health_embed(self, prefix):
+        embed = discord.Embed(title="🧠 Mental Health Quick Access",
+                              description="Immediate access to mental health and wellness resources",
+                              color=0x87CEEB)
+        embed.add_field(name="🆘 Crisis Resources",
+                        value=f"`{prefix}crisis` • `{prefix}therapy`",
+                        inline=False)
+        embed.add_field(name="🌸 Daily Wellness",
+                        value=f"`{prefix}checkin` • `{prefix}mood <1-10>` • `{prefix}affirmation`",
+                        inline=False)
+        embed.add_field(name="🫁 Coping Tools",
+                        value=f"`{prefix}breathe` • `{prefix}ground` • `{prefix}selfcare`",
+                        inline=False)
+        embed.add_field(name="💙 Remember",
+                        value="These tools support you, but please reach out to professionals when needed.", inline=False)
+        return embed
+    
+    def _command_embed(self, prefix, command):
+        if isinstance(command, commands.Group):
+            return self._group_embed(prefix, command)
         embed = discord.Embed(
             title=f"☕ Command: {command.name}",
             description=command.help or "No description available",
-            color=BOT_COLOR,
-            timestamp=datetime.utcnow()
+            color=BOT_COLOR
         )
-        embed.add_field(name="📝 Usage", value=f"`{self.get_command_signature(command)}`", inline=False)
+        embed.add_field(name="📝 Usage", value=f"`{prefix}{command.qualified_name} {command.signature}`", inline=False)
         if command.aliases:
             embed.add_field(name="🔄 Aliases", value=", ".join([f"`{a}`" for a in command.aliases]), inline=True)
         if hasattr(command, 'cooldown') and command.cooldown:
@@ -136,21 +268,33 @@ class MochaHelpCommand(commands.HelpCommand):
             embed.add_field(name="📂 Category", value=command.cog.qualified_name, inline=True)
         if command.cog and getattr(command.cog, 'emoji', '') == '🧠':
             embed.add_field(name="💙 Note", value="This is a mental health support command.", inline=False)
-        embed.set_footer(text=f"Use {self.context.clean_prefix}help for more commands | You're not alone 💙",
-                         icon_url=self.context.bot.user.avatar.url if self.context.bot.user and self.context.bot.user.avatar else None)
-        await self.get_destination().send(embed=embed)
+        embed.set_footer(text=f"Use {prefix}help for more commands | You're not alone 💙")
+        return embed
     
-    async def send_cog_help(self, cog):
+    def _group_embed(self, prefix, group):
+        embed = discord.Embed(
+            title=f"☕ Group: {group.name}",
+            description=group.help or "No description available",
+            color=BOT_COLOR
+        )
+        embed.add_field(name="📝 Usage", value=f"`{prefix}{group.qualified_name} {group.signature}`", inline=False)
+        subs = visible_commands(group.commands)
+        if subs:
+            embed.add_field(name="🔧 Subcommands",
+                            value="\n".join([f"`{prefix}{group.name} {c.name}` - {c.short_doc or 'No description'}" for c in subs]),
+                            inline=False)
+        return embed
+    
+    def _cog_embed(self, prefix, cog):
         embed = discord.Embed(
             title=f"{getattr(cog, 'emoji', '📋')} {cog.qualified_name} Commands",
             description=cog.description or "No description available",
-            color=BOT_COLOR,
-            timestamp=datetime.utcnow()
+            color=BOT_COLOR
         )
-        commands_list = await self.filter_commands(cog.get_commands(), sort=True)
+        commands_list = visible_commands(cog.get_commands())
         if commands_list:
             for command in commands_list:
-                embed.add_field(name=f"`{self.context.clean_prefix}{command.name}`",
+                embed.add_field(name=f"`{prefix}{command.name}`",
                                 value=command.short_doc or "No description",
                                 inline=True)
         else:
@@ -160,90 +304,164 @@ class MochaHelpCommand(commands.HelpCommand):
                 "These tools support mental wellness but don't replace professional help. "
                 "If you're in crisis, please reach out to a professional or use `!crisis`."
             ), inline=False)
+        embed.set_footer(text=f"Use {prefix}help <command> for detailed info | You matter 💙")
+        return embed
+    
+    def _commands_page(self, prefix, all_cmds, page, page_count):
+        embed = discord.Embed(title="📋 All Commands Quick Reference", color=BOT_COLOR)
+        start = page * self.COMMANDS_PER_PAGE
+        names = [f"`{prefix}{cmd.name}`" for cmd in all_cmds[start:start + self.COMMANDS_PER_PAGE]]
+        for i in range(0, len(names), 15):
+            embed.add_field(name=f"Commands {start+i+1}-{start+min(i+15, len(names))}", value="\n".join(names[i:i+15]), inline=True)
+        if page_count > 1:
+            embed.set_footer(text=f"Page {page+1}/{page_count} • Press 📋 Commands List again for the next page")
+        return embed
+
+
+class MochaHelpCommand(commands.HelpCommand):
+    """Custom help command with beautiful embeds and coffee + mental health theme"""
+    
+    def __init__(self):
+        super().__init__()
+        self.verify_checks = False
+        self.show_hidden = False
+    
+    def get_command_signature(self, command):
+        """Get the command signature with proper formatting"""
+        return f'{self.context.clean_prefix}{command.qualified_name} {command.signature}'
+    
+    async def send_bot_help(self, mapping):
+        """Send the main help page with all categories"""
+        embed = self.context.bot.help_pages.home(self.context.clean_prefix, self.context.author)
+        await self.get_destination().send(embed=embed, view=HelpMenuView(self.context.author.id))
+    
+    async def send_command_help(self, command):
+        embed = self.context.bot.help_pages.command(self.context.clean_prefix, command)
+        embed.set_footer(text=f"Use {self.context.clean_prefix}help for more commands | You're not alone 💙",
+                         icon_url=self.context.bot.user.avatar.url if self.context.bot.user and self.context.bot.user.avatar else None)
+        await self.get_destination().send(embed=embed)
+    
+    async def send_cog_help(self, cog):
+        embed = self.context.bot.help_pages.render(self.context.clean_prefix, 'cog', cog.qualified_name)
         embed.set_footer(text=f"Use {self.context.clean_prefix}help <command> for detailed info | You matter 💙",
                          icon_url=self.context.bot.user.avatar.url if self.context.bot.user and self.context.bot.user.avatar else None)
         await self.get_destination().send(embed=embed)
-
+    
     async def send_group_help(self, group):
-        embed = discord.Embed(
-            title=f"☕ Group: {group.name}",
-            description=group.help or "No description available",
-            color=BOT_COLOR
-        )
-        embed.add_field(name="📝 Usage", value=f"`{self.get_command_signature(group)}`", inline=False)
-        if group.commands:
-            subs = await self.filter_commands(group.commands, sort=True)
-            if subs:
-                embed.add_field(name="🔧 Subcommands",
-                                value="\n".join([f"`{self.context.clean_prefix}{group.name} {c.name}` - {c.short_doc or 'No description'}" for c in subs]),
-                                inline=False)
-        await self.get_destination().send(embed=embed)
+        await self.get_destination().send(embed=self.context.bot.help_pages.command(self.context.clean_prefix, group))
 
 
+HELP_BUTTONS = {
+    'home': ('🏠 Home', discord.ButtonStyle.blurple),
+    'mental_health': ('🧠 Mental Health', discord.ButtonStyle.green),
+    'commands': ('📋 Commands List', discord.ButtonStyle.secondary),
+    'info': ('ℹ️ Bot Info', discord.ButtonStyle.gray),
+}
+
+class HelpMenuButton(discord.ui.DynamicItem[discord.ui.Button], template=r'help:(?P<action>home|mental_health|commands|info):(?P<user_id>\d+):(?P<page>\d+)'):
+    """A !help menu button; who may use it and the next commands page live in its custom id"""
+    
+    def __init__(self, action, user_id=0, page=0):
+        label, style = HELP_BUTTONS[action]
+        super().__init__(discord.ui.Button(label=label, style=style, custom_id=f'help:{action}:{user_id}:{page}'))
+        self.action = action
+        self.user_id = user_id
+        self.page = page
+    
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match['action'], int(match['user_id']), int(match['page']))
+    
+    async def callback(self, interaction):
+        if self.user_id and interaction.user.id != self.user_id:
+            await interaction.response.send_message(f'❌ This menu belongs to someone else — use `{BOT_PREFIX}help` for your own!', ephemeral=True)
+            return
+        pages = interaction.client.help_pages
+        if self.action == 'home':
+            await interaction.response.edit_message(embed=pages.home(BOT_PREFIX, interaction.user),
+                                                    view=HelpMenuView(self.user_id))
+        elif self.action == 'mental_health':
+            await interaction.response.edit_message(embed=pages.render(BOT_PREFIX, 'mental_health'))
+        elif self.action == 'commands':
+            # Each press shows the next page of commands, wrapping around at the end
+            page = self.page % pages.page_count(BOT_PREFIX)
+            await interaction.response.edit_message(embed=pages.render(BOT_PREFIX, 'commands', page),
+                                                    view=HelpMenuView(self.user_id, page + 1))
+        else:
+            await interaction.response.edit_message(embed=pages.bot_info())
+
 class HelpMenuView(discord.ui.View):
-    def __init__(self, ctx, mapping):
-        super().__init__(timeout=180.0)
-        self.ctx = ctx
-        self.mapping = mapping
-        self.current_page = 0
-    async def interaction_check(self, interaction):
-        return interaction.user == self.ctx.author
-    @discord.ui.button(label='🏠 Home', style=discord.ButtonStyle.blurple)
-    async def home_button(self, interaction, button):
-        await interaction.response.defer()
-        help_command = MochaHelpCommand()
-        help_command.context = self.ctx
-        await help_command.send_bot_help(self.mapping)
-    @discord.ui.button(label='🧠 Mental Health', style=discord.ButtonStyle.green)
-    async def mental_health_button(self, interaction, button):
-        embed = discord.Embed(title="🧠 Mental Health Quick Access",
-                              description="Immediate access to mental health and wellness resources",
-                              color=0x87CEEB, timestamp=datetime.utcnow())
-        embed.add_field(name="🆘 Crisis Resources",
-                        value=f"`{self.ctx.clean_prefix}crisis` • `{self.ctx.clean_prefix}therapy`",
-                        inline=False)
-        embed.add_field(name="🌸 Daily Wellness",
-                        value=(f"`{self.ctx.clean_prefix}checkin` • `{self.ctx.clean_prefix}mood <1-10>` • "
-                               f"`{self.ctx.clean_prefix}affirmation`"), inline=False)
-        embed.add_field(name="🫁 Coping Tools",
-                        value=(f"`{self.ctx.clean_prefix}breathe` • `{self.ctx.clean_prefix}ground` • "
-                               f"`{self.ctx.clean_prefix}selfcare`"), inline=False)
-        embed.add_field(name="💙 Remember",
-                        value="These tools support you, but please reach out to professionals when needed.", inline=False)
-        await interaction.response.edit_message(embed=embed, view=self)
-    @discord.ui.button(label='📋 Commands List', style=discord.ButtonStyle.secondary)
-    async def commands_list_button(self, interaction, button):
-        embed = discord.Embed(title="📋 All Commands Quick Reference", color=BOT_COLOR, timestamp=datetime.utcnow())
-        all_cmds = []
-        for _, cmds in self.mapping.items():
-            for cmd in cmds:
-                all_cmds.append(f"`{self.ctx.clean_prefix}{cmd.name}`")
-        chunks = [all_cmds[i:i+15] for i in range(0, len(all_cmds), 15)]
-        for i, chunk in enumerate(chunks[:3]):
-            embed.add_field(name=f"Commands {i*15+1}-{min((i+1)*15, len(all_cmds))}", value="\n".join(chunk), inline=True)
-        await interaction.response.edit_message(embed=embed, view=self)
-    @discord.ui.button(label='ℹ️ Bot Info', style=discord.ButtonStyle.gray)
-    async def bot_info_button(self, interaction, button):
-        embed = discord.Embed(title="ℹ️ MochaBot Information", color=BOT_COLOR, timestamp=datetime.utcnow())
-        embed.add_field(name="🤖 Bot Version", value=f"v{BOT_VERSION}", inline=True)
-        embed.add_field(name="🐍 Discord.py Version", value=discord.__version__, inline=True)
-        embed.add_field(name="🏠 Servers", value=str(len(self.ctx.bot.guilds)), inline=True)
-        embed.add_field(name="👥 Users", value=str(len(self.ctx.bot.users)), inline=True)
-        embed.add_field(name="📡 Ping", value=f"{round(self.ctx.bot.latency * 1000)}ms", inline=True)
-        embed.add_field(name="☕ About MochaBot",
-                        value=("Coffee-themed community bot with mental health support: wellness tools, "
-                               "crisis resources, and supportive features."), inline=False)
-        await interaction.response.edit_message(embed=embed, view=self)
-    async def on_timeout(self):
-        for item in self.children:
-            item.disabled = True
-        try:
-            await self.message.edit(view=self)
-        except:
-            pass
+    """The !help buttons; registered once at startup, so every help message keeps working across restarts"""
+    
+    def __init__(self, user_id=0, commands_page=0):
+        super().__init__(timeout=None)
+        for action in HELP_BUTTONS:
+            self.add_item(HelpMenuButton(action, user_id, commands_page if action == 'commands' else 0))
+
+class MochaBot(commands.Bot):
+    """Bot that keeps its prebuilt help pages in step with the loaded cogs and its help buttons registered"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.help_pages = HelpPages(self)
+        self.cluster = None
+        self.startup = startup
+        # Events per second and time spent in each listener, for !events
+        self.event_profiler = EventProfiler(EVENT_BUDGET_MS / 1000)
+    
+    async def setup_hook(self):
+        # One registration serves the help buttons on every message, old or new
+        self.add_view(HelpMenuView())
+        # Started once here rather than in on_ready, which fires again after a full reconnect
+        daily_wellness_check.start()
+    
+    def dispatch(self, event_name, /, *args, **kwargs):
+        self.event_profiler.dispatched(event_name)
+        super().dispatch(event_name, *args, **kwargs)
+    
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        # Every listener, our @bot.event handlers and the cogs' alike, is run through here
+        await super()._run_event(self.event_profiler.wrap(coro, event_name), event_name, *args, **kwargs)
+    
+    async def add_cog(self, cog, **kwargs):
+        startup.cog_setup(type(cog).__module__)
+        await super().add_cog(cog, **kwargs)
+        self.help_pages.invalidate()
+    
+    async def remove_cog(self, name, **kwargs):
+        cog = await super().remove_cog(name, **kwargs)
+        self.help_pages.invalidate()
+        return cog
+    
+    async def reload_content(self, path=None):
+        """Swap in the content pack and trivia questions from disk; a broken pack raises and the old one stays"""
+        old, pack = await self.content.reload(path)
+        fun = self.get_cog('Fun')
+        if fun is not None:
+            await fun.trivia_engine.load()
+        return old, pack
+
+class ShardedMochaBot(MochaBot, commands.AutoShardedBot):
+    """MochaBot over several gateway connections in one process"""
+    
+    async def before_identify_hook(self, shard_id, *, initial=False):
+        # Under launcher.py the identify rate limit is shared by every cluster, so the hub hands out slots
+        if self.cluster is None or not await self.cluster.identify(shard_id):
+            await super().before_identify_hook(shard_id, initial=initial)
+
+def shard_options():
+    """AutoShardedBot arguments from SHARD_COUNT/SHARD_IDS, or None to run unsharded"""
+    if not SHARD_COUNT:
+        return None
+    options = {'shard_count': None if SHARD_COUNT == 'auto' else int(SHARD_COUNT)}
+    if SHARD_IDS:
+        options['shard_ids'] = [int(shard_id) for shard_id in SHARD_IDS.split(',')]
+    return options
 
 # Create bot instance with custom help command
-bot = commands.Bot(
+sharding = shard_options()
+bot = (ShardedMochaBot if sharding is not None else MochaBot)(
+    **(sharding or {}),
     command_prefix=BOT_PREFIX,
     intents=intents,
     help_command=MochaHelpCommand(),
@@ -254,70 +472,181 @@ bot = commands.Bot(
 @bot.event
 async def on_ready():
     logger.info(f'☕ {bot.user} is online and ready!')
+    if startup.mark('ready'):
+        logger.info(startup.report())
     activity = discord.Activity(type=discord.ActivityType.listening,
                                 name=f"your mental wellness • {BOT_PREFIX}help")
     await bot.change_presence(activity=activity, status=discord.Status.online)
-    if not daily_wellness_check.is_running():
-        daily_wellness_check.start()
+    bot.wellness_schedule.start()
+    if bot.cluster:
+        bot.cluster.push_stats()
+
+# Shard health: AutoShardedBot reports each shard, a plain Bot reports itself as shard 0
+@bot.event
+async def on_shard_connect(shard_id):
+    startup.mark('first shard connected')
+    bot.shard_monitor.connected(shard_id)
+
+@bot.event
+async def on_shard_disconnect(shard_id):
+    bot.shard_monitor.disconnected(shard_id)
+
+@bot.event
+async def on_shard_resumed(shard_id):
+    bot.shard_monitor.resumed(shard_id)
+
+@bot.event
+async def on_connect():
+    if not bot.shard_monitor.sharded:
+        startup.mark('gateway connected')
+        bot.shard_monitor.connected(0)
+
+@bot.event
+async def on_disconnect():
+    if not bot.shard_monitor.sharded:
+        bot.shard_monitor.disconnected(0)
+
+@bot.event
+async def on_resumed():
+    if not bot.shard_monitor.sharded:
+        bot.shard_monitor.resumed(0)
+
+@bot.event
+async def on_guild_available(guild):
+    bot.member_counters.initialize(guild)
+
+@bot.event
+async def on_guild_join(guild):
+    bot.member_counters.initialize(guild)
+
+@bot.event
+async def on_member_remove(member):
+    bot.member_counters.member_removed(member)
+
+@bot.event
+async def on_presence_update(before, after):
+    bot.member_counters.presence_updated(before, after)
 
 @bot.event
 async def on_member_join(member):
+    bot.member_counters.member_joined(member)
     welcome_messages = [
         f"☕ Welcome {member.mention}! This is a safe space for community and wellness.",
         f"🌟 {member.mention} joined our wellness café! We're here to support each other.",
     ]
-    welcome_channels = ['welcome', 'general', 'lobby', 'café', 'coffee-house', 'wellness', 'support']
-    for name in welcome_channels:
-        channel = discord.utils.get(member.guild.text_channels, name=name)
-        if channel:
-            embed = discord.Embed(title="☕ Welcome to Our Wellness Community!",
-                                  description=random.choice(welcome_messages),
-                                  color=BOT_COLOR, timestamp=datetime.utcnow())
-            embed.add_field(name="🎯 Get Started",
-                            value=(f"`{BOT_PREFIX}help` for all features\n"
-                                   f"`{BOT_PREFIX}checkin` for daily wellness\n"
-                                   f"`{BOT_PREFIX}crisis` for immediate support"), inline=False)
-            await channel.send(embed=embed)
-            break
+    channel = bot.channel_index.resolve(member.guild, 'welcome')
+    if channel:
+        embed = discord.Embed(title="☕ Welcome to Our Wellness Community!",
+                              description=random.choice(welcome_messages),
+                              color=BOT_COLOR, timestamp=datetime.utcnow())
+        embed.add_field(name="🎯 Get Started",
+                        value=(f"`{BOT_PREFIX}help` for all features\n"
+                               f"`{BOT_PREFIX}checkin` for daily wellness\n"
+                               f"`{BOT_PREFIX}crisis` for immediate support"), inline=False)
+        await channel.send(embed=embed)
+
+@bot.event
+async def on_guild_channel_create(channel):
+    bot.channel_index.channel_created(channel)
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    await bot.channel_index.channel_deleted(channel)
+
+@bot.event
+async def on_guild_channel_update(before, after):
+    bot.channel_index.channel_updated(before, after)
+
+@bot.event
+async def on_guild_remove(guild):
+    bot.channel_index.forget_guild(guild.id)
+    bot.member_counters.forget(guild.id)
 
 @bot.event
 async def on_message(message):
     if message.author == bot.user:
         return
-    mental_keywords = ['stress', 'anxiety', 'depression', 'sad', 'worried', 'panic', 'overwhelmed', 'tired', 'exhausted']
-    coffee_keywords = ['coffee', 'café', 'espresso', 'latte', 'cappuccino', 'mocha', 'brew']
-    content = message.content.lower()
-    if any(k in content for k in mental_keywords):
-        if random.randint(1, 15) == 1:
-            await message.add_reaction('💙')
-    elif any(k in content for k in coffee_keywords):
-        if random.randint(1, 20) == 1:
-            await message.add_reaction('☕')
+    # One compiled pattern per guild configuration; mental health keywords take priority
+    hit = bot.keyword_reactions.match(message.guild.id if message.guild else None, message.content)
+    if hit:
+        _, emoji, probability = hit
+        if random.random() < probability:
+            await message.add_reaction(emoji)
     await bot.process_commands(message)
 
+WELLNESS_TIPS = [
+    "💙 Check in with yourself today.",
+    "🌸 Take a slow, deep breath.",
+    "🫁 Try `!breathe` if you feel overwhelmed.",
+    "🌱 Small acts of self-care matter.",
+]
+
+def wellness_sender(tip):
+    """Broadcast `send` for one round: tries the guild's wellness channels in order"""
+    embed = discord.Embed(title="🌸 Daily Wellness Reminder", description=tip,
+                          color=0x87CEEB, timestamp=datetime.utcnow())
+    embed.add_field(name="🛠️ Quick Tools",
+                    value=f"`{BOT_PREFIX}checkin` • `{BOT_PREFIX}breathe` • `{BOT_PREFIX}affirmation` • `{BOT_PREFIX}selfcare`",
+                    inline=False)
+    
+    async def send(guild):
+        error = None
+        for channel in bot.channel_index.candidates(guild, 'wellness'):
+            try:
+                await channel.send(embed=embed)
+                return True
+            except discord.Forbidden as e:
+                # No access here; the next candidate channel may work
+                error = e
+        if error:
+            raise error
+        return False
+    return send
+
+async def broadcast_wellness(guilds, label):
+    report = await bot.broadcaster.run(guilds, wellness_sender(random.choice(WELLNESS_TIPS)), label=label)
+    if bot.cluster:
+        # Each cluster sends to its own guilds; the launcher collects every cluster's round
+        bot.cluster.report_broadcast(label, report)
+    for guild_id, error in report.failures:
+        logger.warning(f"Failed to send wellness reminder in guild {guild_id}: {error}")
+
+async def fire_scheduled_wellness(guild_ids):
+    """Guilds with a configured local time, as they come due"""
+    guilds = [guild for guild in map(bot.get_guild, guild_ids) if guild]
+    await broadcast_wellness(guilds, 'wellness (scheduled)')
+
 @tasks.loop(hours=12)
 async def daily_wellness_check():
-    tips = [
-        "💙 Check in with yourself today.",
-        "🌸 Take a slow, deep breath.",
-        "🫁 Try `!breathe` if you feel overwhelmed.",
-        "🌱 Small acts of self-care matter.",
-    ]
-    tip = random.choice(tips)
-    for guild in bot.guilds:
-        for name in ['wellness', 'mental-health', 'support', 'daily-wellness', 'self-care']:
-            channel = discord.utils.get(guild.text_channels, name=name)
-            if channel:
-                embed = discord.Embed(title="🌸 Daily Wellness Reminder", description=tip,
-                                      color=0x87CEEB, timestamp=datetime.utcnow())
-                embed.add_field(name="🛠️ Quick Tools",
-                                value=f"`{BOT_PREFIX}checkin` • `{BOT_PREFIX}breathe` • `{BOT_PREFIX}affirmation` • `{BOT_PREFIX}selfcare`",
-                                inline=False)
-                try:
-                    await channel.send(embed=embed)
-                    break
-                except Exception as e:
-                    logger.warning(f"Failed to send wellness reminder in {guild.name}: {e}")
+    try:
+        # Guilds that picked a local time get theirs from the wellness schedule instead
+        guilds = [guild for guild in bot.guilds if not bot.wellness_schedule.is_scheduled(guild.id)]
+        await broadcast_wellness(guilds, 'wellness')
+    except Exception as e:
+        # An unhandled error would end the loop for good; skip this round and keep the schedule
+        logger.error(f"❌ Wellness reminder round failed: {e}")
+
+@daily_wellness_check.before_loop
+async def before_daily_wellness_check():
+    await bot.wait_until_ready()
+
+async def follow_content_reload(data):
+    """Another cluster reloaded the content pack; load the same file so every cluster serves one version"""
+    await bot.reload_content((data or {}).get('path'))
+
+# Per-command latency, errors and rates for !perf; after_invoke also runs when the command raised
+@bot.before_invoke
+async def time_command(ctx):
+    bot.command_stats.started(ctx)
+
+@bot.after_invoke
+async def record_command(ctx):
+    bot.command_stats.finished(ctx)
+
+@bot.event
+async def on_command_completion(ctx):
+    if startup.mark('first command served'):
+        logger.info(f"⏱️ First command (!{ctx.command.qualified_name}) served {startup.now():.2f}s after start")
 
 # Load all cogs including mental health
 async def load_cogs():
@@ -327,28 +656,105 @@ async def load_cogs():
         'cogs.mentalhealth',
         'cogs.moderation',
         'cogs.fun',
-        'cogs.utility'
+        'cogs.utility',
+        'cogs.owner'
     ]
-    for cog in cogs:
+    
+    async def load(cog):
+        startup.cog_started(cog)
         try:
             await bot.load_extension(cog)
+            startup.cog_finished(cog)
             logger.info(f'✅ Loaded cog: {cog}')
         except Exception as e:
+            startup.cog_finished(cog, e)
             logger.error(f'❌ Failed to load cog {cog}: {e}')
+    
+    # Cogs only depend on the shared resources, not on each other, so their setup
+    # (mostly database reads) overlaps instead of running one after another
+    with startup.phase('cogs'):
+        await asyncio.gather(*(load(cog) for cog in cogs))
+
+async def open_resources():
+    """Create and load the shared resources the cogs use; needs no connection, so benchmarks reuse it"""
+    # One pooled HTTP session for every outbound API call
+    bot.web_client = WebClient()
+    # Shared SQLite database (reminders and other persistent state)
+    bot.db = Database()
+    # Facts, tips, jokes, exercises and crisis lines, swappable with !content reload
+    bot.content = ContentStore()
+    await asyncio.gather(bot.web_client.start(), bot.db.connect(), bot.content.load())
+    # Per-guild keyword sets for on_message reactions
+    bot.keyword_reactions = KeywordReactions(bot.db)
+    # Welcome/wellness/modlog/support channels per guild
+    bot.channel_index = ChannelIndex(bot.db)
+    # Concurrent fan-out for wellness reminders, all at once or at each guild's local time
+    bot.broadcaster = Broadcaster()
+    bot.wellness_schedule = WellnessSchedule(bot.db, fire_scheduled_wellness)
+    await asyncio.gather(bot.keyword_reactions.load(), bot.channel_index.load(), bot.wellness_schedule.load())
+    # Latency histograms per command for !perf
+    bot.command_stats = CommandStats()
+    # CPU, memory, loop lag and latency history for !info and !stats
+    bot.metrics = MetricsSampler(bot)
+    # Humans/bots/online counts for !serverinfo, with a periodic recount
+    bot.member_counters = MemberCounters(bot)
+    # Button presses on interactive messages (trivia rounds), routed by message and user
+    bot.sessions = SessionRouter()
+    # Per-shard status, latency and guild counts for !ping, !info and help
+    bot.shard_monitor = ShardMonitor(bot)
+
+async def close_resources():
+    bot.wellness_schedule.stop()
+    bot.metrics.stop()
+    bot.member_counters.stop()
+    bot.sessions.stop()
+    await bot.web_client.close()
+    await bot.db.close()
 
 async def main():
-    async with bot:
-        await load_cogs()
-        # Determine token source: prefer inline BOT_TOKEN; fallback to env
-        token = BOT_TOKEN or os.getenv('DISCORD_TOKEN') or ""
-        if not token:
-            logger.error("❌ No bot token found. Set BOT_TOKEN in bot.py or DISCORD_TOKEN env var.")
-            return
-        try:
-            logger.info("🚀 Starting MochaBot...")
-            await bot.start(token)
-        except Exception as e:
-            logger.error(f"❌ Failed to start bot: {e}")
+    subsystems_started = startup.now()
+    # Shared resources outlive the bot context so cogs can still use them while unloading
+    await open_resources()
+    bot.metrics.start()
+    bot.member_counters.start()
+    bot.sessions.start()
+    if sharding is not None:
+        logger.info(f"🧩 Sharding enabled: {SHARD_COUNT} shards" + (f", running {SHARD_IDS}" if SHARD_IDS else ""))
+    # Cross-cluster totals and identify slots when started by launcher.py
+    bot.cluster = ClusterLink.from_env(bot.shard_monitor.snapshot)
+    if bot.cluster:
+        bot.cluster.on('reload_content', follow_content_reload)
+        bot.cluster.start()
+    startup.add_phase('shared resources', subsystems_started)
+    try:
+        async with bot:
+            # Determine token source: prefer inline BOT_TOKEN; fallback to env
+            token = BOT_TOKEN or os.getenv('DISCORD_TOKEN') or ""
+            if not token:
+                logger.error("❌ No bot token found. Set BOT_TOKEN in bot.py or DISCORD_TOKEN env var.")
+                return
+            try:
+                logger.info("🚀 Starting MochaBot...")
+                # Cogs load while the login round trip is in flight; the gateway connects once both are done
+                cogs = asyncio.create_task(load_cogs())
+                try:
+                    with startup.phase('login'):
+                        await bot.login(token)
+                finally:
+                    await cogs
+                    startup.stop_tracking_imports()
+                startup.mark('connecting to the gateway')
+                await bot.connect()
+            except Exception as e:
+                logger.error(f"❌ Failed to start bot: {e}")
+    finally:
+        if bot.cluster:
+            bot.cluster.stop()
+        await close_resources()
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        # Ctrl+C, or launcher.py stopping this cluster; main() has already cleaned up
+        logger.info("👋 MochaBot stopped")
@@ -3,11 +3,41 @@
 import discord
 from discord.ext import commands
 import random
-import aiohttp
 from datetime import datetime
-import asyncio
+from utils.prefetch import PrefetchBuffer
+from utils.trivia import TriviaEngine, DIFFICULTIES, POINTS, SPEED_BONUS
 
 BOT_COLOR = 0x8B4513
+TRIVIA_EMOJIS = ['🇦', '🇧', '🇨', '🇩']
+
+class TriviaAnswerButton(discord.ui.DynamicItem[discord.ui.Button], template=r'trivia:answer:(?P<option>[0-9])'):
+    """One answer button; every game shares these custom ids and presses reach it through bot.sessions"""
+    
+    def __init__(self, option, label=None, style=discord.ButtonStyle.secondary, disabled=False):
+        super().__init__(discord.ui.Button(
+            label=label,
+            emoji=TRIVIA_EMOJIS[option],
+            style=style,
+            custom_id=f'trivia:answer:{option}',
+            disabled=disabled
+        ))
+        self.option = option
+    
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(int(match['option']))
+    
+    async def callback(self, interaction):
+        if not await interaction.client.sessions.dispatch_component(interaction, self.option):
+            await interaction.response.send_message('⏰ This trivia round has ended!', ephemeral=True)
+
+def trivia_view(game, reveal=False):
+    """Answer buttons for a game; the revealed view is disabled and highlights the right answer"""
+    view = discord.ui.View(timeout=None)
+    for i, option in enumerate(game.question['options']):
+        style = discord.ButtonStyle.success if reveal and i == game.correct_option else discord.ButtonStyle.secondary
+        view.add_item(TriviaAnswerButton(i, label=option, style=style, disabled=reveal))
+    return view
 
 class Fun(commands.Cog):
     """Fun and entertaining commands for your coffee break!"""
@@ -15,24 +45,40 @@ class Fun(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.emoji = '🎉'
+        
+        # Multiplayer trivia; questions come from data/trivia_questions.json
+        self.trivia_engine = TriviaEngine(bot.db, bot.sessions, self._finish_trivia, self._answered_trivia)
+        
+        # Ready-to-send (quote, author) pairs, refilled in the background
+        self.quote_buffer = PrefetchBuffer('quotes', self._fetch_quote, size=20, low_water=5)
+        
+        # Jokes come from the content pack and follow !content reload
+        bot.content.subscribe(self.apply_content)
+    
+    def apply_content(self, pack):
+        self.jokes = pack['fun']['jokes']
+    
+    async def cog_load(self):
+        self.quote_buffer.start()
+        await self.trivia_engine.load()
+        self.bot.add_dynamic_items(TriviaAnswerButton)
+    
+    async def cog_unload(self):
+        self.bot.content.unsubscribe(self.apply_content)
+        self.quote_buffer.stop()
+        self.trivia_engine.stop()
+        self.bot.remove_dynamic_items(TriviaAnswerButton)
+    
+    async def _fetch_quote(self):
+        async with self.bot.web_client.get('https://api.quotable.io/random', service='quotes') as response:
+            response.raise_for_status()
+            data = await response.json()
+            return data['content'], data['author']
     
     @commands.hybrid_command(name='joke', description='Get a random coffee joke')
     async def joke(self, ctx):
         """Get a random coffee-themed joke"""
-        jokes = [
-            ("Why did the coffee file a police report?", "It got mugged!"),
-            ("How does Moses make coffee?", "Hebrews it!"),
-            ("What do you call sad coffee?", "Depresso!"),
-            ("Why don't coffee beans ever get speeding tickets?", "Because they know how to espresso themselves!"),
-            ("What's the best thing about Switzerland?", "I don't know, but their flag is a big plus... unlike their coffee prices!"),
-            ("How do you know if someone's a coffee addict?", "Don't worry, they'll tell you... repeatedly!"),
-            ("What did the coffee say to the cream?", "You make me whole milk!"),
-            ("Why do coffee lovers prefer dark roast?", "Because light roast is too mainstream!"),
-            ("What's a coffee's favorite spell?", "Espresso Patronum!"),
-            ("Why did the hipster burn his tongue?", "He drank his coffee before it was cool!")
-        ]
-        
-        setup, punchline = random.choice(jokes)
+        joke = random.choice(self.jokes)
         
         embed = discord.Embed(
             title='😂 Coffee Joke',
@@ -40,8 +86,8 @@ class Fun(commands.Cog):
             timestamp=datetime.utcnow()
         )
         
-        embed.add_field(name='Setup', value=setup, inline=False)
-        embed.add_field(name='Punchline', value=punchline, inline=False)
+        embed.add_field(name='Setup', value=joke['setup'], inline=False)
+        embed.add_field(name='Punchline', value=joke['punchline'], inline=False)
         
         embed.set_footer(text="Hope that gave you a good laugh! ☕😄")
         
@@ -235,141 +281,149 @@ class Fun(commands.Cog):
     @commands.hybrid_command(name='inspire', description='Get an inspirational quote')
     async def inspire(self, ctx):
         """Get a random inspirational quote"""
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get('https://api.quotable.io/random') as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        embed = discord.Embed(
-                            title='💬 Inspirational Quote',
-                            description=f'*"{data["content"]}"*\n\n— {data["author"]}',
-                            color=BOT_COLOR,
-                            timestamp=datetime.utcnow()
-                        )
-                        
-                        await ctx.send(embed=embed)
-                    else:
-                        fallback_quotes = [
-                            ("The only way to do great work is to love what you do.", "Steve Jobs"),
-                            ("Innovation distinguishes between a leader and a follower.", "Steve Jobs"),
-                            ("Stay hungry, stay foolish.", "Steve Jobs"),
-                            ("Life is what happens to you while you're busy making other plans.", "John Lennon"),
-                            ("The future belongs to those who believe in the beauty of their dreams.", "Eleanor Roosevelt")
-                        ]
-                        quote_text, author = random.choice(fallback_quotes)
-                        embed = discord.Embed(
-                            title='💬 Inspirational Quote',
-                            description=f'*"{quote_text}"*\n\n— {author}',
-                            color=BOT_COLOR,
-                            timestamp=datetime.utcnow()
-                        )
-                        await ctx.send(embed=embed)
-            except Exception:
-                await ctx.send('❌ Failed to fetch a quote. Try again later!')
+        quote = self.quote_buffer.pop()
+        if quote is None:
+            fallback_quotes = [
+                ("The only way to do great work is to love what you do.", "Steve Jobs"),
+                ("Innovation distinguishes between a leader and a follower.", "Steve Jobs"),
+                ("Stay hungry, stay foolish.", "Steve Jobs"),
+                ("Life is what happens to you while you're busy making other plans.", "John Lennon"),
+                ("The future belongs to those who believe in the beauty of their dreams.", "Eleanor Roosevelt")
+            ]
+            quote = random.choice(fallback_quotes)
+        quote_text, author = quote
+        
+        embed = discord.Embed(
+            title='💬 Inspirational Quote',
+            description=f'*"{quote_text}"*\n\n— {author}',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        await ctx.send(embed=embed)
     
-    @commands.hybrid_command(name='trivia', description='Answer a random trivia question')
-    async def trivia(self, ctx):
-        """Answer a coffee-themed trivia question"""
-        # ... (unchanged from previous fixed version)
-        questions = [
-            {
-                'question': 'Which country is the largest producer of coffee in the world?',
-                'options': ['Colombia', 'Brazil', 'Vietnam', 'Ethiopia'],
-                'answer': 'Brazil',
-                'explanation': 'Brazil produces about 40% of the world\'s coffee!'
-            },
-            {
-                'question': 'What does "espresso" mean in Italian?',
-                'options': ['Fast coffee', 'Pressed out', 'Strong drink', 'Black gold'],
-                'answer': 'Pressed out',
-                'explanation': 'Espresso comes from the Italian word meaning "pressed out"!'
-            },
-            {
-                'question': 'Which animal is said to have discovered coffee?',
-                'options': ['Cats', 'Goats', 'Birds', 'Monkeys'],
-                'answer': 'Goats',
-                'explanation': 'Legend says a goat herder in Ethiopia discovered coffee when his goats became energetic after eating coffee berries!'
-            },
-            {
-                'question': 'What is the most expensive coffee in the world made from?',
-                'options': ['Gold flakes', 'Rare beans', 'Civet droppings', 'Volcanic soil'],
-                'answer': 'Civet droppings',
-                'explanation': 'Kopi Luwak coffee is made from beans that have been eaten and excreted by civets!'
-            },
-            {
-                'question': 'Which country consumes the most coffee per capita?',
-                'options': ['United States', 'Italy', 'Finland', 'Turkey'],
-                'answer': 'Finland',
-                'explanation': 'Finland consumes about 12kg of coffee per person per year!'
-            },
-            {
-                'question': 'What temperature should water be for brewing coffee?',
-                'options': ['180°F (82°C)', '195-205°F (90-96°C)', '212°F (100°C)', '175°F (79°C)'],
-                'answer': '195-205°F (90-96°C)',
-                'explanation': 'The optimal brewing temperature is just below boiling point for best extraction!'
-            },
-            {
-                'question': 'How much caffeine does an average cup of coffee contain?',
-                'options': ['50mg', '95mg', '150mg', '200mg'],
-                'answer': '95mg',
-                'explanation': 'An 8oz cup of coffee typically contains about 95mg of caffeine!'
-            },
-            {
-                'question': 'What is a "shot" in coffee terms?',
-                'options': ['1 tablespoon of coffee', '1 ounce of espresso', '1 cup of coffee', '1 teaspoon of sugar'],
-                'answer': '1 ounce of espresso',
-                'explanation': 'A shot refers to approximately 1 ounce of espresso extracted in 25-30 seconds!'
-            }
-        ]
+    async def _answered_trivia(self, interaction, game, option, previous):
+        if previous is not None:
+            await interaction.response.send_message(f'You already locked in **{game.question["options"][previous]}**.', ephemeral=True)
+        else:
+            await interaction.response.send_message(f'🔒 Locked in **{game.question["options"][option]}**! Results <t:{int(game.ends_at)}:R>.', ephemeral=True)
+    
+    async def _finish_trivia(self, game, results):
+        question = game.question
+        channel = self.bot.get_channel(game.channel_id) or await self.bot.fetch_channel(game.channel_id)
+        message = channel.get_partial_message(game.message_id)
+        await message.edit(view=trivia_view(game, reveal=True))
         
-        question_data = random.choice(questions)
+        correct = [row for row in results if row[3]]
+        embed = discord.Embed(
+            title='⏰ Time\'s Up!',
+            description=f'The correct answer was **{question["answer"]}**.\n\n💡 {question["explanation"]}',
+            color=0x00FF00 if correct else 0xFFFF00,
+            timestamp=datetime.utcnow()
+        )
+        if correct:
+            medals = ['🥇', '🥈', '🥉']
+            lines = [f'{medals[i] if i < 3 else "☕"} <@{user_id}> — {seconds:.1f}s, +{points} pts'
+                     for i, (user_id, _, seconds, points) in enumerate(correct[:10])]
+            if len(correct) > 10:
+                lines.append(f'...and {len(correct) - 10} more!')
+            embed.add_field(name=f'🏆 Correct ({len(correct)}/{len(results)})', value='\n'.join(lines), inline=False)
+        elif results:
+            embed.add_field(name='😅 Nobody got it', value=f'{len(results)} answered — you\'ve got the next one!', inline=False)
+        else:
+            embed.description += '\n\nNo one answered this time.'
+        if results:
+            spread = '\n'.join(f'{TRIVIA_EMOJIS[i]} {option} — {count}' for i, (option, count) in enumerate(zip(question['options'], game.counts)))
+            embed.add_field(name='📊 Answers', value=spread[:1024], inline=False)
+        embed.set_footer(text='Play again with !trivia • Standings with !trivia leaderboard')
+        await message.reply(embed=embed, mention_author=False)
+    
+    @commands.hybrid_group(name='trivia', fallback='play', description='Start a trivia round anyone can answer')
+    async def trivia(self, ctx, category: str = None, difficulty: str = None):
+        """Start a 30 second trivia round for everyone (e.g. !trivia, !trivia tea, !trivia coffee hard)"""
+        bank = self.trivia_engine.bank
+        # A lone difficulty works too, e.g. !trivia hard
+        if category and not difficulty and category.lower() in DIFFICULTIES:
+            category, difficulty = None, category
+        category = category.lower() if category and category.lower() != 'any' else None
+        difficulty = difficulty.lower() if difficulty else None
+        if category and category not in bank.categories:
+            await ctx.send(f'❌ Unknown category! Available: {", ".join(bank.categories) or "none loaded"}')
+            return
+        if difficulty and difficulty not in DIFFICULTIES:
+            await ctx.send(f'❌ Difficulty must be one of: {", ".join(DIFFICULTIES)}')
+            return
         
+        if self.trivia_engine.running(ctx.channel.id):
+            await ctx.send('❌ There\'s already a trivia round in this channel — answer that one first!')
+            return
+        game = self.trivia_engine.new_game(ctx.guild.id if ctx.guild else None, ctx.channel.id, ctx.author.id, category, difficulty)
+        if game is None:
+            await ctx.send('❌ No trivia questions match that! See `!trivia categories`.')
+            return
+        self.trivia_engine.reserve(game)
+        
+        question = game.question
         embed = discord.Embed(
-            title='☕ Coffee Trivia',
-            description=question_data['question'],
+            title=f'🧠 {question["category"].title()} Trivia',
+            description=question['question'],
             color=BOT_COLOR,
             timestamp=datetime.utcnow()
         )
-        
-        options_text = '\n'.join([f'{chr(65+i)}. {option}' for i, option in enumerate(question_data['options'])])
+        options_text = '\n'.join(f'{TRIVIA_EMOJIS[i]} {option}' for i, option in enumerate(question['options']))
         embed.add_field(name='Options', value=options_text, inline=False)
-        embed.set_footer(text="React with A, B, C, or D to answer! (30 seconds)")
-        message = await ctx.send(embed=embed)
-        reactions = ['🅰️', '🅱️', '🅲️', '🅳️']
-        try:
-            for i in range(len(question_data['options'])):
-                await message.add_reaction(reactions[i])
-        except discord.HTTPException:
-            await message.clear_reactions()
-            simple_reactions = ['A️⃣', 'B️⃣', 'C️⃣', 'D️⃣']
-            for i in range(len(question_data['options'])):
-                await message.add_reaction(simple_reactions[i])
-            reactions = simple_reactions
-        def check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in reactions and reaction.message.id == message.id
+        embed.add_field(name='Difficulty', value=f'{question["difficulty"].title()} ({POINTS[question["difficulty"]]} pts + speed bonus)', inline=True)
+        embed.set_footer(text=f'Anyone can answer — pick a button! ({int(game.duration)} seconds)')
         try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=30.0, check=check)
-            user_answer_index = reactions.index(str(reaction.emoji))
-            user_answer = question_data['options'][user_answer_index]
-            correct_answer = question_data['answer']
-            if user_answer == correct_answer:
-                result_embed = discord.Embed(title='✅ Correct!', description=f'**{correct_answer}** is the right answer!\n\n💡 {question_data["explanation"]}', color=0x00FF00, timestamp=datetime.utcnow())
-                result_embed.add_field(name='Your Answer', value=f'✅ {user_answer}', inline=True)
-            else:
-                result_embed = discord.Embed(title='❌ Incorrect!', description=f'The correct answer was **{correct_answer}**.\n\n💡 {question_data["explanation"]}', color=0xFF0000, timestamp=datetime.utcnow())
-                result_embed.add_field(name='Your Answer', value=f'❌ {user_answer}', inline=True)
-                result_embed.add_field(name='Correct Answer', value=f'✅ {correct_answer}', inline=True)
-            result_embed.set_footer(text="Thanks for playing! Try another round with !trivia")
-            await ctx.send(embed=result_embed)
-        except asyncio.TimeoutError:
-            timeout_embed = discord.Embed(title='⏰ Time\'s Up!', description=f'No answer received in time.\n\nThe correct answer was **{question_data["answer"]}**.\n\n💡 {question_data["explanation"]}', color=0xFFFF00, timestamp=datetime.utcnow())
-            timeout_embed.set_footer(text="Try again with !trivia - you've got this!")
-            await ctx.send(embed=timeout_embed)
+            message = await ctx.send(embed=embed, view=trivia_view(game))
         except Exception:
-            error_embed = discord.Embed(title='❌ Trivia Error', description=f'Something went wrong with the trivia question.\n\nThe answer was **{question_data["answer"]}**: {question_data["explanation"]}', color=0xFF6600, timestamp=datetime.utcnow())
-            await ctx.send(embed=error_embed)
-
+            self.trivia_engine.release(game)
+            raise
+        self.trivia_engine.attach(game, message.id)
+    
+    @trivia.command(name='leaderboard', aliases=['top'], description='Show the top trivia players in this server')
+    @commands.guild_only()
+    async def trivia_leaderboard(self, ctx):
+        """Show this server's top 10 trivia players and your rank"""
+        rows = await self.trivia_engine.top(ctx.guild.id, 10)
+        
+        embed = discord.Embed(
+            title='🏆 Trivia Leaderboard',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        if rows:
+            medals = ['🥇', '🥈', '🥉']
+            embed.description = '\n'.join(
+                f'{medals[i] if i < 3 else f"`#{i + 1}`"} <@{user_id}> — **{points}** pts ({correct}/{answered} correct)'
+                for i, (user_id, points, correct, answered) in enumerate(rows)
+            )
+        else:
+            embed.description = 'No one has played trivia here yet. Start a round with `!trivia`!'
+        
+        standing = await self.trivia_engine.standing(ctx.guild.id, ctx.author.id)
+        if standing:
+            rank, points, correct, answered = standing
+            embed.set_footer(text=f'You: #{rank} with {points} pts ({correct}/{answered} correct)')
+        await ctx.send(embed=embed)
+    
+    @trivia.command(name='categories', description='List trivia categories and difficulties')
+    async def trivia_categories(self, ctx):
+        """Show the trivia categories and how many questions each has"""
+        bank = self.trivia_engine.bank
+        
+        embed = discord.Embed(
+            title='🧠 Trivia Categories',
+            description=f'{len(bank)} questions to choose from. Play with `!trivia [category] [difficulty]`.',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        for category in bank.categories:
+            counts = ' • '.join(f'{difficulty} {bank.count(category, difficulty)}' for difficulty in DIFFICULTIES)
+            embed.add_field(name=category.title(), value=counts, inline=True)
+        points = ', '.join(f'{difficulty} {POINTS[difficulty]}' for difficulty in DIFFICULTIES)
+        embed.add_field(name='⭐ Points', value=f'{points}, plus up to {SPEED_BONUS} for answering fast', inline=False)
+        await ctx.send(embed=embed)
 
 async def setup(bot):
     """Setup function to add the cog"""
@@ -3,9 +3,11 @@
 import discord
 from discord.ext import commands
 from datetime import datetime
+import math
 import platform
-import psutil
 import time
+from utils.metrics import FIELDS
+from utils.shards import format_latency
 
 BOT_COLOR = 0x8B4513
 
@@ -24,7 +26,11 @@ class General(commands.Cog):
         message = await ctx.send('⏳ Pinging...')
         end = time.perf_counter()
         
-        api_latency = round(self.bot.latency * 1000, 2)
+        # The gateway connection this server is served by (the only one when unsharded)
+        monitor = self.bot.shard_monitor
+        shard_id = monitor.shard_of(ctx.guild)
+        latency = monitor.latency(shard_id)
+        api_latency = latency * 1000
         response_time = round((end - start) * 1000, 2)
         
         embed = discord.Embed(
@@ -33,20 +39,27 @@ class General(commands.Cog):
             timestamp=datetime.utcnow()
         )
         
-        embed.add_field(name='📡 API Latency', value=f'`{api_latency}ms`', inline=True)
+        embed.add_field(name='📡 API Latency', value=f'`{format_latency(latency)}`', inline=True)
         embed.add_field(name='⏱️ Response Time', value=f'`{response_time}ms`', inline=True)
         
-        # Add status indicator
-        if api_latency < 100:
-            status = '🟢 Excellent'
-        elif api_latency < 200:
-            status = '🟡 Good'
-        elif api_latency < 300:
-            status = '🟠 Fair'
-        else:
-            status = '🔴 Poor'
+        # Add status indicator (there's nothing to rate until the shard has heartbeated)
+        if math.isfinite(api_latency):
+            if api_latency < 100:
+                status = '🟢 Excellent'
+            elif api_latency < 200:
+                status = '🟡 Good'
+            elif api_latency < 300:
+                status = '🟠 Fair'
+            else:
+                status = '🔴 Poor'
+            
+            embed.add_field(name='📊 Status', value=status, inline=True)
         
-        embed.add_field(name='📊 Status', value=status, inline=True)
+        if monitor.sharded:
+            latencies = [latency for _, latency in monitor.latencies() if math.isfinite(latency)]
+            average = f'{round(sum(latencies) / len(latencies) * 1000, 2)}ms' if latencies else '—'
+            embed.add_field(name='🧩 Shard', value=f'`#{shard_id}` of `{self.bot.shard_count}`', inline=True)
+            embed.add_field(name='📶 All Shards', value=f'`{average}` avg over `{len(latencies)}` connected', inline=True)
         
         await message.edit(content=None, embed=embed)
     
@@ -63,9 +76,14 @@ class General(commands.Cog):
         if self.bot.user.avatar:
             embed.set_thumbnail(url=self.bot.user.avatar.url)
         
-        # Bot statistics
+        # Bot statistics (CPU/memory and the user count come from the background sampler)
+        sample = self.bot.metrics.latest()
         guild_count = len(self.bot.guilds)
-        user_count = len(self.bot.users)
+        user_count = sample['users'] if sample else len(self.bot.users)
+        # Under launcher.py, count every cluster (users are summed per cluster, so shared users count twice)
+        totals = self.bot.cluster.totals if self.bot.cluster else None
+        if totals:
+            guild_count, user_count = totals['guilds'], totals['users']
         command_count = len([cmd for cmd in self.bot.walk_commands()])
         
         embed.add_field(name='🏠 Servers', value=f'`{guild_count:,}`', inline=True)
@@ -83,12 +101,22 @@ class General(commands.Cog):
         embed.add_field(name='🤖 Discord.py', value=f'`{discord.__version__}`', inline=True)
         
         # Memory and CPU usage
-        memory = psutil.virtual_memory()
-        cpu_percent = psutil.cpu_percent(interval=1)
-        
-        embed.add_field(name='💾 Memory Usage', value=f'`{memory.percent}%`', inline=True)
-        embed.add_field(name='⚙️ CPU Usage', value=f'`{cpu_percent}%`', inline=True)
-        embed.add_field(name='📡 Latency', value=f'`{round(self.bot.latency * 1000)}ms`', inline=True)
+        if sample:
+            embed.add_field(name='💾 Memory Usage', value=f'`{sample["memory"]}%` (bot `{sample["rss_mb"]:.0f} MB`)', inline=True)
+            embed.add_field(name='⚙️ CPU Usage', value=f'`{sample["cpu"]}%`', inline=True)
+        else:
+            embed.add_field(name='💾 Memory Usage', value='`warming up`', inline=True)
+            embed.add_field(name='⚙️ CPU Usage', value='`warming up`', inline=True)
+        embed.add_field(name='📡 Latency', value=f'`{format_latency(self.bot.latency)}`', inline=True)
+        if self.bot.shard_monitor.sharded:
+            embed.add_field(name=f'🧩 Shards ({self.bot.shard_count})', value=self.bot.shard_monitor.lines(), inline=False)
+        if totals:
+            embed.add_field(
+                name='🖧 Clusters',
+                value=f'`#{self.bot.cluster.cluster_id}` of `{totals["expected"]}` • `{totals["clusters"]}` reporting • '
+                      f'`{totals["connected"]}/{totals["shards"]}` shards connected',
+                inline=False
+            )
         
         embed.add_field(
             name='🔗 Links',
@@ -103,6 +131,34 @@ class General(commands.Cog):
         
         await ctx.send(embed=embed)
     
+    @commands.hybrid_command(name='stats', description='Show resource usage over the last hour and day')
+    async def stats(self, ctx):
+        """Show min/avg/max CPU, memory, loop lag and latency for the last hour and day"""
+        metrics = self.bot.metrics
+        
+        embed = discord.Embed(
+            title='📊 MochaBot Stats',
+            description=f'Sampled every {metrics.interval:g}s • min / avg / max',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        if not metrics.latest():
+            embed.description = 'No samples yet, try again in a few seconds.'
+            await ctx.send(embed=embed)
+            return
+        
+        hour, day = metrics.summary(3600), metrics.summary(86400)
+        for field, (label, unit) in FIELDS.items():
+            lines = []
+            for window, summary in (('1h', hour), ('24h', day)):
+                if summary[field]:
+                    low, avg, high = summary[field]
+                    lines.append(f'**{window}** `{low:,.1f}` / `{avg:,.1f}` / `{high:,.1f}` {unit}')
+            embed.add_field(name=label, value='\n'.join(lines) or '*No data*', inline=True)
+        
+        await ctx.send(embed=embed)
+    
     @commands.hybrid_command(name='serverinfo', aliases=['guildinfo', 'si'], description='Get information about the current server')
     async def serverinfo(self, ctx):
         """Display information about the current server"""
@@ -127,11 +183,11 @@ class General(commands.Cog):
         embed.add_field(name='👑 Owner', value=guild.owner.mention if guild.owner else 'Unknown', inline=True)
         embed.add_field(name='📅 Created', value=f'<t:{int(guild.created_at.timestamp())}:R>', inline=True)
         
-        # Member statistics
+        # Member statistics, kept current from gateway events
+        counts = self.bot.member_counters.get(guild)
         total_members = guild.member_count
-        online_members = len([m for m in guild.members if m.status != discord.Status.offline])
-        bots = len([m for m in guild.members if m.bot])
-        humans = total_members - bots
+        online_members = counts['online'] + counts['idle'] + counts['dnd']
+        bots = counts['bots']
         
         embed.add_field(name='👥 Total Members', value=f'`{total_members:,}`', inline=True)
         embed.add_field(name='🟢 Online', value=f'`{online_members:,}`', inline=True)
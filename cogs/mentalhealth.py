@@ -6,6 +6,9 @@ import random
 import asyncio
 from datetime import datetime, timedelta
 import json
+from utils.mood_store import MoodStore
+from utils.templates import EmbedTemplates
+from utils.reactions import apply_reactions
 
 BOT_COLOR = 0x8B4513
 
@@ -16,267 +19,57 @@ class MentalHealth(commands.Cog):
         self.bot = bot
         self.emoji = '🧠'
         
-        # Positive affirmations
-        self.affirmations = [
-            "You are stronger than you think.",
-            "Every small step counts towards your wellbeing.",
-            "You deserve love and kindness, especially from yourself.",
-            "It's okay to not be okay sometimes.",
-            "Your feelings are valid and important.",
-            "You have overcome challenges before, and you can do it again.",
-            "Taking care of your mental health is a sign of strength.",
-            "You are worthy of happiness and peace.",
-            "Progress, not perfection, is what matters.",
-            "You are not alone in your struggles.",
-            "Your mental health matters as much as your physical health.",
-            "It's brave to ask for help when you need it.",
-            "You are capable of creating positive change in your life.",
-            "Your journey is unique and valuable.",
-            "You have the power to choose how you respond to challenges."
-        ]
-        
-        # Breathing exercises
-        self.breathing_exercises = [
-            {
-                'name': '4-7-8 Breathing',
-                'description': 'Inhale for 4, hold for 7, exhale for 8',
-                'steps': [
-                    'Sit comfortably and close your eyes',
-                    'Inhale through your nose for 4 counts',
-                    'Hold your breath for 7 counts',
-                    'Exhale through your mouth for 8 counts',
-                    'Repeat 3-4 times'
-                ]
-            },
-            {
-                'name': 'Box Breathing',
-                'description': 'Equal counts for inhale, hold, exhale, hold',
-                'steps': [
-                    'Inhale for 4 counts',
-                    'Hold for 4 counts',
-                    'Exhale for 4 counts',
-                    'Hold empty for 4 counts',
-                    'Repeat 5-10 times'
-                ]
-            },
-            {
-                'name': 'Belly Breathing',
-                'description': 'Deep diaphragmatic breathing',
-                'steps': [
-                    'Place one hand on chest, one on belly',
-                    'Breathe slowly through your nose',
-                    'Feel your belly rise more than your chest',
-                    'Exhale slowly through pursed lips',
-                    'Continue for 5-10 minutes'
-                ]
-            }
-        ]
-        
-        # Grounding techniques
-        self.grounding_techniques = [
-            {
-                'name': '5-4-3-2-1 Technique',
-                'description': 'Use your senses to ground yourself',
-                'steps': [
-                    '5 things you can see',
-                    '4 things you can touch',
-                    '3 things you can hear',
-                    '2 things you can smell',
-                    '1 thing you can taste'
-                ]
-            },
-            {
-                'name': 'Progressive Muscle Relaxation',
-                'description': 'Tense and relax muscle groups',
-                'steps': [
-                    'Start with your toes, tense for 5 seconds',
-                    'Release and notice the relaxation',
-                    'Move up through each muscle group',
-                    'Finish with your face and scalp',
-                    'Breathe deeply throughout'
-                ]
-            },
-            {
-                'name': 'Mindful Observation',
-                'description': 'Focus completely on one object',
-                'steps': [
-                    'Choose an object near you',
-                    'Observe its color, texture, shape',
-                    'Notice how light hits it',
-                    'Focus only on this object for 2-3 minutes',
-                    'Let other thoughts pass without judgment'
-                ]
-            }
-        ]
-        
-        # Crisis resources (expanded)
-        # Keys are ISO country codes or common names; values are dict of service -> contact
-        self.crisis_resources = {
-            'US': {
-                'Suicide & Crisis Lifeline': '988',
-                'Crisis Text Line': 'Text HOME to 741741',
-                'SAMHSA National Helpline': '1-800-662-4357'
-            },
-            'UK': {
-                'Samaritans': '116 123',
-                'Crisis Text Line': 'Text SHOUT to 85258',
-                'NHS 111': '111'
-            },
-            'CA': {
-                'Talk Suicide Canada': '1-833-456-4566',
-                'Crisis Text Line': 'Text TALK to 686868'
-            },
-            'AU': {
-                'Lifeline': '13 11 14',
-                'Kids Helpline': '1800 55 1800'
-            },
-            'IN': {
-                'Vandrevala Foundation': '1860-2662-345',
-                'AASRA': '+91-9820466726'
-            },
-            'IE': {
-                'Samaritans Ireland': '116 123',
-                'Pieta House': '1800 247 247'
-            },
-            'NZ': {
-                'Lifeline Aotearoa': '0800 543 354',
-                '1737 Need to Talk?': 'Text/Call 1737'
-            },
-            'SG': {
-                'Samaritans of Singapore (SOS)': '1767 / CareText: 9151 1767'
-            },
-            'PH': {
-                'National Center for Mental Health Crisis Hotline': '1553 / 0917-899-USAP (8727)'
-            },
-            'MY': {
-                'Befrienders KL': '03-7627 2929'
-            },
-            'ZA': {
-                'Lifeline South Africa': '0861 322 322',
-                'SADAG Suicide Crisis Line': '0800 567 567'
-            },
-            'NG': {
-                'Mentally Aware Nigeria (MANI)': '0809 111 6264'
-            },
-            'KE': {
-                'Befrienders Kenya': '+254 722 178 177'
-            },
-            'GH': {
-                'Mental Health Authority Helpline': '0800-111-101'
-            },
-            'PK': {
-                'Umang Pakistan Helpline': '0311-7786264'
-            },
-            'BD': {
-                'Kaan Pete Roi': '0966 678 6464'
-            },
-            'LK': {
-                'Sumithrayo': '011 269 6666'
-            },
-            'AE': {
-                '800 HOPE (NCMH)': '800 4673'
-            },
-            'SA': {
-                'Saudi Life Line': '920033360'
-            },
-            'TR': {
-                'Alo 183': '183 (Social Support)'
-            },
-            'DE': {
-                'TelefonSeelsorge': '0800 111 0 111 / 0800 111 0 222'
-            },
-            'FR': {
-                '3114 Suicide Prevention Hotline': '3114'
-            },
-            'ES': {
-                '024 Línea 024': '024'
-            },
-            'IT': {
-                'Samaritans Italy': '06 77208977'
-            },
-            'PT': {
-                'SOS Voz Amiga': '213 544 545'
-            },
-            'NL': {
-                '113 Zelfmoordpreventie': '0800-0113'
-            },
-            'BE': {
-                'Zelfmoordlijn 1813': '1813'
-            },
-            'SE': {
-                'Mind Självmordslinjen': '90101'
-            },
-            'NO': {
-                'Mental Helse Hjelpetelefonen': '116 123'
-            },
-            'DK': {
-                'Livslinien': '70 201 201'
-            },
-            'FI': {
-                'Crisis Centre Phone': '09 2525 0111'
-            },
-            'PL': {
-                'Centrum Wsparcia': '800 70 2222'
-            },
-            'CZ': {
-                'Linka Bezpečí': '116 111'
-            },
-            'AT': {
-                'TelefonSeelsorge Österreich': '142'
-            },
-            'CH': {
-                'Die Dargebotene Hand': '143'
-            },
-            'RO': {
-                'Alianța Română de Prevenție a Suicidului': '0800 801 200'
-            },
-            'GR': {
-                'Suicide Helpline': '1018'
-            },
-            'IL': {
-                'ERAN Emotional First Aid': '1201'
-            },
-            'MX': {
-                'Línea de la Vida': '800 911 2000'
-            },
-            'BR': {
-                'Centro de Valorização da Vida (CVV)': '188'
-            },
-            'AR': {
-                'Línea de Prevención del Suicidio': '135 / (011) 5275-1135'
-            },
-            'CL': {
-                'Servicio Salud Responde': '600 360 7777'
-            },
-            'CO': {
-                'Línea 106': '106'
-            },
-            'PE': {
-                'Línea 113 (Option 5)': '113'
-            },
-            'UY': {
-                'Vida': '0800 0767'
-            }
+        # Self-care ideas by category
+        self.selfcare_activities = {
+            'physical': [
+                'Take a warm bath or shower', 'Go for a gentle walk outside', 'Do some light stretching', 'Practice yoga', 'Get enough sleep', 'Drink water', 'Eat a nourishing meal', 'Dance to music'
+            ],
+            'emotional': [
+                'Write in a journal', 'Call someone you care about', 'Practice gratitude', 'Allow yourself to cry', 'Listen to calming music', 'Watch a comfort movie', 'Practice self-compassion', 'Set a boundary'
+            ],
+            'mental': [
+                'Take a social media break', 'Read a book', 'Practice a hobby', 'Learn something new', 'Organize a small space', 'Do a puzzle', 'Limit news', 'Practice mindfulness'
+            ],
+            'social': [
+                'Reach out to a friend', 'Join a support group', 'Spend time with pets', 'Video call family', 'Write a thank you note', 'Volunteer', 'Join a community', 'Practice active listening'
+            ]
         }
         
+        # Static embeds are built once here; commands send copies. Affirmations,
+        # exercises and crisis lines come from the content pack and are rebuilt
+        # whenever !content reload swaps in a new one
+        self.templates = EmbedTemplates()
+        bot.content.subscribe(self.apply_content)
+        
+        # Mood journal with rollups for !moodstats
+        self.mood_store = MoodStore(bot.db)
+    
+    def build_templates(self):
+        """(Re)build the static embeds from the current resource data"""
+        self.templates.clear()
+        self.templates.register('breathe', self._breathe_embed, keys=[ex['name'] for ex in self.breathing_exercises])
+        self.templates.register('ground', self._ground_embed, keys=[tech['name'] for tech in self.grounding_techniques])
+        self.templates.register('crisis', self._crisis_embed, keys=self.crisis_resources)
+        self.templates.register('therapy', self._therapy_embed)
+    
+    def apply_content(self, pack):
+        """Take the resources from a (new) content pack and rebuild the embeds made from them"""
+        resources = pack['mentalhealth']
+        self.affirmations = resources['affirmations']
+        self.breathing_exercises = resources['breathing_exercises']
+        self.grounding_techniques = resources['grounding_techniques']
+        self.crisis_resources = resources['crisis_resources']
         # Map common country names to codes for user convenience
-        self.country_aliases = {
-            'USA': 'US', 'UNITED STATES': 'US', 'AMERICA': 'US',
-            'UNITED KINGDOM': 'UK', 'BRITAIN': 'UK', 'ENGLAND': 'UK',
-            'CANADA': 'CA', 'AUSTRALIA': 'AU', 'INDIA': 'IN',
-            'IRELAND': 'IE', 'NEW ZEALAND': 'NZ', 'SINGAPORE': 'SG',
-            'PHILIPPINES': 'PH', 'MALAYSIA': 'MY', 'SOUTH AFRICA': 'ZA',
-            'NIGERIA': 'NG', 'KENYA': 'KE', 'GHANA': 'GH',
-            'PAKISTAN': 'PK', 'BANGLADESH': 'BD', 'SRI LANKA': 'LK',
-            'UAE': 'AE', 'SAUDI ARABIA': 'SA', 'TURKIYE': 'TR', 'TURKEY': 'TR',
-            'GERMANY': 'DE', 'FRANCE': 'FR', 'SPAIN': 'ES', 'ITALY': 'IT',
-            'PORTUGAL': 'PT', 'NETHERLANDS': 'NL', 'BELGIUM': 'BE',
-            'SWEDEN': 'SE', 'NORWAY': 'NO', 'DENMARK': 'DK', 'FINLAND': 'FI',
-            'POLAND': 'PL', 'CZECH': 'CZ', 'AUSTRIA': 'AT', 'SWITZERLAND': 'CH',
-            'ROMANIA': 'RO', 'GREECE': 'GR', 'ISRAEL': 'IL',
-            'MEXICO': 'MX', 'BRAZIL': 'BR', 'ARGENTINA': 'AR', 'CHILE': 'CL',
-            'COLOMBIA': 'CO', 'PERU': 'PE', 'URUGUAY': 'UY'
-        }
+        self.country_aliases = resources['country_aliases']
+        self.build_templates()
+    
+    async def cog_load(self):
+        await self.mood_store.load()
+        self.mood_store.start()
+    
+    async def cog_unload(self):
+        self.bot.content.unsubscribe(self.apply_content)
+        await self.mood_store.stop()
     
     @commands.hybrid_command(name='affirmation', aliases=['affirm'], description='Get a positive affirmation')
     async def affirmation(self, ctx):
@@ -293,33 +86,14 @@ class MentalHealth(commands.Cog):
         embed.set_footer(text="Remember: You matter and you are valued ❤️")
         
         message = await ctx.send(embed=embed)
-        await message.add_reaction('❤️')
-        await message.add_reaction('🌟')
+        apply_reactions(message, ['❤️', '🌟'])
     
-    @commands.hybrid_command(name='breathe', description='Get a guided breathing exercise')
-    async def breathe(self, ctx, exercise_name: str = None):
-        """Practice breathing exercises for anxiety and stress relief"""
-        
-        if exercise_name:
-            # Find specific exercise
-            exercise = None
-            for ex in self.breathing_exercises:
-                if exercise_name.lower() in ex['name'].lower():
-                    exercise = ex
-                    break
-            
-            if not exercise:
-                available = ', '.join([ex['name'] for ex in self.breathing_exercises])
-                await ctx.send(f'❌ Exercise not found! Available: {available}')
-                return
-        else:
-            exercise = random.choice(self.breathing_exercises)
-        
+    def _breathe_embed(self, name):
+        exercise = next(ex for ex in self.breathing_exercises if ex['name'] == name)
         embed = discord.Embed(
             title=f'🫁 {exercise["name"]}',
             description=exercise['description'],
-            color=0x98FB98,  # Light green for relaxation
-            timestamp=datetime.utcnow()
+            color=0x98FB98  # Light green for relaxation
         )
         
         steps_text = '\n'.join([f'{i+1}. {step}' for i, step in enumerate(exercise['steps'])])
@@ -332,32 +106,32 @@ class MentalHealth(commands.Cog):
         )
         
         embed.set_footer(text="Breathe at your own pace. You're doing great! 🌸")
-        
-        await ctx.send(embed=embed)
+        return embed
     
-    @commands.hybrid_command(name='ground', aliases=['grounding'], description='Get a grounding technique for anxiety')
-    async def ground(self, ctx, technique_name: str = None):
-        """Use grounding techniques to manage anxiety and panic"""
+    @commands.hybrid_command(name='breathe', description='Get a guided breathing exercise')
+    async def breathe(self, ctx, exercise_name: str = None):
+        """Practice breathing exercises for anxiety and stress relief"""
+        names = self.templates.keys('breathe')
         
-        if technique_name:
-            technique = None
-            for tech in self.grounding_techniques:
-                if technique_name.lower() in tech['name'].lower():
-                    technique = tech
-                    break
+        if exercise_name:
+            # Find specific exercise
+            name = next((n for n in names if exercise_name.lower() in n.lower()), None)
             
-            if not technique:
-                available = ', '.join([tech['name'] for tech in self.grounding_techniques])
-                await ctx.send(f'❌ Technique not found! Available: {available}')
+            if not name:
+                available = ', '.join(names)
+                await ctx.send(f'❌ Exercise not found! Available: {available}')
                 return
         else:
-            technique = random.choice(self.grounding_techniques)
+            name = random.choice(names)
         
+        await ctx.send(embed=self.templates.render('breathe', name))
+    
+    def _ground_embed(self, name):
+        technique = next(tech for tech in self.grounding_techniques if tech['name'] == name)
         embed = discord.Embed(
             title=f'🌱 {technique["name"]}',
             description=technique['description'],
-            color=0xDDA0DD,  # Plum for grounding
-            timestamp=datetime.utcnow()
+            color=0xDDA0DD  # Plum for grounding
         )
         
         steps_text = '\n'.join([f'• {step}' for step in technique['steps']])
@@ -370,8 +144,24 @@ class MentalHealth(commands.Cog):
         )
         
         embed.set_footer(text="Take it slow. You're safe in this moment. 🕊️")
+        return embed
+    
+    @commands.hybrid_command(name='ground', aliases=['grounding'], description='Get a grounding technique for anxiety')
+    async def ground(self, ctx, technique_name: str = None):
+        """Use grounding techniques to manage anxiety and panic"""
+        names = self.templates.keys('ground')
         
-        await ctx.send(embed=embed)
+        if technique_name:
+            name = next((n for n in names if technique_name.lower() in n.lower()), None)
+            
+            if not name:
+                available = ', '.join(names)
+                await ctx.send(f'❌ Technique not found! Available: {available}')
+                return
+        else:
+            name = random.choice(names)
+        
+        await ctx.send(embed=self.templates.render('ground', name))
     
     @commands.hybrid_command(name='mood', description='Log and track your current mood')
     async def mood(self, ctx, mood_level: int = None, *, notes: str = None):
@@ -386,7 +176,7 @@ class MentalHealth(commands.Cog):
             )
             embed.add_field(
                 name='How to Use',
-                value='`!mood <1-10> [optional notes]`\n\nExample: `!mood 7 Had a good day at work`',
+                value='`!mood <1-10> [optional notes]`\n\nExample: `!mood 7 Had a good day at work`\n\nSee your trends with `!moodstats [7d|30d|90d]`',
                 inline=False
             )
             embed.add_field(
@@ -406,6 +196,8 @@ class MentalHealth(commands.Cog):
             await ctx.send('❌ Mood level must be between 1 and 10!')
             return
         
+        self.mood_store.log(ctx.author.id, ctx.guild.id if ctx.guild else None, mood_level, notes)
+        
         mood_emojis = {1:'😢',2:'😞',3:'😔',4:'🙁',5:'😐',6:'🙂',7:'😊',8:'😄',9:'😁',10:'🤩'}
         mood_colors = {1:0x8B0000,2:0xDC143C,3:0xFF4500,4:0xFF8C00,5:0xFFD700,6:0xADFF2F,7:0x32CD32,8:0x00FF7F,9:0x00CED1,10:0x9370DB}
         embed = discord.Embed(
@@ -425,6 +217,63 @@ class MentalHealth(commands.Cog):
         embed.set_footer(text=f"Logged by {ctx.author.display_name} | Your feelings matter")
         await ctx.send(embed=embed)
     
+    @commands.hybrid_command(name='moodstats', description='See your mood trends over time')
+    async def moodstats(self, ctx, period: str = '7d'):
+        """Summarize your logged moods over 7d, 30d or 90d"""
+        periods = {'7d': 7, '30d': 30, '90d': 90}
+        period = period.lower()
+        if period not in periods:
+            await ctx.send('❌ Period must be one of: `7d`, `30d`, `90d`')
+            return
+        
+        stats = await self.mood_store.stats(ctx.author.id, periods[period])
+        
+        embed = discord.Embed(
+            title=f'📊 Your Mood - Last {periods[period]} Days',
+            color=0xFFB6C1,
+            timestamp=datetime.utcnow()
+        )
+        
+        if not stats['count']:
+            embed.description = 'No moods logged in this period yet. Start with `!mood <1-10>`.'
+            await ctx.send(embed=embed)
+            return
+        
+        embed.add_field(name='📝 Entries', value=f'`{stats["count"]}`', inline=True)
+        embed.add_field(name='📈 Average', value=f'`{stats["mean"]:.1f}/10`', inline=True)
+        embed.add_field(name='↕️ Range', value=f'`{stats["min"]} – {stats["max"]}`', inline=True)
+        embed.add_field(name='🔥 Current Streak', value=f'`{stats["current_streak"]} days`', inline=True)
+        embed.add_field(name='🏆 Best Streak', value=f'`{stats["best_streak"]} days`', inline=True)
+        
+        if len(stats['weekly']) > 1:
+            trend = '\n'.join(
+                f'<t:{first_day * 86400}:d> {"█" * round(avg)}{"░" * (10 - round(avg))} {avg:.1f} ({count})'
+                for first_day, count, avg in stats['weekly'][-13:]
+            )
+            embed.add_field(name='🗓️ Weekly Averages', value=trend, inline=False)
+        
+        embed.add_field(name='💙 Remember', value='Patterns are worth sharing with a therapist or someone you trust.', inline=False)
+        embed.set_footer(text=f"Mood stats for {ctx.author.display_name} | Progress, not perfection")
+        await ctx.send(embed=embed)
+    
+    def _add_crisis_footer(self, embed):
+        embed.add_field(name='💙 Remember', value='You are not alone. People want to help you through this.', inline=False)
+        embed.add_field(name='🌟 You Matter', value='Your life has value. Please reach out.', inline=False)
+        embed.set_footer(text="Crisis resources are available 24/7 | You deserve support")
+        return embed
+    
+    def _crisis_embed(self, key):
+        resources = self.crisis_resources[key]
+        country_display = next((name for name, code in self.country_aliases.items() if code == key and name.isupper()), key)
+        embed = discord.Embed(
+            title=f'🆘 Crisis Resources - {country_display}',
+            description='If you are in immediate danger, call local emergency services (911, 999, 112).',
+            color=0xFF0000
+        )
+        for service, contact in resources.items():
+            embed.add_field(name=f'📞 {service}', value=f'**{contact}**', inline=False)
+        return self._add_crisis_footer(embed)
+    
     @commands.hybrid_command(name='crisis', description='Get emergency mental health resources')
     async def crisis(self, ctx, *, country: str = 'US'):
         """Access crisis helplines and emergency mental health resources"""
@@ -432,7 +281,8 @@ class MentalHealth(commands.Cog):
         # Map common names to codes
         key = self.country_aliases.get(key, key)
         
-        if key not in self.crisis_resources:
+        embed = self.templates.render('crisis', key)
+        if not embed:
             available = ', '.join(sorted(self.crisis_resources.keys()))
             alias_hint = 'You can use country names too (e.g., India, Canada, Brazil).'
             embed = discord.Embed(
@@ -441,21 +291,7 @@ class MentalHealth(commands.Cog):
                 color=0xFF0000,
                 timestamp=datetime.utcnow()
             )
-        else:
-            resources = self.crisis_resources[key]
-            country_display = next((name for name, code in self.country_aliases.items() if code == key and name.isupper()), key)
-            embed = discord.Embed(
-                title=f'🆘 Crisis Resources - {country_display}',
-                description='If you are in immediate danger, call local emergency services (911, 999, 112).',
-                color=0xFF0000,
-                timestamp=datetime.utcnow()
-            )
-            for service, contact in resources.items():
-                embed.add_field(name=f'📞 {service}', value=f'**{contact}**', inline=False)
-        
-        embed.add_field(name='💙 Remember', value='You are not alone. People want to help you through this.', inline=False)
-        embed.add_field(name='🌟 You Matter', value='Your life has value. Please reach out.', inline=False)
-        embed.set_footer(text="Crisis resources are available 24/7 | You deserve support")
+            self._add_crisis_footer(embed)
         await ctx.send(embed=embed)
     
     @commands.hybrid_command(name='checkin', description='Daily mental health check-in')
@@ -478,35 +314,19 @@ class MentalHealth(commands.Cog):
         embed.add_field(name='🌱 Daily Practice', value='Regular check-ins help you stay aware of your mental health.', inline=False)
         embed.set_footer(text="Self-awareness is the first step to self-care 🌸")
         message = await ctx.send(embed=embed)
-        await message.add_reaction('💝')
-        await message.add_reaction('🌱')
-        await message.add_reaction('✨')
+        apply_reactions(message, ['💝', '🌱', '✨'])
     
     @commands.hybrid_command(name='selfcare', aliases=['care'], description='Get self-care suggestions')
     async def selfcare(self, ctx, category: str = None):
-        selfcare_activities = {
-            'physical': [
-                'Take a warm bath or shower', 'Go for a gentle walk outside', 'Do some light stretching', 'Practice yoga', 'Get enough sleep', 'Drink water', 'Eat a nourishing meal', 'Dance to music'
-            ],
-            'emotional': [
-                'Write in a journal', 'Call someone you care about', 'Practice gratitude', 'Allow yourself to cry', 'Listen to calming music', 'Watch a comfort movie', 'Practice self-compassion', 'Set a boundary'
-            ],
-            'mental': [
-                'Take a social media break', 'Read a book', 'Practice a hobby', 'Learn something new', 'Organize a small space', 'Do a puzzle', 'Limit news', 'Practice mindfulness'
-            ],
-            'social': [
-                'Reach out to a friend', 'Join a support group', 'Spend time with pets', 'Video call family', 'Write a thank you note', 'Volunteer', 'Join a community', 'Practice active listening'
-            ]
-        }
-        if category and category.lower() in selfcare_activities:
-            activities = selfcare_activities[category.lower()]
+        if category and category.lower() in self.selfcare_activities:
+            activities = self.selfcare_activities[category.lower()]
             title = f'💆 {category.title()} Self-Care'
         elif category:
-            available = ', '.join(selfcare_activities.keys())
+            available = ', '.join(self.selfcare_activities.keys())
             await ctx.send(f'❌ Category not found! Available: {available}')
             return
         else:
-            all_acts = [a for lst in selfcare_activities.values() for a in lst]
+            all_acts = [a for lst in self.selfcare_activities.values() for a in lst]
             activities = [random.choice(all_acts)]
             title = '💆 Self-Care Suggestion'
         embed = discord.Embed(title=title, color=0x98FB98, timestamp=datetime.utcnow())
@@ -519,13 +339,11 @@ class MentalHealth(commands.Cog):
         embed.set_footer(text="Small acts of self-care make a big difference 🌺")
         await ctx.send(embed=embed)
     
-    @commands.hybrid_command(name='therapy', description='Information about therapy and mental health resources')
-    async def therapy(self, ctx):
+    def _therapy_embed(self, _):
         embed = discord.Embed(
             title='🛋️ Therapy & Mental Health Support',
             description='Professional mental health support can be incredibly helpful.',
-            color=0x9370DB,
-            timestamp=datetime.utcnow()
+            color=0x9370DB
         )
         embed.add_field(name='🔍 Finding a Therapist', value='• Psychology Today directory\n• Insurance provider website\n• Community health centers\n• University counseling centers\n• Employee assistance programs', inline=False)
         embed.add_field(name='💻 Online Therapy Options', value='• BetterHelp\n• Talkspace\n• MDLIVE\n• Amwell\n• 7 Cups (peer support)', inline=False)
@@ -533,7 +351,11 @@ class MentalHealth(commands.Cog):
         embed.add_field(name='🌟 What to Expect', value='Therapy is a safe space with a trained professional. It\'s okay to shop around for the right fit.', inline=False)
         embed.add_field(name='💙 Remember', value='Seeking therapy is a sign of strength. You deserve support and care.', inline=False)
         embed.set_footer(text="Your mental health is as important as your physical health 💚")
-        await ctx.send(embed=embed)
+        return embed
+    
+    @commands.hybrid_command(name='therapy', description='Information about therapy and mental health resources')
+    async def therapy(self, ctx):
+        await ctx.send(embed=self.templates.render('therapy'))
 
 
 async def setup(bot):
@@ -3,7 +3,10 @@
 import discord
 from discord.ext import commands
 from datetime import datetime, timedelta
-import asyncio
+from utils.infractions import InfractionLedger, ESCALATION_TIMEOUT
+from utils.keywords import VALID_KEYWORD
+from utils.channels import PURPOSES
+from zoneinfo import ZoneInfoNotFoundError
 
 BOT_COLOR = 0x8B4513
 
@@ -13,7 +16,10 @@ class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.emoji = '🔒'
-        self.muted_members = {}  # Simple in-memory storage for muted members
+        self.infractions = InfractionLedger(bot.db)
+    
+    async def cog_load(self):
+        await self.infractions.load()
     
     def has_permissions(**permissions):
         """Custom check for permissions"""
@@ -62,6 +68,7 @@ class Moderation(commands.Cog):
                 pass  # User has DMs disabled
             
             await member.kick(reason=f'{ctx.author}: {reason}')
+            case_id = await self.infractions.record(ctx.guild.id, member.id, ctx.author.id, 'kick', reason)
             
             embed = discord.Embed(
                 title='✅ Member Kicked',
@@ -71,6 +78,7 @@ class Moderation(commands.Cog):
             )
             embed.add_field(name='Reason', value=reason, inline=False)
             embed.add_field(name='Moderator', value=ctx.author.mention, inline=True)
+            embed.set_footer(text=f'Case #{case_id}')
             
             await ctx.send(embed=embed)
             
@@ -120,6 +128,7 @@ class Moderation(commands.Cog):
                 pass  # User has DMs disabled
             
             await member.ban(reason=f'{ctx.author}: {reason}', delete_message_days=delete_days)
+            case_id = await self.infractions.record(ctx.guild.id, member.id, ctx.author.id, 'ban', reason)
             
             embed = discord.Embed(
                 title='✅ Member Banned',
@@ -130,6 +139,7 @@ class Moderation(commands.Cog):
             embed.add_field(name='Reason', value=reason, inline=False)
             embed.add_field(name='Moderator', value=ctx.author.mention, inline=True)
             embed.add_field(name='Messages Deleted', value=f'{delete_days} days', inline=True)
+            embed.set_footer(text=f'Case #{case_id}')
             
             await ctx.send(embed=embed)
             
@@ -217,6 +227,7 @@ class Moderation(commands.Cog):
         try:
             until = datetime.utcnow() + timedelta(seconds=seconds)
             await member.timeout(until, reason=f'{ctx.author}: {reason}')
+            case_id = await self.infractions.record(ctx.guild.id, member.id, ctx.author.id, 'timeout', reason, duration=seconds)
             
             embed = discord.Embed(
                 title='✅ Member Timed Out',
@@ -228,6 +239,7 @@ class Moderation(commands.Cog):
             embed.add_field(name='Until', value=f'<t:{int(until.timestamp())}:R>', inline=True)
             embed.add_field(name='Reason', value=reason, inline=False)
             embed.add_field(name='Moderator', value=ctx.author.mention, inline=True)
+            embed.set_footer(text=f'Case #{case_id}')
             
             await ctx.send(embed=embed)
             
@@ -285,13 +297,8 @@ class Moderation(commands.Cog):
             embed.add_field(name='Moderator', value=ctx.author.mention, inline=True)
             embed.add_field(name='Channel', value=ctx.channel.mention, inline=True)
             
-            # Send a temporary message that deletes itself
-            temp_message = await ctx.send(embed=embed)
-            await asyncio.sleep(5)
-            try:
-                await temp_message.delete()
-            except:
-                pass
+            # Send a temporary message that deletes itself (in the background, so the command returns now)
+            await ctx.send(embed=embed, delete_after=5)
             
         except discord.Forbidden:
             await ctx.send('❌ I don\'t have permission to delete messages!')
@@ -345,6 +352,8 @@ class Moderation(commands.Cog):
             await ctx.send('❌ I cannot warn myself!')
             return
         
+        case_id = await self.infractions.record(ctx.guild.id, member.id, ctx.author.id, 'warn', reason)
+        
         try:
             # Send DM to the member
             dm_embed = discord.Embed(
@@ -368,6 +377,7 @@ class Moderation(commands.Cog):
             )
             embed.add_field(name='Reason', value=reason, inline=False)
             embed.add_field(name='Moderator', value=ctx.author.mention, inline=True)
+            embed.set_footer(text=f'Case #{case_id}')
             
             await ctx.send(embed=embed)
             
@@ -381,11 +391,247 @@ class Moderation(commands.Cog):
             )
             embed.add_field(name='Reason', value=reason, inline=False)
             embed.add_field(name='Moderator', value=ctx.author.mention, inline=True)
+            embed.set_footer(text=f'Case #{case_id}')
             
             await ctx.send(embed=embed)
         
         except Exception as e:
             await ctx.send(f'❌ An error occurred: {str(e)}')
+        
+        if self.infractions.should_escalate(ctx.guild.id, member.id):
+            await self._escalate_warns(ctx, member)
+    
+    async def _escalate_warns(self, ctx, member):
+        """Apply the automatic timeout for repeated warns"""
+        warns = self.infractions.recent_warns(ctx.guild.id, member.id)
+        hours = self.infractions.window // 3600
+        reason = f'Automatic: {warns} warnings in {hours}h'
+        
+        if member.is_timed_out():
+            return
+        
+        try:
+            until = discord.utils.utcnow() + timedelta(seconds=ESCALATION_TIMEOUT)
+            await member.timeout(until, reason=reason)
+        except discord.HTTPException:
+            await ctx.send(f'⚠️ **{member}** has {warns} warnings in {hours}h, but I couldn\'t time them out.')
+            return
+        
+        case_id = await self.infractions.record(ctx.guild.id, member.id, ctx.bot.user.id, 'timeout', reason, duration=ESCALATION_TIMEOUT)
+        
+        embed = discord.Embed(
+            title='⏳ Automatic Timeout',
+            description=f'**{member}** has been timed out after repeated warnings',
+            color=0xFFA500,
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name='Duration', value=f'{ESCALATION_TIMEOUT // 60}m', inline=True)
+        embed.add_field(name='Until', value=f'<t:{int(until.timestamp())}:R>', inline=True)
+        embed.add_field(name='Reason', value=reason, inline=False)
+        embed.set_footer(text=f'Case #{case_id}')
+        
+        await ctx.send(embed=embed)
+    
+    @commands.hybrid_command(name='infractions', aliases=['cases'], description='Show a member\'s moderation history')
+    @commands.has_permissions(manage_messages=True)
+    async def infractions_command(self, ctx, member: discord.Member):
+        """Show a member's infraction totals and most recent cases"""
+        totals = await self.infractions.totals(ctx.guild.id, member.id)
+        history = await self.infractions.history(ctx.guild.id, member.id)
+        
+        embed = discord.Embed(
+            title=f'📋 Infractions for {member}',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        if not history:
+            embed.description = 'No infractions on record. 🌟'
+            await ctx.send(embed=embed)
+            return
+        
+        action_emojis = {'warn': '⚠️', 'timeout': '⏳', 'kick': '👢', 'ban': '🚫'}
+        embed.description = ' • '.join(
+            f'{action_emojis.get(action, "•")} {action.title()}: **{count}**' for action, count in sorted(totals.items())
+        )
+        
+        for case_id, action, reason, moderator_id, duration, created_at in history:
+            detail = f' ({int(duration // 60)}m)' if duration else ''
+            embed.add_field(
+                name=f'#{case_id} {action_emojis.get(action, "•")} {action.title()}{detail}',
+                value=f'{(reason or "No reason provided")[:200]}\nBy <@{moderator_id}> • <t:{int(created_at)}:R>',
+                inline=False
+            )
+        
+        recent = self.infractions.recent_warns(ctx.guild.id, member.id)
+        embed.set_footer(text=f'Recent warns: {recent}/{self.infractions.warns} in the last {self.infractions.window // 3600}h')
+        await ctx.send(embed=embed)
+    
+    @commands.hybrid_group(name='keywords', fallback='list', description='Configure keyword reactions for this server')
+    @commands.has_permissions(manage_guild=True)
+    async def keywords(self, ctx):
+        """Show the keywords MochaBot reacts to in this server"""
+        categories = self.bot.keyword_reactions.categories_for(ctx.guild.id)
+        
+        embed = discord.Embed(
+            title='🔑 Keyword Reactions',
+            description='MochaBot sometimes reacts to messages containing these words.',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        for name, category in categories.items():
+            words = ', '.join(f'`{k}`' for k in category['keywords']) or '*None*'
+            embed.add_field(
+                name=f'{category["emoji"]} {name.title()} ({category["probability"]:.1%} chance)',
+                value=words[:1024],
+                inline=False
+            )
+        
+        embed.set_footer(text='!keywords add|remove <category> <word> • !keywords rate <category> <percent> • !keywords reset')
+        await ctx.send(embed=embed)
+    
+    async def _check_keyword_category(self, ctx, category):
+        if category in self.bot.keyword_reactions.defaults:
+            return True
+        await ctx.send(f'❌ Unknown category! Available: {", ".join(self.bot.keyword_reactions.defaults)}')
+        return False
+    
+    @keywords.command(name='add', description='React to a new keyword')
+    @commands.has_permissions(manage_guild=True)
+    async def keywords_add(self, ctx, category: str, *, keyword: str):
+        """Add a keyword to a category for this server"""
+        category, keyword = category.lower(), keyword.strip().lower()
+        if not await self._check_keyword_category(ctx, category):
+            return
+        if not VALID_KEYWORD.match(keyword):
+            await ctx.send('❌ Keywords must be 2-32 letters, numbers, spaces, hyphens or apostrophes.')
+            return
+        await self.bot.keyword_reactions.set_keyword(ctx.guild.id, category, keyword, True)
+        await ctx.send(f'✅ I\'ll now react to `{keyword}` ({category}).')
+    
+    @keywords.command(name='remove', description='Stop reacting to a keyword')
+    @commands.has_permissions(manage_guild=True)
+    async def keywords_remove(self, ctx, category: str, *, keyword: str):
+        """Remove a keyword (including a default one) from a category for this server"""
+        category, keyword = category.lower(), keyword.strip().lower()
+        if not await self._check_keyword_category(ctx, category):
+            return
+        await self.bot.keyword_reactions.set_keyword(ctx.guild.id, category, keyword, False)
+        await ctx.send(f'✅ I\'ll no longer react to `{keyword}` ({category}).')
+    
+    @keywords.command(name='rate', description='Set how often a category gets a reaction')
+    @commands.has_permissions(manage_guild=True)
+    async def keywords_rate(self, ctx, category: str, percent: float):
+        """Set the reaction chance for a category (0-100%)"""
+        category = category.lower()
+        if not await self._check_keyword_category(ctx, category):
+            return
+        if percent < 0 or percent > 100:
+            await ctx.send('❌ Percent must be between 0 and 100!')
+            return
+        await self.bot.keyword_reactions.set_probability(ctx.guild.id, category, percent / 100)
+        await ctx.send(f'✅ {category.title()} keywords now get a reaction {percent:g}% of the time.')
+    
+    @keywords.command(name='reset', description='Restore the default keyword reactions')
+    @commands.has_permissions(manage_guild=True)
+    async def keywords_reset(self, ctx):
+        """Drop this server's keyword customizations"""
+        await self.bot.keyword_reactions.reset(ctx.guild.id)
+        await ctx.send('✅ Keyword reactions reset to the defaults.')
+    
+    @commands.hybrid_group(name='channels', fallback='list', description='Show which channels MochaBot uses for what')
+    @commands.has_permissions(manage_guild=True)
+    async def channels(self, ctx):
+        """Show the welcome, wellness, modlog and support channels for this server"""
+        pinned = self.bot.channel_index.pinned(ctx.guild.id)
+        
+        embed = discord.Embed(
+            title='📌 Channel Purposes',
+            description='Pinned channels are always used; otherwise MochaBot looks for a channel by name.',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        for purpose, names in PURPOSES.items():
+            channel = self.bot.channel_index.resolve(ctx.guild, purpose)
+            if channel and pinned.get(purpose) == channel.id:
+                value = f'{channel.mention} (pinned)'
+            elif channel:
+                value = f'{channel.mention} (found by name)'
+            else:
+                value = f'*None* — name a channel `{names[0]}` or pin one'
+            embed.add_field(name=purpose.title(), value=value, inline=False)
+        
+        embed.set_footer(text='!channels set <purpose> <#channel> • !channels clear <purpose>')
+        await ctx.send(embed=embed)
+    
+    async def _check_channel_purpose(self, ctx, purpose):
+        if purpose in PURPOSES:
+            return True
+        await ctx.send(f'❌ Unknown purpose! Available: {", ".join(PURPOSES)}')
+        return False
+    
+    @channels.command(name='set', description='Pin a channel to a purpose')
+    @commands.has_permissions(manage_guild=True)
+    async def channels_set(self, ctx, purpose: str, channel: discord.TextChannel):
+        """Always use this channel for a purpose (welcome, wellness, modlog, support)"""
+        purpose = purpose.lower()
+        if not await self._check_channel_purpose(ctx, purpose):
+            return
+        await self.bot.channel_index.pin(ctx.guild.id, purpose, channel.id)
+        await ctx.send(f'✅ {purpose.title()} messages will go to {channel.mention}.')
+    
+    @channels.command(name='clear', description='Unpin a purpose and go back to finding it by name')
+    @commands.has_permissions(manage_guild=True)
+    async def channels_clear(self, ctx, purpose: str):
+        """Remove the pinned channel for a purpose"""
+        purpose = purpose.lower()
+        if not await self._check_channel_purpose(ctx, purpose):
+            return
+        if await self.bot.channel_index.unpin(ctx.guild.id, purpose):
+            await ctx.send(f'✅ {purpose.title()} channel unpinned; I\'ll look for it by name again.')
+        else:
+            await ctx.send(f'ℹ️ No {purpose} channel was pinned.')
+    
+    @commands.hybrid_command(name='wellnesstime', description='Set when the daily wellness reminder is posted')
+    @commands.has_permissions(manage_guild=True)
+    async def wellnesstime(self, ctx, time: str = None, timezone: str = 'UTC'):
+        """Post the wellness reminder daily at a local time (e.g. 09:00 Europe/London), or 'off'"""
+        schedule = self.bot.wellness_schedule
+        
+        if time is None:
+            current = schedule.get(ctx.guild.id)
+            if current:
+                minute, tz, due_at = current
+                await ctx.send(f'🌸 Wellness reminders go out daily at **{minute // 60:02d}:{minute % 60:02d} {tz}** (next <t:{int(due_at)}:R>).')
+            else:
+                await ctx.send('🌸 Wellness reminders go out with the shared 12-hour broadcast. Set a time with `!wellnesstime HH:MM [timezone]`.')
+            return
+        
+        if time.lower() == 'off':
+            if await schedule.clear(ctx.guild.id):
+                await ctx.send('✅ Local time cleared; this server is back on the shared 12-hour broadcast.')
+            else:
+                await ctx.send('ℹ️ No local time was set.')
+            return
+        
+        try:
+            hours, minutes = (int(part) for part in time.split(':'))
+            if not (0 <= hours < 24 and 0 <= minutes < 60):
+                raise ValueError
+        except ValueError:
+            await ctx.send('❌ Use 24-hour HH:MM, for example `!wellnesstime 09:30 America/New_York`.')
+            return
+        
+        try:
+            await schedule.set(ctx.guild.id, hours * 60 + minutes, timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            await ctx.send(f'❌ Unknown timezone `{timezone}`. Use an IANA name such as `Europe/Berlin` or `UTC`.')
+            return
+        
+        _, _, due_at = schedule.get(ctx.guild.id)
+        await ctx.send(f'✅ Wellness reminders will go out daily at **{hours:02d}:{minutes:02d} {timezone}** (next <t:{int(due_at)}:R>).')
     
     @commands.hybrid_command(name='lockdown', description='Lock/unlock the current channel')
     @commands.has_permissions(manage_channels=True)
@@ -0,0 +1,315 @@
+"""Owner-only diagnostics cog for MochaBot"""
+
+import discord
+from discord.ext import commands
+from datetime import datetime
+from utils import prefetch
+from utils.perf import WINDOWS
+
+BOT_COLOR = 0x8B4513
+
+class Owner(commands.Cog):
+    """Owner-only diagnostics for keeping MochaBot healthy"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.emoji = '🛠️'
+    
+    async def cog_check(self, ctx):
+        return await self.bot.is_owner(ctx.author)
+    
+    @commands.command(name='httpstats', hidden=True)
+    async def http_stats(self, ctx):
+        """Show per-host connection pool usage for outbound API calls"""
+        web_client = getattr(self.bot, 'web_client', None)
+        stats = web_client.pool_stats() if web_client else {}
+        
+        embed = discord.Embed(
+            title='🌐 HTTP Pool Stats',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        if not stats:
+            embed.description = 'No outbound requests have been made yet.'
+        for host, counts in sorted(stats.items(), key=lambda item: item[1]['requests'], reverse=True)[:25]:
+            embed.add_field(
+                name=f'🔗 {host}',
+                value=(f'Requests: `{counts["requests"]}` • Errors: `{counts["errors"]}`\n'
+                       f'Opened: `{counts["opened"]}` • Reused: `{counts["reused"]}` '
+                       f'(`{counts["reuse_rate"]:.0%}`)'),
+                inline=False
+            )
+        
+        if web_client:
+            embed.set_footer(text=f'Pool limit {web_client.limit} • {web_client.limit_per_host} per host')
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='prefetchstats', hidden=True)
+    async def prefetch_stats(self, ctx):
+        """Show depth, refill latency and empty hits for prefetch buffers"""
+        embed = discord.Embed(
+            title='📦 Prefetch Buffers',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        if not prefetch.BUFFERS:
+            embed.description = 'No prefetch buffers are running.'
+        for name, buffer in sorted(prefetch.BUFFERS.items()):
+            stats = buffer.stats()
+            refill = f'{stats["avg_refill_ms"]:.0f}ms avg' if stats['avg_refill_ms'] is not None else 'n/a'
+            embed.add_field(
+                name=f'📦 {name}',
+                value=(f'Depth: `{stats["depth"]}/{stats["size"]}` • Refill: `{refill}`\n'
+                       f'Served: `{stats["served"]}` • Empty hits: `{stats["empty_hits"]}` • '
+                       f'Failures: `{stats["failures"]}`'),
+                inline=False
+            )
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='broadcasts', hidden=True)
+    async def broadcasts(self, ctx):
+        """Show progress of running broadcasts and the outcome of the last one"""
+        broadcaster = self.bot.broadcaster
+        
+        embed = discord.Embed(
+            title='📣 Broadcasts',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        for report in broadcaster.active:
+            embed.add_field(
+                name=f'⏳ {report.label} (running)',
+                value=f'`{report.done:,}/{report.total:,}` done • `{report.failed:,}` failed • `{report.elapsed:.0f}s`',
+                inline=False
+            )
+        
+        report = broadcaster.last_report
+        if report:
+            failures = '\n'.join(f'`{target_id}` {error}'[:100] for target_id, error in report.failures[:5])
+            embed.add_field(
+                name=f'✅ Last: {report.label}',
+                value=f'Finished <t:{int(report.finished)}:R>\n{report.summary()}\n{failures}'[:1024],
+                inline=False
+            )
+        elif not broadcaster.active:
+            embed.description = 'No broadcasts have run yet.'
+        
+        embed.set_footer(text=f'{broadcaster.concurrency} workers • {broadcaster.bucket.rate:g} requests/s')
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='sessions', hidden=True)
+    async def sessions(self, ctx):
+        """Show live interactive sessions (trivia rounds and other button flows) by kind"""
+        router = self.bot.sessions
+        
+        embed = discord.Embed(
+            title='🎛️ Interactive Sessions',
+            description=f'`{len(router):,}` live',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        for kind, count in router.live.most_common(10):
+            embed.add_field(name=kind, value=f'`{count:,}`', inline=True)
+        
+        embed.set_footer(text=f'{router.opened:,} opened • {router.expired:,} timed out • {router.routed:,} presses routed')
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='shards', hidden=True)
+    async def shards(self, ctx):
+        """Show every shard's connection status, latency, guilds and drops"""
+        monitor = self.bot.shard_monitor
+        rows = monitor.summary()
+        
+        embed = discord.Embed(
+            title='🧩 Shards',
+            description=monitor.lines(limit=25) or 'No shards connected yet',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        mode = f'AutoSharded, {self.bot.shard_count} total' if monitor.sharded else 'unsharded'
+        embed.set_footer(text=f'{len(rows)} running here • {mode} • {sum(row[4] for row in rows)} disconnects')
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='startup', hidden=True)
+    async def startup(self, ctx):
+        """Show how this process started: phases, per-cog import/setup times and the slowest imports"""
+        timeline = self.bot.startup
+        
+        embed = discord.Embed(
+            title='⏱️ Startup Timeline',
+            description='```\n' + '\n'.join(timeline.timeline_lines()) + '\n```',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        embed.add_field(name='🧩 Cogs (loaded concurrently)', value='\n'.join(timeline.cog_lines())[:1024] or 'None', inline=False)
+        embed.add_field(name='📦 Slowest Imports', value='\n'.join(timeline.import_lines())[:1024] or 'None', inline=False)
+        embed.set_footer(text='Times are from when bot.py started running')
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='perf', hidden=True)
+    async def perf(self, ctx, window: str = '5m'):
+        """Show the slowest commands by p95 over the last 5m, 1h or 24h"""
+        if window not in WINDOWS:
+            await ctx.send(f'❌ Pick a window: {", ".join(WINDOWS)}')
+            return
+        stats = self.bot.command_stats
+        rows = stats.report(window, limit=15)
+        
+        def ms(seconds):
+            return f'{seconds * 1000:.0f}ms' if seconds < 10 else f'{seconds:.1f}s'
+        
+        lines = [f'{"command":<18}{"calls":>6}{"/min":>6}{"p50":>8}{"p95":>8}{"p99":>8}{"max":>8}{"err":>5}']
+        for name, cog, histogram, rate in rows:
+            lines.append(f'{name[:17]:<18}{histogram.count:>6}{rate:>6.1f}{ms(histogram.percentile(0.5)):>8}'
+                         f'{ms(histogram.percentile(0.95)):>8}{ms(histogram.percentile(0.99)):>8}'
+                         f'{ms(histogram.max):>8}{histogram.errors:>5}')
+        
+        embed = discord.Embed(
+            title=f'🐢 Slowest Commands ({window})',
+            description='```\n' + '\n'.join(lines) + '\n```' if rows else f'No commands have run in the last {window}.',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        cogs = sorted(stats.by_cog(window).items(), key=lambda item: item[1].count, reverse=True)
+        for cog, histogram in cogs[:12]:
+            embed.add_field(
+                name=cog,
+                value=f'`{histogram.count:,}` calls • p95 `{ms(histogram.percentile(0.95))}` • `{histogram.errors}` errors',
+                inline=True
+            )
+        
+        total = stats.totals(window)
+        embed.set_footer(text=f'{total.count:,} commands • {total.errors:,} errors • '
+                              f'!perf 5m | 1h | 24h • percentiles within ~10%')
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='events', hidden=True)
+    async def events(self, ctx, window: str = '5m'):
+        """Show gateway events per second and which listeners spend the most time on the event loop"""
+        if window not in WINDOWS:
+            await ctx.send(f'❌ Pick a window: {", ".join(WINDOWS)}')
+            return
+        profiler = self.bot.event_profiler
+        rows = profiler.report(window, limit=12)
+        
+        def ms(seconds):
+            return f'{seconds * 1000:.1f}ms' if seconds < 10 else f'{seconds:.1f}s'
+        
+        lines = [f'{"listener":<26}{"runs":>7}{"loop":>9}{"p95":>9}{"max":>9}{"slow":>5}']
+        for event, name, wall, busy, slow in rows:
+            label = name if name.endswith(event) else f'{name} ({event})'
+            lines.append(f'{label[:25]:<26}{wall.count:>7}{ms(busy.total):>9}{ms(wall.percentile(0.95)):>9}'
+                         f'{ms(wall.max):>9}{slow:>5}')
+        
+        embed = discord.Embed(
+            title=f'📡 Event Listeners ({window})',
+            description='```\n' + '\n'.join(lines) + '\n```' if rows else f'No listeners have run in the last {window}.',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        rates = profiler.rates(limit=10)
+        embed.add_field(
+            name='⚡ Events/s (last minute, peak second)',
+            value='\n'.join(f'`{event}` {rate:,.1f}/s (peak {peak:,})' for event, rate, peak in rates) or 'None yet',
+            inline=False
+        )
+        
+        busy = profiler.busy_total(window)
+        embed.set_footer(text=f'loop = time on the event loop, p95/max = wall time • {ms(busy.total)} on the loop in total • '
+                              f'budget {profiler.budget * 1000:.0f}ms')
+        await ctx.send(embed=embed)
+    
+    @commands.group(name='content', hidden=True, invoke_without_command=True)
+    async def content(self, ctx):
+        """Show which content pack version is live and how much it holds"""
+        pack = self.bot.content.pack
+        
+        embed = discord.Embed(
+            title='📚 Content Pack',
+            description=f'Version `{pack.version}` • `{pack.digest}`\n`{pack.path}`',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        for section in ('coffee', 'mentalhealth', 'fun'):
+            embed.add_field(
+                name=section,
+                value='\n'.join(f'{key}: `{len(value)}`' for key, value in pack[section].items()),
+                inline=True
+            )
+        
+        fun = self.bot.get_cog('Fun')
+        if fun:
+            embed.add_field(name='trivia', value=f'questions: `{len(fun.trivia_engine.bank)}`', inline=True)
+        
+        embed.set_footer(text=f'Loaded {datetime.utcfromtimestamp(pack.loaded_at):%Y-%m-%d %H:%M} UTC • '
+                              f'{self.bot.content.reloads} reloads • !content reload [path]')
+        await ctx.send(embed=embed)
+    
+    @content.command(name='reload')
+    async def content_reload(self, ctx, path: str = None):
+        """Swap in the content pack (and trivia questions) from disk without a restart"""
+        try:
+            old, pack = await self.bot.reload_content(path)
+        except (OSError, ValueError) as e:
+            await ctx.send(f'❌ Kept content pack v{self.bot.content.pack.version}: {e}'[:2000])
+            return
+        
+        # Other clusters load the same file, so they all serve the same version
+        relayed = self.bot.cluster is not None and self.bot.cluster.relay('reload_content', {'path': path})
+        await ctx.send(f'📚 Content pack v{old.version} (`{old.digest}`) → v{pack.version} (`{pack.digest}`)'
+                       + (' • other clusters are following' if relayed else ''))
+    
+    @commands.command(name='clusters', hidden=True)
+    async def clusters(self, ctx):
+        """Show every cluster process started by launcher.py and its latest wellness round"""
+        if self.bot.cluster is None:
+            await ctx.send('🖧 Not running under `launcher.py`; this process is the whole bot.')
+            return
+        clusters = await self.bot.cluster.query('clusters')
+        broadcasts = await self.bot.cluster.query('broadcasts') or {}
+        if clusters is None:
+            await ctx.send('❌ The cluster hub is not answering right now.')
+            return
+        
+        totals = self.bot.cluster.totals or {}
+        embed = discord.Embed(
+            title='🖧 Clusters',
+            description=f'`{totals.get("guilds", 0):,}` servers • `{totals.get("users", 0):,}` users • '
+                        f'`{totals.get("connected", 0)}/{totals.get("shards", 0)}` shards connected',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        
+        wellness = {round_['cluster']: round_ for round_ in broadcasts.get('wellness', [])}
+        for cluster in clusters[:25]:
+            stats = cluster['stats']
+            lines = [
+                f'{"🟢" if cluster["linked"] else "🔴"} pid `{cluster.get("pid")}` • up `{cluster.get("uptime") or 0}s` • '
+                f'`{cluster.get("restarts", 0)}` restarts',
+                f'shards `{cluster["shard_ids"][0]}-{cluster["shard_ids"][-1]}`' if cluster.get('shard_ids') else 'shards `?`',
+            ]
+            if stats:
+                lines.append(f'`{stats["guilds"]:,}` servers • reported `{cluster["age"]}s` ago')
+            last = wellness.get(cluster['id'])
+            if last:
+                lines.append(f'wellness: `{last["sent"]}` sent, `{last["failed"]}` failed <t:{int(last["finished"] or 0)}:R>')
+            embed.add_field(name=f'Cluster {cluster["id"]}' + (' (this one)' if cluster['id'] == self.bot.cluster.cluster_id else ''),
+                            value='\n'.join(lines), inline=False)
+        
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    """Setup function to add the cog"""
+    await bot.add_cog(Owner(bot))
@@ -3,12 +3,59 @@
 import discord
 from discord.ext import commands
 import asyncio
-import aiohttp
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 import time
+import shlex
+from utils.scheduler import ReminderScheduler
+from utils.polls import PollManager
 
 BOT_COLOR = 0x8B4513
+POLL_EMOJIS = ['🇦', '🇧', '🇨', '🇩', '🇪', '🇫', '🇬', '🇭', '🇮', '🇯']
+
+class PollView(discord.ui.View):
+    """One button per option plus Close; custom ids make it survive restarts"""
+    
+    def __init__(self, cog, poll, disabled=False):
+        super().__init__(timeout=None)
+        self.cog = cog
+        self.poll = poll
+        for i, option in enumerate(poll.options):
+            button = discord.ui.Button(
+                label=option,
+                emoji=POLL_EMOJIS[i],
+                style=discord.ButtonStyle.secondary,
+                custom_id=f'poll:{poll.id}:{i}',
+                disabled=disabled,
+                row=i // 5
+            )
+            button.callback = self._vote_callback(i)
+            self.add_item(button)
+        close = discord.ui.Button(label='Close Poll', emoji='🔒', style=discord.ButtonStyle.danger,
+                                  custom_id=f'poll:{poll.id}:close', disabled=disabled, row=2)
+        close.callback = self._close
+        self.add_item(close)
+    
+    def _vote_callback(self, option):
+        async def callback(interaction):
+            previous = await self.cog.polls.vote(self.poll, interaction.user.id, option)
+            if self.poll.closed:
+                await interaction.response.send_message('🔒 This poll has closed.', ephemeral=True)
+            elif previous == option:
+                await interaction.response.send_message(f'You already voted for **{self.poll.options[option]}**.', ephemeral=True)
+            elif previous is not None:
+                await interaction.response.send_message(f'🔄 Vote changed to **{self.poll.options[option]}**.', ephemeral=True)
+            else:
+                await interaction.response.send_message(f'✅ You voted for **{self.poll.options[option]}**.', ephemeral=True)
+        return callback
+    
+    async def _close(self, interaction):
+        perms = getattr(interaction.user, 'guild_permissions', None)
+        if interaction.user.id != self.poll.author_id and not (perms and perms.manage_messages):
+            await interaction.response.send_message('❌ Only the poll creator or a moderator can close this poll.', ephemeral=True)
+            return
+        await interaction.response.send_message('🔒 Closing the poll...', ephemeral=True)
+        await self.cog.polls.close(self.poll)
 
 class Utility(commands.Cog):
     """Utility commands for productivity and server management"""
@@ -16,42 +63,161 @@ class Utility(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.emoji = '🔧'
-        self.reminders = {}  # Simple in-memory storage
+        # Persistent reminders, fired by one dispatcher task; with several clusters
+        # each process fires only the reminders (and closes the polls) of its own guilds
+        self.reminders = ReminderScheduler(bot.db, self._deliver_reminders, owns=bot.shard_monitor.owns)
+        self.max_reminders_per_user = 25
+        # Button polls; votes survive restarts and result edits are debounced
+        self.polls = PollManager(bot.db, self._refresh_poll, owns=bot.shard_monitor.owns)
+        self.poll_views = {}
     
-    @commands.hybrid_command(name='poll', description='Create a poll with multiple options')
-    async def poll(self, ctx, question: str, *options):
-        """Create a poll with up to 10 options"""
-        if len(options) < 2:
-            await ctx.send('❌ Please provide at least 2 options for the poll!')
-            return
+    async def cog_load(self):
+        await self.reminders.load()
+        self.reminders.start()
+        await self.polls.load()
+        for poll in self.polls.polls.values():
+            # Re-attach buttons to polls that were open when the bot stopped
+            view = PollView(self, poll)
+            self.poll_views[poll.id] = view
+            self.bot.add_view(view, message_id=poll.message_id)
+        self.polls.start()
+    
+    async def cog_unload(self):
+        self.reminders.stop()
+        self.polls.stop()
+        for view in self.poll_views.values():
+            view.stop()
+    
+    async def _deliver_reminders(self, rows):
+        await self.bot.wait_until_ready()
+        await asyncio.gather(*(self._send_reminder(*row) for row in rows))
+    
+    async def _send_reminder(self, reminder_id, user_id, channel_id, guild_id, message, created_at, due_at):
+        reminder_embed = discord.Embed(
+            title='⏰ Reminder!',
+            description=f'<@{user_id}>, you asked me to remind you about:\n\n**{message}**',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
         
-        if len(options) > 10:
-            await ctx.send('❌ Maximum 10 options allowed!')
-            return
+        # Reminders caught up after downtime say when they were originally due
+        if time.time() - due_at > 60:
+            reminder_embed.add_field(name='🕒 Originally Due', value=f'<t:{int(due_at)}:R>', inline=False)
         
-        # Create embed
+        try:
+            channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+            await channel.send(embed=reminder_embed)
+        except:
+            # If we can't send in the original channel, try DM
+            try:
+                user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+                await user.send(embed=reminder_embed)
+            except:
+                pass  # User has DMs disabled
+    
+    def _poll_embed(self, poll):
         embed = discord.Embed(
-            title='📏 Poll',
-            description=f'**{question}**',
+            title='📊 Poll Closed' if poll.closed else '📊 Poll',
+            description=f'**{poll.question}**\nAsked by <@{poll.author_id}>',
             color=BOT_COLOR,
             timestamp=datetime.utcnow()
         )
         
-        # Add options with emojis
-        emojis = ['🅰️', '🅱️', '🄲️', '🄳️', '🄴️', '🄵️', '🄶️', '🄷️', '🄸️', '🄹️']
+        lines = []
+        for i, (option, count) in enumerate(zip(poll.options, poll.tallies)):
+            share = count / poll.total if poll.total else 0
+            filled = round(share * 10)
+            lines.append(f'{POLL_EMOJIS[i]} {option}\n`{"█" * filled}{"░" * (10 - filled)}` {share:.0%} ({count})')
+        embed.add_field(name='Results' if poll.closed else 'Live Results', value='\n'.join(lines)[:1024], inline=False)
+        
+        if poll.closed:
+            winners = poll.winners()
+            if not winners:
+                result = 'No votes were cast.'
+            elif len(winners) == 1:
+                result = f'🏆 **{winners[0]}**'
+            else:
+                result = '🤝 Tie: ' + ', '.join(f'**{w}**' for w in winners)
+            embed.add_field(name='Outcome', value=result, inline=False)
+        else:
+            embed.add_field(name='⏰ Closes', value=f'<t:{int(poll.closes_at)}:R>', inline=False)
+        
+        embed.set_footer(text=f'Poll #{poll.id} • {poll.total} vote{"s" if poll.total != 1 else ""} • One vote per person, click again to change')
+        return embed
+    
+    async def _refresh_poll(self, poll):
+        await self.bot.wait_until_ready()
+        channel = self.bot.get_channel(poll.channel_id) or await self.bot.fetch_channel(poll.channel_id)
+        message = channel.get_partial_message(poll.message_id)
+        
+        if not poll.closed:
+            await message.edit(embed=self._poll_embed(poll))
+            return
+        
+        view = self.poll_views.pop(poll.id, None)
+        if view:
+            view.stop()
+        await message.edit(embed=self._poll_embed(poll), view=PollView(self, poll, disabled=True))
+        
+        summary = discord.Embed(
+            title='📊 Poll Results',
+            description=f'**{poll.question}**',
+            color=BOT_COLOR,
+            timestamp=datetime.utcnow()
+        )
+        winners = poll.winners()
+        if winners:
+            top = poll.tallies[poll.options.index(winners[0])]
+            summary.add_field(name='🏆 Winner' if len(winners) == 1 else '🤝 Tie', value=', '.join(winners), inline=True)
+            summary.add_field(name='🗳️ Votes', value=f'{top} of {poll.total} ({top / poll.total:.0%})', inline=True)
+        else:
+            summary.description += '\n\nNo votes were cast.'
+        await message.reply(embed=summary, mention_author=False)
+    
+    @commands.hybrid_command(name='poll', description='Create a button poll with live results')
+    async def poll(self, ctx, question: str, *, options: str):
+        """Create a poll with up to 10 options (e.g. !poll "Best brew?" 2h Latte Mocha "Flat white")"""
+        # Options are space separated (quote multi-word ones) or separated with |
+        if '|' in options:
+            choices = [o.strip() for o in options.split('|') if o.strip()]
+        else:
+            try:
+                choices = shlex.split(options)
+            except ValueError:
+                choices = options.split()
+        
+        # An optional leading duration like 30m, 2h or 3d
+        duration = 86400
+        time_units = {'m': 60, 'h': 3600, 'd': 86400}
+        if choices and choices[0][:-1].isdigit() and choices[0][-1].lower() in time_units:
+            duration = int(choices[0][:-1]) * time_units[choices[0][-1].lower()]
+            choices = choices[1:]
+            if duration < 60 or duration > 604800:
+                await ctx.send('❌ Polls can run from 1 minute to 7 days!')
+                return
         
-        option_text = ''
-        for i, option in enumerate(options):
-            option_text += f'{emojis[i]} {option}\n'
+        if len(choices) < 2:
+            await ctx.send('❌ Please provide at least 2 options for the poll!')
+            return
         
-        embed.add_field(name='Options', value=option_text, inline=False)
-        embed.set_footer(text=f'Poll created by {ctx.author.display_name}')
+        if len(choices) > 10:
+            await ctx.send('❌ Maximum 10 options allowed!')
+            return
         
-        message = await ctx.send(embed=embed)
+        choices = [choice[:80] for choice in choices]
+        poll = await self.polls.create(
+            ctx.guild.id if ctx.guild else None,
+            ctx.channel.id,
+            ctx.author.id,
+            question[:256],
+            choices,
+            time.time() + duration
+        )
         
-        # Add reactions
-        for i in range(len(options)):
-            await message.add_reaction(emojis[i])
+        view = PollView(self, poll)
+        message = await ctx.send(embed=self._poll_embed(poll), view=view)
+        self.poll_views[poll.id] = view
+        await self.polls.attach(poll, message.id)
     
     @commands.hybrid_command(name='remind', aliases=['reminder'], description='Set a reminder')
     async def remind(self, ctx, time_str: str, *, message: str):
@@ -78,36 +244,60 @@ class Utility(commands.Cog):
             await ctx.send('❌ Maximum reminder time is 90 days!')
             return
         
+        if await self.reminders.count_for(ctx.author.id) >= self.max_reminders_per_user:
+            await ctx.send(f'❌ You already have {self.max_reminders_per_user} pending reminders! Cancel one with `!reminders cancel <id>`')
+            return
+        
         # Calculate end time
-        end_time = datetime.utcnow() + timedelta(seconds=seconds)
+        due_at = time.time() + seconds
+        reminder_id = await self.reminders.schedule(
+            ctx.author.id,
+            ctx.channel.id,
+            ctx.guild.id if ctx.guild else None,
+            message,
+            due_at
+        )
         
         embed = discord.Embed(
             title='⏰ Reminder Set',
-            description=f'I\'ll remind you about: **{message}**\n\nTime: <t:{int(end_time.timestamp())}:R>',
+            description=f'I\'ll remind you about: **{message}**\n\nTime: <t:{int(due_at)}:R>',
             color=BOT_COLOR,
             timestamp=datetime.utcnow()
         )
+        embed.set_footer(text=f'Reminder #{reminder_id} • Cancel with !reminders cancel {reminder_id}')
         
         await ctx.send(embed=embed)
+    
+    @commands.hybrid_group(name='reminders', fallback='list', description='List or cancel your reminders')
+    async def reminders_group(self, ctx):
+        """List your pending reminders"""
+        rows = await self.reminders.pending_for(ctx.author.id, limit=self.max_reminders_per_user)
         
-        # Wait and send reminder
-        await asyncio.sleep(seconds)
-        
-        reminder_embed = discord.Embed(
-            title='⏰ Reminder!',
-            description=f'{ctx.author.mention}, you asked me to remind you about:\n\n**{message}**',
+        embed = discord.Embed(
+            title='⏰ Your Reminders',
             color=BOT_COLOR,
             timestamp=datetime.utcnow()
         )
         
-        try:
-            await ctx.send(embed=reminder_embed)
-        except:
-            # If we can't send in the original channel, try DM
-            try:
-                await ctx.author.send(embed=reminder_embed)
-            except:
-                pass  # User has DMs disabled
+        if not rows:
+            embed.description = 'You have no pending reminders. Set one with `!remind 1h Take a break`'
+        for reminder_id, message, due_at in rows:
+            embed.add_field(
+                name=f'#{reminder_id}',
+                value=f'{message[:200]}\nDue <t:{int(due_at)}:R>',
+                inline=False
+            )
+        
+        embed.set_footer(text='Cancel a reminder with !reminders cancel <id>')
+        await ctx.send(embed=embed)
+    
+    @reminders_group.command(name='cancel', description='Cancel one of your reminders')
+    async def reminders_cancel(self, ctx, reminder_id: int):
+        """Cancel one of your pending reminders by its id"""
+        if await self.reminders.cancel(ctx.author.id, reminder_id):
+            await ctx.send(f'✅ Reminder #{reminder_id} cancelled.')
+        else:
+            await ctx.send(f'❌ You have no pending reminder #{reminder_id}!')
     
     @commands.hybrid_command(name='weather', description='Get weather information for a city')
     async def weather(self, ctx, *, city: str):
@@ -124,47 +314,46 @@ class Utility(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                url = f'http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric'
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        embed = discord.Embed(
-                            title=f'⛅ Weather in {data["name"]}, {data["sys"]["country"]}',
-                            color=BOT_COLOR,
-                            timestamp=datetime.utcnow()
-                        )
-                        
-                        # Main weather info
-                        temp = data['main']['temp']
-                        feels_like = data['main']['feels_like']
-                        humidity = data['main']['humidity']
-                        pressure = data['main']['pressure']
-                        
-                        weather_desc = data['weather'][0]['description'].title()
-                        
-                        embed.add_field(name='🌡️ Temperature', value=f'{temp}°C', inline=True)
-                        embed.add_field(name='🤔 Feels Like', value=f'{feels_like}°C', inline=True)
-                        embed.add_field(name='💧 Humidity', value=f'{humidity}%', inline=True)
-                        
-                        embed.add_field(name='☁️ Condition', value=weather_desc, inline=True)
-                        embed.add_field(name='🌬️ Pressure', value=f'{pressure} hPa', inline=True)
-                        
-                        if 'wind' in data:
-                            wind_speed = data['wind']['speed']
-                            embed.add_field(name='💨 Wind Speed', value=f'{wind_speed} m/s', inline=True)
-                        
-                        await ctx.send(embed=embed)
+        try:
+            url = f'http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric'
+            async with self.bot.web_client.get(url, service='weather') as response:
+                if response.status == 200:
+                    data = await response.json()
                     
-                    elif response.status == 404:
-                        await ctx.send('❌ City not found! Please check the spelling.')
-                    else:
-                        await ctx.send('❌ Weather service is currently unavailable.')
-            
-            except Exception as e:
-                await ctx.send('❌ An error occurred while fetching weather data.')
+                    embed = discord.Embed(
+                        title=f'⛅ Weather in {data["name"]}, {data["sys"]["country"]}',
+                        color=BOT_COLOR,
+                        timestamp=datetime.utcnow()
+                    )
+                    
+                    # Main weather info
+                    temp = data['main']['temp']
+                    feels_like = data['main']['feels_like']
+                    humidity = data['main']['humidity']
+                    pressure = data['main']['pressure']
+                    
+                    weather_desc = data['weather'][0]['description'].title()
+                    
+                    embed.add_field(name='🌡️ Temperature', value=f'{temp}°C', inline=True)
+                    embed.add_field(name='🤔 Feels Like', value=f'{feels_like}°C', inline=True)
+                    embed.add_field(name='💧 Humidity', value=f'{humidity}%', inline=True)
+                    
+                    embed.add_field(name='☁️ Condition', value=weather_desc, inline=True)
+                    embed.add_field(name='🌬️ Pressure', value=f'{pressure} hPa', inline=True)
+                    
+                    if 'wind' in data:
+                        wind_speed = data['wind']['speed']
+                        embed.add_field(name='💨 Wind Speed', value=f'{wind_speed} m/s', inline=True)
+                    
+                    await ctx.send(embed=embed)
+                
+                elif response.status == 404:
+                    await ctx.send('❌ City not found! Please check the spelling.')
+                else:
+                    await ctx.send('❌ Weather service is currently unavailable.')
+        
+        except Exception as e:
+            await ctx.send('❌ An error occurred while fetching weather data.')
     
     @commands.hybrid_command(name='translate', description='Translate text to another language')
     async def translate(self, ctx, target_lang: str, *, text: str):
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+MochaBot cluster launcher - runs the bot as several processes that split the shards
+
+One Python process only ever keeps one core busy, so big deployments run a
+cluster of bot.py processes, each owning a contiguous range of shards. The
+launcher starts them, restarts any that exit, and hosts the hub they report
+to for cross-cluster totals, broadcast results and IDENTIFY slots.
+
+    python launcher.py --clusters 4 --shards 16
+    python launcher.py                # CLUSTER_COUNT clusters (default: one per core), SHARD_COUNT or Discord's count
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import secrets
+import signal
+import sys
+import time
+
+import aiohttp
+
+from utils.cluster import IDENTIFY_INTERVAL, ClusterHub
+
+logging.basicConfig(level=logging.INFO, format='[launcher] %(levelname)s:%(name)s:%(message)s')
+logger = logging.getLogger("mochabot.launcher")
+
+BOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot.py')
+DEFAULT_API_BASE = 'https://discord.com/api/v10'
+
+# Restart backoff: doubles per quick crash, reset once a cluster has stayed up for a while
+RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 60.0
+STABLE_AFTER = 60.0
+# How long a cluster gets to shut down cleanly before it's killed
+STOP_TIMEOUT = 15.0
+
+
+def shard_ranges(shard_count, clusters):
+    """Split shard ids 0..shard_count-1 into `clusters` contiguous, near-equal ranges"""
+    clusters = max(1, min(clusters, shard_count))
+    return [list(range(shard_count * i // clusters, shard_count * (i + 1) // clusters)) for i in range(clusters)]
+
+
+async def recommended_shards(token):
+    """Discord's recommended shard count and identify concurrency for this token"""
+    url = os.getenv('DISCORD_API_BASE', DEFAULT_API_BASE) + '/gateway/bot'
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, headers={'Authorization': f'Bot {token}'}) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return data['shards'], data['session_start_limit']['max_concurrency']
+
+
+class ClusterProcess:
+    """One bot.py process and the shards it runs, restarted whenever it exits"""
+
+    def __init__(self, cluster_id, shard_ids, shard_count, env):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.env = {
+            **env,
+            'CLUSTER_ID': str(cluster_id),
+            'SHARD_COUNT': str(shard_count),
+            'SHARD_IDS': ','.join(map(str, shard_ids)),
+        }
+        self.process = None
+        self.started = None
+        self.restarts = 0
+        self.stopping = False
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._supervise(), name=f'cluster-{self.cluster_id}')
+
+    def status(self):
+        alive = self.process is not None and self.process.returncode is None
+        return {
+            'pid': self.process.pid if alive else None,
+            'shard_ids': self.shard_ids,
+            'restarts': self.restarts,
+            'uptime': round(time.time() - self.started) if alive else None,
+        }
+
+    async def _supervise(self):
+        delay = RESTART_DELAY
+        while not self.stopping:
+            # Its own session, so a Ctrl+C reaches only the launcher, which then stops clusters in order
+            self.process = await asyncio.create_subprocess_exec(sys.executable, BOT_SCRIPT, env=self.env,
+                                                                start_new_session=sys.platform != 'win32')
+            self.started = time.time()
+            logger.info(f"🚀 Cluster {self.cluster_id} started (pid {self.process.pid}, "
+                        f"shards {self.shard_ids[0]}-{self.shard_ids[-1]})")
+            code = await self.process.wait()
+            if self.stopping:
+                break
+            if time.time() - self.started >= STABLE_AFTER:
+                delay = RESTART_DELAY
+            self.restarts += 1
+            logger.warning(f"💥 Cluster {self.cluster_id} exited with code {code}; "
+                           f"restarting in {delay:.0f}s (restart #{self.restarts})")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RESTART_DELAY)
+
+    async def stop(self):
+        self.stopping = True
+        if self.process is not None and self.process.returncode is None:
+            # SIGINT lets bot.py run its shutdown (closing the database and HTTP session)
+            self.process.send_signal(signal.SIGINT if sys.platform != 'win32' else signal.SIGTERM)
+            try:
+                await asyncio.wait_for(self.process.wait(), STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Cluster {self.cluster_id} didn't stop in {STOP_TIMEOUT:.0f}s, killing it")
+                self.process.kill()
+                await self.process.wait()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class Launcher:
+    """Starts the hub and one ClusterProcess per shard range"""
+
+    def __init__(self, clusters, shard_count, max_concurrency=1, identify_interval=IDENTIFY_INTERVAL, env=None):
+        self.token = secrets.token_hex(16)
+        self.shard_count = shard_count
+        self.hub = ClusterHub(self.token, 0, max_concurrency, identify_interval, status=self.status)
+        self.env = dict(os.environ if env is None else env)
+        self.processes = [ClusterProcess(cluster_id, shard_ids, shard_count, self.env)
+                          for cluster_id, shard_ids in enumerate(shard_ranges(shard_count, clusters))]
+        self.hub.clusters = len(self.processes)
+
+    def status(self, cluster_id):
+        return self.processes[cluster_id].status()
+
+    async def start(self):
+        await self.hub.start()
+        for process in self.processes:
+            process.env.update(CLUSTER_IPC=f'127.0.0.1:{self.hub.port}', CLUSTER_IPC_TOKEN=self.token)
+            process.start()
+        logger.info(f"🧩 Running {self.shard_count} shards across {len(self.processes)} clusters")
+
+    async def stop(self):
+        logger.info("🛑 Stopping all clusters...")
+        await asyncio.gather(*(process.stop() for process in self.processes))
+        await self.hub.stop()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Run MochaBot as several processes that split the shards')
+    parser.add_argument('--clusters', type=int, default=int(os.getenv('CLUSTER_COUNT') or os.cpu_count() or 1))
+    parser.add_argument('--shards', default=os.getenv('SHARD_COUNT') or 'auto',
+                        help='total shard count, or "auto" for Discord\'s recommendation')
+    parser.add_argument('--max-concurrency', type=int, default=None,
+                        help='IDENTIFY concurrency (from Discord with --shards auto, otherwise 1)')
+    parser.add_argument('--identify-interval', type=float, default=IDENTIFY_INTERVAL, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    max_concurrency = args.max_concurrency or 1
+    if args.shards == 'auto':
+        token = os.getenv('DISCORD_TOKEN')
+        if not token:
+            logger.error("❌ --shards auto needs DISCORD_TOKEN to ask Discord for the shard count")
+            return
+        shard_count, concurrency = await recommended_shards(token)
+        max_concurrency = args.max_concurrency or concurrency
+        logger.info(f"📐 Discord recommends {shard_count} shards (identify concurrency {concurrency})")
+    else:
+        shard_count = int(args.shards)
+
+    launcher = Launcher(args.clusters, shard_count, max_concurrency, args.identify_interval)
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopped.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C still ends asyncio.run
+    await launcher.start()
+    try:
+        await stopped.wait()
+    finally:
+        await launcher.stop()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,2 @@
+"""Shared helpers for MochaBot"""
+# Support code used by bot.py and the cogs; nothing here is loaded as an extension
@@ -0,0 +1,153 @@
+"""Concurrent, rate-limited fan-out of one message per guild"""
+
+import asyncio
+import logging
+import random
+import time
+
+import aiohttp
+import discord
+
+logger = logging.getLogger("mochabot.broadcast")
+
+# Errors worth another attempt; anything else (403, 404, bad payload) fails the target outright
+TRANSIENT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError)
+
+
+def is_transient(error):
+    if isinstance(error, discord.HTTPException):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate / 10)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class BroadcastReport:
+    """Progress and outcome of one broadcast run"""
+
+    MAX_FAILURES = 25
+
+    def __init__(self, label, total):
+        self.label = label
+        self.total = total
+        self.sent = 0
+        self.skipped = 0
+        self.failed = 0
+        self.retries = 0
+        self.failures = []  # (target id, error), the first MAX_FAILURES only
+        self.started = time.time()
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.sent + self.skipped + self.failed
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+    def record_failure(self, target_id, error):
+        self.failed += 1
+        if len(self.failures) < self.MAX_FAILURES:
+            self.failures.append((target_id, f'{type(error).__name__}: {error}'))
+
+    def summary(self):
+        return (f"{self.label}: {self.sent:,} sent, {self.skipped:,} skipped, {self.failed:,} failed "
+                f"of {self.total:,} ({self.retries:,} retries) in {self.elapsed:.1f}s")
+
+
+class Broadcaster:
+    """Runs `send(target)` for many targets with bounded concurrency
+
+    A fixed pool of `concurrency` workers drains the targets, so one slow
+    guild only ties up one worker. Every attempt takes a token from a bucket
+    shared by all runs, keeping the bot under Discord's global request rate;
+    per-route buckets and 429 retry-after are already honoured by discord.py's
+    HTTP client. Transient failures are retried with jittered exponential
+    backoff, up to `max_retries` times.
+
+    `send` returns True when it delivered something and False when the
+    target had nowhere to deliver to (counted as skipped).
+    """
+
+    def __init__(self, concurrency=20, rate=40.0, max_retries=3, base_delay=1.0, progress_every=1000):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.progress_every = progress_every
+        self.bucket = TokenBucket(rate)
+        self.active = []
+        self.last_report = None
+
+    async def run(self, targets, send, label='broadcast'):
+        """Deliver to every target; returns the BroadcastReport once all are done"""
+        targets = list(targets)
+        report = BroadcastReport(label, len(targets))
+        self.active.append(report)
+        queue = asyncio.Queue()
+        for target in targets:
+            queue.put_nowait(target)
+
+        async def worker():
+            while True:
+                try:
+                    target = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self._deliver(target, send, report)
+                if self.progress_every and report.done % self.progress_every == 0:
+                    logger.info(f"📣 {label}: {report.done:,}/{report.total:,} done ({report.failed:,} failed)")
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(targets)))))
+        finally:
+            report.finished = time.time()
+            self.active.remove(report)
+            self.last_report = report
+        logger.info(f"📣 {report.summary()}")
+        return report
+
+    async def _deliver(self, target, send, report):
+        target_id = getattr(target, 'id', target)
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            try:
+                delivered = await send(target)
+            except discord.RateLimited as e:
+                # discord.py gave up waiting on a long rate limit; wait it out ourselves
+                error, delay = e, e.retry_after
+            except Exception as e:
+                if not is_transient(e):
+                    report.record_failure(target_id, e)
+                    return
+                error, delay = e, self.base_delay * 2 ** attempt * random.uniform(0.5, 1.5)
+            else:
+                if delivered:
+                    report.sent += 1
+                else:
+                    report.skipped += 1
+                return
+            if attempt < self.max_retries:
+                report.retries += 1
+                await asyncio.sleep(delay)
+        report.record_failure(target_id, error)
@@ -0,0 +1,133 @@
+"""Per-guild index of channels by purpose (welcome, wellness, modlog, support)"""
+
+import logging
+
+import discord
+
+logger = logging.getLogger("mochabot.channels")
+
+# Channel names tried for each purpose, in priority order, when nothing is pinned
+PURPOSES = {
+    'welcome': ['welcome', 'general', 'lobby', 'café', 'coffee-house', 'wellness', 'support'],
+    'wellness': ['wellness', 'mental-health', 'support', 'daily-wellness', 'self-care'],
+    'modlog': ['mod-log', 'modlog', 'mod-logs', 'moderation-log', 'logs'],
+    'support': ['support', 'help', 'mental-health', 'wellness'],
+}
+CANDIDATE_NAMES = {name for names in PURPOSES.values() for name in names}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_channels (
+    guild_id INTEGER NOT NULL,
+    purpose TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, purpose)
+) WITHOUT ROWID;
+"""
+
+
+class ChannelIndex:
+    """Purpose -> channel lookups without scanning every channel by name
+
+    Channels an admin pinned with `!channels set` always win. Otherwise the
+    name heuristics in PURPOSES apply, backed by a per-guild map of candidate
+    name -> first text channel (by position) with that name. The map is built
+    on a guild's first lookup and kept current from the channel events, so a
+    lookup costs one dict probe per candidate name.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._pinned = {}  # guild_id -> {purpose: channel_id}
+        self._names = {}  # guild_id -> {name: channel_id}
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+        for guild_id, purpose, channel_id in await self.db.fetchall(
+                'SELECT guild_id, purpose, channel_id FROM guild_channels'):
+            self._pinned.setdefault(guild_id, {})[purpose] = channel_id
+
+    def _names_for(self, guild):
+        names = self._names.get(guild.id)
+        if names is None:
+            names = self._names[guild.id] = {}
+            for channel in guild.text_channels:
+                if channel.name in CANDIDATE_NAMES:
+                    names.setdefault(channel.name, channel.id)
+        return names
+
+    def _reindex(self, guild, *names):
+        """Recompute the entries for `names` after a channel with one of them changed"""
+        index = self._names.get(guild.id)
+        if index is None:
+            return
+        names = [name for name in names if name in CANDIDATE_NAMES]
+        for name in names:
+            index.pop(name, None)
+        if names:
+            for channel in guild.text_channels:
+                if channel.name in names:
+                    index.setdefault(channel.name, channel.id)
+
+    def candidates(self, guild, purpose):
+        """Channels for a purpose in the order they should be tried: the pinned one, then by name"""
+        seen = set()
+        pinned = self._pinned.get(guild.id, {}).get(purpose)
+        if pinned is not None:
+            channel = guild.get_channel(pinned)
+            if channel is not None:
+                seen.add(channel.id)
+                yield channel
+        names = self._names_for(guild)
+        for name in PURPOSES[purpose]:
+            channel_id = names.get(name)
+            if channel_id is None or channel_id in seen:
+                continue
+            channel = guild.get_channel(channel_id)
+            if channel is not None:
+                seen.add(channel_id)
+                yield channel
+
+    def resolve(self, guild, purpose):
+        return next(self.candidates(guild, purpose), None)
+
+    def pinned(self, guild_id):
+        return dict(self._pinned.get(guild_id, {}))
+
+    async def pin(self, guild_id, purpose, channel_id):
+        await self.db.execute(
+            'INSERT OR REPLACE INTO guild_channels (guild_id, purpose, channel_id) VALUES (?, ?, ?)',
+            (guild_id, purpose, channel_id)
+        )
+        self._pinned.setdefault(guild_id, {})[purpose] = channel_id
+
+    async def unpin(self, guild_id, purpose):
+        """Go back to the name heuristics for a purpose; returns False if nothing was pinned"""
+        if purpose not in self._pinned.get(guild_id, {}):
+            return False
+        await self.db.execute('DELETE FROM guild_channels WHERE guild_id = ? AND purpose = ?', (guild_id, purpose))
+        del self._pinned[guild_id][purpose]
+        return True
+
+    # Gateway events
+
+    def channel_created(self, channel):
+        if isinstance(channel, discord.TextChannel):
+            self._reindex(channel.guild, channel.name)
+
+    async def channel_deleted(self, channel):
+        if not isinstance(channel, discord.TextChannel):
+            return
+        self._reindex(channel.guild, channel.name)
+        pins = self._pinned.get(channel.guild.id, {})
+        for purpose in [p for p, channel_id in pins.items() if channel_id == channel.id]:
+            logger.info(f"📌 Pinned {purpose} channel #{channel.name} was deleted in {channel.guild.name}; using name fallback")
+            await self.unpin(channel.guild.id, purpose)
+
+    def channel_updated(self, before, after):
+        if not isinstance(after, discord.TextChannel):
+            return
+        if before.name != after.name or before.position != after.position:
+            self._reindex(after.guild, before.name, after.name)
+
+    def forget_guild(self, guild_id):
+        self._names.pop(guild_id, None)
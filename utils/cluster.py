@@ -0,0 +1,336 @@
+"""Cluster IPC: a hub in the launcher and a link in each bot process, JSON lines over localhost TCP"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger("mochabot.cluster")
+
+# How often each cluster pushes a fresh stats snapshot to the hub
+STATS_INTERVAL = 15.0
+QUERY_TIMEOUT = 3.0
+# Discord allows one IDENTIFY per 5 seconds per concurrency bucket, across every process
+IDENTIFY_INTERVAL = 5.0
+
+
+def encode(message):
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+def broadcast_summary(report):
+    """The parts of a BroadcastReport worth sending to the hub"""
+    return {
+        'total': report.total,
+        'sent': report.sent,
+        'skipped': report.skipped,
+        'failed': report.failed,
+        'seconds': round(report.elapsed, 3),
+        'finished': report.finished,
+    }
+
+
+class ClusterHub:
+    """The launcher's side: collects every cluster's stats and reports and answers queries
+
+    Clusters connect over localhost and authenticate with a token the launcher
+    puts in their environment. Each pushes a stats snapshot when it's ready and
+    every STATS_INTERVAL seconds, and the hub sends the new cross-cluster
+    totals to every cluster, so reading them in a command never waits on IPC.
+    Broadcast rounds are reported as they finish. IDENTIFY slots are handed
+    out here as well, so shards in different processes share Discord's
+    identify rate limit instead of each process assuming it has it alone.
+    Relayed events (like a content reload) are passed on to every other cluster.
+
+    `status(cluster_id)`, if given, adds the supervisor's view of a cluster's
+    process (pid, restarts, uptime) to `query('clusters')`.
+    """
+
+    def __init__(self, token, clusters, max_concurrency=1, identify_interval=IDENTIFY_INTERVAL, status=None):
+        self.token = token
+        self.clusters = clusters
+        self.max_concurrency = max_concurrency
+        self.identify_interval = identify_interval
+        self.status = status
+        self.stats = {}  # cluster_id -> (received_at, snapshot)
+        self.broadcasts = {}  # label -> {cluster_id: summary of that cluster's latest round}
+        self.identifies = 0
+        self._writers = {}  # cluster_id -> StreamWriter
+        self._next_identify = {}  # bucket -> monotonic time of the next free slot
+        self._identify_locks = {}
+        self._tasks = set()
+        self._server = None
+        self.port = None
+
+    async def start(self, host='127.0.0.1', port=0):
+        self._server = await asyncio.start_server(self._serve, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"🛰️ Cluster hub listening on {host}:{self.port}")
+
+    async def stop(self):
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers.values()):
+            writer.close()
+        for task in self._tasks:
+            task.cancel()
+        self._server = None
+
+    def totals(self):
+        """Guilds, users and shards summed over the clusters currently reporting"""
+        snapshots = [snapshot for _, snapshot in self.stats.values()]
+        shards = [shard for snapshot in snapshots for shard in snapshot['shards']]
+        return {
+            'clusters': len(snapshots),
+            'expected': self.clusters,
+            'guilds': sum(snapshot['guilds'] for snapshot in snapshots),
+            'users': sum(snapshot['users'] for snapshot in snapshots),
+            'shards': len(shards),
+            'connected': sum(1 for shard in shards if shard['status'] != 'disconnected'),
+        }
+
+    def query(self, what):
+        if what == 'totals':
+            return self.totals()
+        if what == 'clusters':
+            now = time.time()
+            clusters = []
+            for cluster_id in range(self.clusters):
+                received, snapshot = self.stats.get(cluster_id, (None, None))
+                clusters.append({
+                    'id': cluster_id,
+                    'linked': cluster_id in self._writers,
+                    'age': round(now - received, 1) if received else None,
+                    'stats': snapshot,
+                    **(self.status(cluster_id) if self.status else {}),
+                })
+            return clusters
+        if what == 'broadcasts':
+            return {label: [{'cluster': cluster_id, **summary} for cluster_id, summary in sorted(rounds.items())]
+                    for label, rounds in self.broadcasts.items()}
+        return None
+
+    def _send(self, writer, message):
+        if not writer.is_closing():
+            writer.write(encode(message))
+
+    def _share_totals(self):
+        message = {'op': 'totals', 'data': self.totals()}
+        for writer in self._writers.values():
+            self._send(writer, message)
+
+    async def _identify_slot(self, shard_id):
+        bucket = shard_id % self.max_concurrency
+        lock = self._identify_locks.setdefault(bucket, asyncio.Lock())
+        async with lock:
+            delay = self._next_identify.get(bucket, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_identify[bucket] = time.monotonic() + self.identify_interval
+            self.identifies += 1
+
+    async def _answer(self, writer, message):
+        if message['op'] == 'identify':
+            await self._identify_slot(message['shard_id'])
+            data = True
+        else:
+            data = self.query(message.get('what'))
+        self._send(writer, {'op': 'reply', 'id': message['id'], 'data': data})
+
+    def _handle(self, cluster_id, writer, message):
+        op = message.get('op')
+        if op == 'stats':
+            self.stats[cluster_id] = (time.time(), message['data'])
+            self._share_totals()
+        elif op == 'broadcast':
+            summary = message['data']
+            rounds = self.broadcasts.setdefault(message['label'], {})
+            rounds[cluster_id] = summary
+            logger.info(f"📣 Cluster {cluster_id} finished {message['label']}: {summary['sent']} sent, "
+                        f"{summary['failed']} failed ({len(rounds)}/{self.clusters} clusters reported)")
+        elif op == 'relay':
+            relayed = {'op': 'relay', 'event': message['event'], 'data': message.get('data'), 'from': cluster_id}
+            for other, other_writer in self._writers.items():
+                if other != cluster_id:
+                    self._send(other_writer, relayed)
+            logger.info(f"📨 Relayed {message['event']} from cluster {cluster_id} to {len(self._writers) - 1} others")
+        elif op in ('identify', 'query'):
+            # Identify slots can wait for seconds; don't hold up this cluster's other messages
+            task = asyncio.create_task(self._answer(writer, message))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _serve(self, reader, writer):
+        cluster_id = None
+        try:
+            hello = json.loads(await reader.readline() or 'null')
+            if not isinstance(hello, dict) or hello.get('op') != 'hello' or hello.get('token') != self.token:
+                logger.warning("🚫 Rejected a cluster connection with a bad handshake")
+                return
+            cluster_id = hello['cluster']
+            self._writers[cluster_id] = writer
+            logger.info(f"🔗 Cluster {cluster_id} linked")
+            while line := await reader.readline():
+                self._handle(cluster_id, writer, json.loads(line))
+        except (ConnectionError, ValueError, KeyError) as e:
+            logger.warning(f"Cluster {cluster_id} link error: {e}")
+        finally:
+            if cluster_id is not None and self._writers.get(cluster_id) is writer:
+                del self._writers[cluster_id]
+                self.stats.pop(cluster_id, None)
+                logger.warning(f"⛓️‍💥 Cluster {cluster_id} unlinked")
+                self._share_totals()
+            writer.close()
+
+
+class ClusterLink:
+    """A bot process's side: pushes stats and reports, and asks the hub for identify slots and totals
+
+    Created from the environment the launcher sets (CLUSTER_ID, CLUSTER_IPC,
+    CLUSTER_IPC_TOKEN); `from_env()` returns None when the bot runs on its
+    own. `stats()` is called for each snapshot. `on(event, handler)` sets a
+    coroutine function to run when another cluster relays `event`. If the
+    hub goes away the link keeps reconnecting, and callers fall back to this
+    process's own numbers whenever `totals` is None or a request returns None.
+    """
+
+    def __init__(self, cluster_id, host, port, token, stats):
+        self.cluster_id = cluster_id
+        self.host = host
+        self.port = port
+        self.token = token
+        self.stats = stats
+        self.totals = None
+        self.handlers = {}  # relayed event -> coroutine function(data)
+        self._writer = None
+        self._linked = asyncio.Event()
+        self._pending = {}  # request id -> future
+        self._ids = itertools.count()
+        self._tasks = set()
+        self._task = None
+
+    @classmethod
+    def from_env(cls, stats):
+        address = os.getenv('CLUSTER_IPC')
+        if not address:
+            return None
+        host, _, port = address.rpartition(':')
+        return cls(int(os.getenv('CLUSTER_ID', '0')), host, int(port), os.getenv('CLUSTER_IPC_TOKEN', ''), stats)
+
+    @property
+    def linked(self):
+        return self._writer is not None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name='cluster-link')
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _send(self, message):
+        if self._writer is None or self._writer.is_closing():
+            return False
+        self._writer.write(encode(message))
+        return True
+
+    def push_stats(self):
+        return self._send({'op': 'stats', 'data': self.stats()})
+
+    def report_broadcast(self, label, report):
+        return self._send({'op': 'broadcast', 'label': label, 'data': broadcast_summary(report)})
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def relay(self, event, data=None):
+        """Have the hub pass `event` on to every other cluster; False if the hub isn't there"""
+        return self._send({'op': 'relay', 'event': event, 'data': data})
+
+    async def _run_handler(self, handler, message):
+        try:
+            await handler(message.get('data'))
+        except Exception as e:
+            logger.error(f"❌ Handling {message['event']} from cluster {message.get('from')} failed: {e}")
+
+    async def request(self, op, timeout=QUERY_TIMEOUT, **fields):
+        """Send a request and wait for the hub's answer; None if it can't be reached in time"""
+        try:
+            await asyncio.wait_for(self._linked.wait(), QUERY_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            if not self._send({'op': op, 'id': request_id, **fields}):
+                return None
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            return None
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def query(self, what):
+        return await self.request('query', what=what)
+
+    async def identify(self, shard_id):
+        """Wait for the hub to hand this shard an IDENTIFY slot; False if the hub isn't there"""
+        return bool(await self.request('identify', timeout=None, shard_id=shard_id))
+
+    def _receive(self, message):
+        if message.get('op') == 'totals':
+            self.totals = message['data']
+        elif message.get('op') == 'relay':
+            handler = self.handlers.get(message['event'])
+            if handler is not None:
+                task = asyncio.create_task(self._run_handler(handler, message))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        elif message.get('op') == 'reply':
+            future = self._pending.get(message['id'])
+            if future is not None and not future.done():
+                future.set_result(message['data'])
+
+    async def _push_loop(self):
+        while True:
+            self.push_stats()
+            await asyncio.sleep(STATS_INTERVAL)
+
+    async def _run(self):
+        delay = 1.0
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                logger.warning(f"Couldn't reach the cluster hub ({e}), retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+            delay = 1.0
+            self._writer = writer
+            self._send({'op': 'hello', 'cluster': self.cluster_id, 'token': self.token})
+            self._linked.set()
+            logger.info(f"🔗 Cluster {self.cluster_id} linked to the hub")
+            pusher = asyncio.create_task(self._push_loop())
+            try:
+                while line := await reader.readline():
+                    self._receive(json.loads(line))
+            except (ConnectionError, ValueError) as e:
+                logger.warning(f"Cluster hub link error: {e}")
+            finally:
+                pusher.cancel()
+                self._linked.clear()
+                self._writer = None
+                self.totals = None
+                writer.close()
+                for future in self._pending.values():
+                    if not future.done():
+                        future.set_exception(ConnectionError('cluster hub connection lost'))
+            logger.warning("⛓️‍💥 Lost the cluster hub, reconnecting")
+            await asyncio.sleep(delay)
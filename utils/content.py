@@ -0,0 +1,218 @@
+"""Content packs: the bot's static text (facts, tips, jokes, exercises, crisis lines) loaded from a versioned file"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from types import MappingProxyType
+
+logger = logging.getLogger("mochabot.content")
+
+# Discord rejects a whole message (400) whose embed breaks one of these, so a pack must fit them
+EMBED_FIELDS = 25
+FIELD_NAME = 256
+FIELD_VALUE = 1024
+EMBED_TITLE = 256
+EMBED_DESCRIPTION = 4096
+# !crisis adds two fields of its own after the services, and a title, description and footer
+CRISIS_EXTRA_FIELDS = 2
+CRISIS_TEXT_BUDGET = 5000
+
+
+def content_path():
+    """Resolve the content pack from CONTENT_PACK (data/content.json by default)"""
+    default = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'content.json')
+    return os.getenv('CONTENT_PACK', default)
+
+
+def freeze(value):
+    """Lists become tuples and dicts read-only mappings, all the way down"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _strings(value):
+    if not isinstance(value, list) or not value:
+        return 'needs a non-empty list of strings'
+    if any(not isinstance(item, str) or not item.strip() for item in value):
+        return 'every entry must be a non-empty string'
+    return None
+
+
+def _steps_text(steps):
+    # As !breathe shows them; numbering is never shorter than !ground's bullets
+    return '\n'.join(f'{i + 1}. {step}' for i, step in enumerate(steps))
+
+
+def _exercises(value):
+    if not isinstance(value, list) or not value:
+        return 'needs a non-empty list of exercises'
+    names = set()
+    for n, item in enumerate(value):
+        if not isinstance(item, dict) or not all(isinstance(item.get(field), str) and item[field].strip() for field in ('name', 'description')):
+            return f'#{n} needs a name and a description'
+        if _strings(item.get('steps')):
+            return f'#{n} ({item["name"]}) needs a non-empty list of steps'
+        if len(item['name']) > EMBED_TITLE - 2:
+            return f'#{n} has a name over {EMBED_TITLE - 2} characters'
+        if len(item['description']) > EMBED_DESCRIPTION:
+            return f'#{n} ({item["name"]}) has a description over {EMBED_DESCRIPTION} characters'
+        if len(_steps_text(item['steps'])) > FIELD_VALUE:
+            return f'#{n} ({item["name"]}) has steps over {FIELD_VALUE} characters when listed'
+        if item['name'] in names:
+            return f'#{n} repeats the name {item["name"]!r}'
+        names.add(item['name'])
+    return None
+
+
+def _resources(value):
+    if not isinstance(value, dict) or not value:
+        return 'needs at least one country'
+    for code, services in value.items():
+        if code != code.upper():
+            return f'country code {code!r} must be upper case'
+        if not isinstance(services, dict) or not services:
+            return f'{code} needs at least one service'
+        if any(not isinstance(contact, str) or not contact.strip() for contact in services.values()):
+            return f'{code} has a service without a contact'
+        # Each service is one field, its name after an emoji and its contact in bold
+        if len(services) > EMBED_FIELDS - CRISIS_EXTRA_FIELDS:
+            return f'{code} has {len(services)} services, at most {EMBED_FIELDS - CRISIS_EXTRA_FIELDS} fit'
+        for service, contact in services.items():
+            if len(service) > FIELD_NAME - 2:
+                return f'{code} has a service name over {FIELD_NAME - 2} characters: {service[:40]!r}...'
+            if len(contact) > FIELD_VALUE - 4:
+                return f'{code} has a contact over {FIELD_VALUE - 4} characters for {service!r}'
+        if sum(len(service) + len(contact) for service, contact in services.items()) > CRISIS_TEXT_BUDGET:
+            return f'{code} has over {CRISIS_TEXT_BUDGET} characters of services, more than one embed holds'
+    return None
+
+
+def _aliases(value):
+    if not isinstance(value, dict) or any(not isinstance(code, str) for code in value.values()):
+        return 'needs a mapping of country names to codes'
+    for name in value:
+        # !crisis upper-cases what it's given before looking it up
+        if name != name.upper():
+            return f'name {name!r} must be upper case'
+    return None
+
+
+def _jokes(value):
+    if not isinstance(value, list) or not value:
+        return 'needs a non-empty list of jokes'
+    for n, item in enumerate(value):
+        if not isinstance(item, dict) or _strings([item.get('setup'), item.get('punchline')]):
+            return f'#{n} needs a setup and a punchline'
+    return None
+
+
+# section -> {key: check}; every one must be present for a pack to load
+SECTIONS = {
+    'coffee': {'facts': _strings, 'brewing_tips': _strings},
+    'mentalhealth': {
+        'affirmations': _strings,
+        'breathing_exercises': _exercises,
+        'grounding_techniques': _exercises,
+        'crisis_resources': _resources,
+        'country_aliases': _aliases,
+    },
+    'fun': {'jokes': _jokes},
+}
+
+
+def _problem(raw):
+    """Why a raw pack can't be used, or None if it's fine"""
+    if not isinstance(raw, dict):
+        return 'not a JSON object'
+    if not isinstance(raw.get('version'), int):
+        return 'missing an integer version'
+    for section, checks in SECTIONS.items():
+        if not isinstance(raw.get(section), dict):
+            return f'missing the {section} section'
+        for key, check in checks.items():
+            problem = check(raw[section].get(key))
+            if problem:
+                return f'{section}.{key}: {problem}'
+    unknown = set(raw['mentalhealth']['country_aliases'].values()) - set(raw['mentalhealth']['crisis_resources'])
+    if unknown:
+        return f'mentalhealth.country_aliases: no crisis resources for {", ".join(sorted(unknown))}'
+    return None
+
+
+class ContentPack:
+    """One validated version of the content, frozen so every reader can share it safely
+
+    A pack is never changed after loading; a new version is a new pack, so a
+    command that picked something from the old one finishes with it unharmed.
+    `pack['coffee']['facts']` and friends are tuples and read-only mappings.
+    """
+
+    def __init__(self, data, path=None, digest=None):
+        self.version = data['version']
+        self.path = path
+        self.digest = digest
+        self.loaded_at = time.time()
+        self._sections = freeze({section: data[section] for section in SECTIONS})
+
+    @classmethod
+    def load(cls, path=None):
+        """Read and validate a pack; anything wrong rejects the whole file"""
+        path = path or content_path()
+        with open(path, 'rb') as f:
+            body = f.read()
+        try:
+            raw = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise ValueError(f'{path} is not valid JSON: {e}') from None
+        problem = _problem(raw)
+        if problem:
+            raise ValueError(f'{path}: {problem}')
+        return cls(raw, path, hashlib.sha256(body).hexdigest()[:12])
+
+    def __getitem__(self, section):
+        return self._sections[section]
+
+
+class ContentStore:
+    """Holds the current ContentPack and swaps in new versions without a restart
+
+    Cogs `subscribe(callback)` and are called with the current pack straight
+    away and with every new one; callbacks are plain functions, so a swap
+    happens between two commands' steps and is never seen half done. A pack
+    that fails to load or validate leaves the current one in place.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.pack = None
+        self.reloads = 0
+        self._subscribers = []
+
+    async def load(self):
+        """Load the first pack; raises if it's missing or broken, since cogs can't run without it"""
+        self.pack = await asyncio.to_thread(ContentPack.load, self.path)
+        logger.info(f"📚 Loaded content pack v{self.pack.version} ({self.pack.digest}) from {self.pack.path}")
+
+    async def reload(self, path=None):
+        """Swap in the pack at `path` (the configured one by default); returns (old, new)"""
+        pack = await asyncio.to_thread(ContentPack.load, path or self.path)
+        old, self.pack = self.pack, pack
+        for callback in list(self._subscribers):
+            callback(pack)
+        self.reloads += 1
+        logger.info(f"📚 Content pack v{old.version} ({old.digest}) -> v{pack.version} ({pack.digest})")
+        return old, pack
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        callback(self.pack)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
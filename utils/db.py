@@ -0,0 +1,89 @@
+"""Async wrapper around the bot's SQLite database"""
+
+import asyncio
+import functools
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("mochabot.db")
+
+
+def database_path():
+    """Resolve the SQLite file from DATABASE_URL (sqlite:///mochabot.db by default)"""
+    url = os.getenv('DATABASE_URL', 'sqlite:///mochabot.db')
+    if url.startswith('sqlite:///'):
+        return url[len('sqlite:///'):]
+    return url
+
+
+class Database:
+    """One SQLite connection in WAL mode, driven from a single worker thread
+
+    All statements run on the same thread so the connection is never shared
+    across threads, and the event loop never blocks on disk I/O.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or database_path()
+        self._conn = None
+        self._executor = None
+
+    async def connect(self):
+        if self._conn is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mochabot-db')
+        self._conn = await self._submit(self._open)
+        logger.info(f"🗄️ Database ready ({self.path})")
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        return conn
+
+    async def close(self):
+        if self._conn is None:
+            return
+        await self._submit(self._conn.close)
+        self._executor.shutdown(wait=True)
+        self._conn = None
+        self._executor = None
+
+    def _submit(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def run(self, fn, *args):
+        """Run `fn(connection, *args)` on the database thread inside one transaction"""
+        def call():
+            with self._conn:
+                return fn(self._conn, *args)
+        return await self._submit(call)
+
+    async def executescript(self, script):
+        await self._submit(self._conn.executescript, script)
+
+    async def execute(self, sql, params=()):
+        """Execute one statement and commit; returns (lastrowid, rowcount)"""
+        def call(conn):
+            cursor = conn.execute(sql, params)
+            return cursor.lastrowid, cursor.rowcount
+        return await self.run(call)
+
+    async def executemany(self, sql, seq_of_params):
+        def call(conn):
+            return conn.executemany(sql, seq_of_params).rowcount
+        return await self.run(call)
+
+    async def fetchall(self, sql, params=()):
+        def call():
+            return self._conn.execute(sql, params).fetchall()
+        return await self._submit(call)
+
+    async def fetchone(self, sql, params=()):
+        def call():
+            return self._conn.execute(sql, params).fetchone()
+        return await self._submit(call)
@@ -0,0 +1,167 @@
+"""Gateway event profiling: events per second by type, and time spent in every listener"""
+
+import logging
+import time
+from collections import Counter, deque
+
+import discord
+
+from utils.perf import WINDOWS, Histogram, LatencySeries
+
+logger = logging.getLogger("mochabot.events")
+
+# Per-second event counts kept for rates and peaks
+RATE_SECONDS = 60
+# A slow handler is logged at most this often, with how many slow runs were not logged
+SLOW_LOG_INTERVAL = 30.0
+
+
+def guild_id_of(args):
+    """The guild an event is about, from its arguments (a message, member, raw payload or guild)"""
+    for arg in args:
+        if isinstance(arg, discord.Guild):
+            return arg.id
+        guild = getattr(arg, 'guild', None)
+        if guild is not None:
+            return guild.id
+        guild_id = getattr(arg, 'guild_id', None)
+        if guild_id is not None:
+            return guild_id
+    return None
+
+
+class Stepped:
+    """Awaits a coroutine, adding up how long its steps ran on the event loop
+
+    Wall time includes every await (HTTP calls, database reads, sleeps);
+    `busy` is only the time between them, i.e. how long the handler kept
+    every other task waiting. Cancellation and errors pass straight through.
+    """
+
+    __slots__ = ('coro', 'busy')
+
+    def __init__(self, coro):
+        self.coro = coro
+        self.busy = 0.0
+
+    def __await__(self):
+        coro = self.coro
+        value = error = None
+        while True:
+            started = time.perf_counter()
+            try:
+                yielded = coro.throw(error) if error is not None else coro.send(value)
+            except StopIteration as e:
+                self.busy += time.perf_counter() - started
+                return e.value
+            except BaseException:
+                self.busy += time.perf_counter() - started
+                raise
+            self.busy += time.perf_counter() - started
+            value = error = None
+            try:
+                value = yield yielded
+            except BaseException as e:
+                error = e
+
+
+class HandlerStats:
+    __slots__ = ('wall', 'busy', 'slow', 'suppressed', 'last_warned')
+
+    def __init__(self):
+        self.wall = LatencySeries()
+        self.busy = LatencySeries()
+        self.slow = 0
+        self.suppressed = 0
+        self.last_warned = 0.0
+
+
+class EventProfiler:
+    """Counts every dispatched event and times every listener that runs for one
+
+    The bot calls `dispatched(event)` for each event and runs each listener
+    (its own @bot.event handlers and every cog listener) through `wrap()`.
+    Each run records wall time and on-loop time into the same fixed-memory
+    windows as !perf; a run over `budget` seconds of wall time is logged with
+    its event and guild id, at most once per SLOW_LOG_INTERVAL per listener.
+    """
+
+    def __init__(self, budget=0.25):
+        self.budget = budget
+        self.handlers = {}  # (event, listener name) -> HandlerStats
+        self.seconds = deque(maxlen=RATE_SECONDS)  # [second, Counter of events]
+        self.total = Counter()
+        self.since = time.time()
+
+    def dispatched(self, event):
+        second = int(time.monotonic())
+        if not self.seconds or self.seconds[-1][0] != second:
+            self.seconds.append((second, Counter()))
+        self.seconds[-1][1][event] += 1
+        self.total[event] += 1
+
+    def wrap(self, handler, event):
+        """`handler` with the same signature, timed and recorded under `event`"""
+        async def profiled(*args, **kwargs):
+            steps = Stepped(handler(*args, **kwargs))
+            started = time.perf_counter()
+            failed = False
+            try:
+                return await steps
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self.record(event, getattr(handler, '__qualname__', repr(handler)), time.perf_counter() - started,
+                            steps.busy, failed, args)
+        return profiled
+
+    def record(self, event, name, wall, busy, failed=False, args=(), now=None):
+        stats = self.handlers.get((event, name))
+        if stats is None:
+            stats = self.handlers[(event, name)] = HandlerStats()
+        now = time.time() if now is None else now
+        stats.wall.record(now, wall, failed)
+        stats.busy.record(now, busy, failed)
+        if wall > self.budget:
+            stats.slow += 1
+            if now - stats.last_warned < SLOW_LOG_INTERVAL:
+                stats.suppressed += 1
+                return
+            suppressed = f" (+{stats.suppressed} more since the last warning)" if stats.suppressed else ""
+            logger.warning(f"🐌 {name} took {wall * 1000:.0f}ms ({busy * 1000:.1f}ms on the loop) for {event} "
+                           f"in guild {guild_id_of(args)}, over the {self.budget * 1000:.0f}ms budget{suppressed}")
+            stats.last_warned = now
+            stats.suppressed = 0
+
+    def rates(self, limit=10):
+        """(event, per second over the last RATE_SECONDS, peak in one second) for the busiest event types"""
+        current = int(time.monotonic())
+        recent = [counts for second, counts in self.seconds if second > current - RATE_SECONDS]
+        totals = Counter()
+        peaks = Counter()
+        for counts in recent:
+            totals.update(counts)
+            for event, count in counts.items():
+                peaks[event] = max(peaks[event], count)
+        covered = max(1, min(RATE_SECONDS, int(time.time() - self.since)))
+        return [(event, count / covered, peaks[event]) for event, count in totals.most_common(limit)]
+
+    def report(self, window='5m', limit=10, now=None):
+        """Listeners by time spent on the loop over a window: (event, name, wall histogram, busy histogram, slow runs)"""
+        seconds = WINDOWS[window]
+        now = time.time() if now is None else now
+        rows = []
+        for (event, name), stats in self.handlers.items():
+            wall = stats.wall.window(seconds, now)
+            if wall.count:
+                rows.append((event, name, wall, stats.busy.window(seconds, now), stats.slow))
+        rows.sort(key=lambda row: row[3].total, reverse=True)
+        return rows[:limit]
+
+    def busy_total(self, window='5m', now=None):
+        now = time.time() if now is None else now
+        merged = Histogram()
+        for stats in self.handlers.values():
+            merged.merge(stats.busy.window(WINDOWS[window], now))
+        return merged
@@ -0,0 +1,90 @@
+"""Pooled HTTP client shared by every cog for outbound API calls"""
+
+import aiohttp
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger("mochabot.http")
+
+# Per-service timeouts; cogs name the service they are calling
+SERVICE_TIMEOUTS = {
+    'coffee': aiohttp.ClientTimeout(total=6, connect=3, sock_read=4),
+    'quotes': aiohttp.ClientTimeout(total=6, connect=3, sock_read=4),
+    'weather': aiohttp.ClientTimeout(total=10, connect=3, sock_read=6),
+}
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3)
+
+
+class WebClient:
+    """One long-lived aiohttp session with a bounded, keep-alive connection pool"""
+
+    def __init__(self, limit=100, limit_per_host=10, dns_ttl=300, keepalive=30.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive = keepalive
+        self.session = None
+        self.host_stats = defaultdict(lambda: {'requests': 0, 'opened': 0, 'reused': 0, 'errors': 0})
+
+    async def start(self):
+        """Create the connector and session (call once during bot setup)"""
+        if self.session and not self.session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_ttl,
+            keepalive_timeout=self.keepalive,
+        )
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_connection_create_end.append(self._on_connection_opened)
+        trace.on_connection_reuseconn.append(self._on_connection_reused)
+        trace.on_request_exception.append(self._on_request_exception)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=DEFAULT_TIMEOUT,
+            trace_configs=[trace],
+            headers={'User-Agent': 'MochaBot (https://github.com/aurora9161/mochabot)'},
+        )
+        logger.info(f"🌐 HTTP pool ready (limit={self.limit}, per_host={self.limit_per_host})")
+
+    async def close(self):
+        """Close the session and every pooled connection (call on shutdown)"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def get(self, url, service=None, **kwargs):
+        """Issue a GET through the shared pool; use as `async with client.get(...) as response`"""
+        return self.request('GET', url, service=service, **kwargs)
+
+    def request(self, method, url, service=None, **kwargs):
+        if self.session is None or self.session.closed:
+            raise RuntimeError("WebClient.start() must be awaited before making requests")
+        kwargs.setdefault('timeout', SERVICE_TIMEOUTS.get(service, DEFAULT_TIMEOUT))
+        return self.session.request(method, url, **kwargs)
+
+    def pool_stats(self):
+        """Per-host request and connection reuse counters"""
+        stats = {}
+        for host, counts in self.host_stats.items():
+            connections = counts['opened'] + counts['reused']
+            stats[host] = dict(counts, reuse_rate=(counts['reused'] / connections) if connections else 0.0)
+        return stats
+
+    # Trace hooks: the trace context is per request, so the host recorded at
+    # request start is available to the connection callbacks that follow it
+    async def _on_request_start(self, session, ctx, params):
+        ctx.host = params.url.host
+        self.host_stats[ctx.host]['requests'] += 1
+
+    async def _on_connection_opened(self, session, ctx, params):
+        self.host_stats[getattr(ctx, 'host', None)]['opened'] += 1
+
+    async def _on_connection_reused(self, session, ctx, params):
+        self.host_stats[getattr(ctx, 'host', None)]['reused'] += 1
+
+    async def _on_request_exception(self, session, ctx, params):
+        self.host_stats[getattr(ctx, 'host', None)]['errors'] += 1
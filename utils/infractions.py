@@ -0,0 +1,134 @@
+"""Append-only moderation infraction ledger with cached escalation counters"""
+
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger("mochabot.infractions")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS infractions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    moderator_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    reason TEXT,
+    duration REAL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_infractions_member_time ON infractions (guild_id, member_id, created_at);
+
+CREATE TABLE IF NOT EXISTS infraction_totals (
+    guild_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, member_id, action)
+) WITHOUT ROWID;
+"""
+
+# Escalation policy: this many warns inside the window triggers an automatic timeout
+ESCALATION_WARNS = 3
+ESCALATION_WINDOW = 24 * 3600
+ESCALATION_TIMEOUT = 3600
+
+
+class InfractionLedger:
+    """Records warn/kick/ban/timeout actions and tracks recent warns per member
+
+    Rows are only ever inserted, and per-action totals per member are
+    bumped in the same transaction. Recent warn timestamps are cached per
+    (guild, member) in bounded deques, so the escalation check on every
+    warn never touches the database.
+    """
+
+    def __init__(self, db, warns=ESCALATION_WARNS, window=ESCALATION_WINDOW):
+        self.db = db
+        self.warns = warns
+        self.window = window
+        self._recent_warns = {}
+        self._records_since_prune = 0
+
+    async def load(self):
+        """Create the table and warm the warn counters from the current window"""
+        await self.db.executescript(SCHEMA)
+        rows = await self.db.fetchall(
+            "SELECT guild_id, member_id, action, created_at FROM infractions "
+            "WHERE action IN ('warn', 'timeout') AND created_at >= ? ORDER BY created_at",
+            (time.time() - self.window,)
+        )
+        for guild_id, member_id, action, created_at in rows:
+            self._note(guild_id, member_id, action, created_at)
+        logger.info(f"🔒 Infraction ledger ready ({len(self._recent_warns)} members with recent warns)")
+
+    async def record(self, guild_id, member_id, moderator_id, action, reason=None, duration=None):
+        """Append an infraction; returns its case number"""
+        now = time.time()
+
+        def insert(conn):
+            cursor = conn.execute(
+                'INSERT INTO infractions (guild_id, member_id, moderator_id, action, reason, duration, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (guild_id, member_id, moderator_id, action, reason, duration, now)
+            )
+            conn.execute(
+                'INSERT INTO infraction_totals (guild_id, member_id, action, count) VALUES (?, ?, ?, 1) '
+                'ON CONFLICT (guild_id, member_id, action) DO UPDATE SET count = count + 1',
+                (guild_id, member_id, action)
+            )
+            return cursor.lastrowid
+
+        case_id = await self.db.run(insert)
+        self._note(guild_id, member_id, action, now)
+        self._records_since_prune += 1
+        if self._records_since_prune >= 1000:
+            self._prune(now)
+        return case_id
+
+    def _note(self, guild_id, member_id, action, created_at):
+        key = (guild_id, member_id)
+        if action == 'timeout':
+            # A timeout (manual or automatic) settles the warns that led up to it
+            self._recent_warns.pop(key, None)
+            return
+        if action != 'warn':
+            return
+        warns = self._recent_warns.get(key)
+        if warns is None:
+            warns = self._recent_warns[key] = deque(maxlen=self.warns)
+        warns.append(created_at)
+
+    def recent_warns(self, guild_id, member_id, now=None):
+        """Warns for this member inside the escalation window (capped at the threshold)"""
+        warns = self._recent_warns.get((guild_id, member_id))
+        if not warns:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.window
+        return sum(1 for created_at in warns if created_at >= cutoff)
+
+    def should_escalate(self, guild_id, member_id):
+        return self.recent_warns(guild_id, member_id) >= self.warns
+
+    def _prune(self, now):
+        cutoff = now - self.window
+        stale = [key for key, warns in self._recent_warns.items() if warns[-1] < cutoff]
+        for key in stale:
+            del self._recent_warns[key]
+        self._records_since_prune = 0
+
+    async def history(self, guild_id, member_id, limit=10):
+        """Most recent infractions for a member, newest first"""
+        return await self.db.fetchall(
+            'SELECT id, action, reason, moderator_id, duration, created_at FROM infractions '
+            'WHERE guild_id = ? AND member_id = ? ORDER BY created_at DESC LIMIT ?',
+            (guild_id, member_id, limit)
+        )
+
+    async def totals(self, guild_id, member_id):
+        """Infraction counts per action for a member"""
+        rows = await self.db.fetchall(
+            'SELECT action, count FROM infraction_totals WHERE guild_id = ? AND member_id = ?',
+            (guild_id, member_id)
+        )
+        return dict(rows)
@@ -0,0 +1,175 @@
+"""Compiled keyword matching for on_message reactions, configurable per guild"""
+
+import logging
+import re
+
+logger = logging.getLogger("mochabot.keywords")
+
+# Categories in priority order: when a message matches several, the first wins
+DEFAULT_CATEGORIES = {
+    'mental': {
+        'emoji': '💙',
+        'probability': 1 / 15,
+        'keywords': ['stress', 'anxiety', 'depression', 'sad', 'worried', 'panic', 'overwhelmed', 'tired', 'exhausted'],
+    },
+    'coffee': {
+        'emoji': '☕',
+        'probability': 1 / 20,
+        'keywords': ['coffee', 'café', 'espresso', 'latte', 'cappuccino', 'mocha', 'brew'],
+    },
+}
+
+# Whole words only, allowing simple inflections ("stressed", "brewing") but not "crusade" for "sad"
+SUFFIXES = r'(?:s|es|ed|d|ing|ful|y)?'
+VALID_KEYWORD = re.compile(r"^\w[\w' -]{0,30}\w$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_keywords (
+    guild_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    enabled INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, category, keyword)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS guild_keyword_rates (
+    guild_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    probability REAL NOT NULL,
+    PRIMARY KEY (guild_id, category)
+) WITHOUT ROWID;
+"""
+
+
+def trie_pattern(words):
+    """Regex alternation shaped like a trie, so matching cost doesn't grow with the word count
+
+    A flat `a|b|c` alternation is retried keyword by keyword at every
+    position; nesting shared prefixes means each character is tested once.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = f"(?:{'|'.join(branches)})"
+        return group + '?' if terminal else group
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """All categories compiled into one word-bounded trie regex, matched against lowercased text"""
+
+    def __init__(self, categories):
+        self.categories = list(categories.items())
+        # Keyword -> category index; when a keyword is in two categories the higher priority wins
+        self.category_of = {}
+        for index, (name, category) in enumerate(self.categories):
+            for keyword in category['keywords']:
+                self.category_of.setdefault(keyword.lower(), index)
+        # Content is lowercased before matching; that is cheaper than re.IGNORECASE
+        self.pattern = re.compile(rf"\b({trie_pattern(self.category_of)}){SUFFIXES}\b") if self.category_of else None
+
+    def match(self, content):
+        """Return (category, emoji, probability) for the highest-priority hit, or None"""
+        if self.pattern is None:
+            return None
+        best = None
+        for hit in self.pattern.finditer(content.lower()):
+            index = self.category_of[hit.group(1)]
+            if best is None or index < best:
+                best = index
+                if index == 0:
+                    break
+        if best is None:
+            return None
+        name, category = self.categories[best]
+        return name, category['emoji'], category['probability']
+
+
+class KeywordReactions:
+    """Per-guild keyword sets layered over the defaults, one compiled matcher each
+
+    Guilds without overrides share the default matcher; a guild's matcher is
+    compiled on first use after its configuration changes.
+    """
+
+    def __init__(self, db, defaults=DEFAULT_CATEGORIES):
+        self.db = db
+        self.defaults = defaults
+        self.default_matcher = KeywordMatcher(defaults)
+        self._keywords = {}  # guild_id -> {(category, keyword): enabled}
+        self._rates = {}  # guild_id -> {category: probability}
+        self._matchers = {}
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+        for guild_id, category, keyword, enabled in await self.db.fetchall(
+                'SELECT guild_id, category, keyword, enabled FROM guild_keywords'):
+            self._keywords.setdefault(guild_id, {})[(category, keyword)] = bool(enabled)
+        for guild_id, category, probability in await self.db.fetchall(
+                'SELECT guild_id, category, probability FROM guild_keyword_rates'):
+            self._rates.setdefault(guild_id, {})[category] = probability
+
+    def categories_for(self, guild_id):
+        """Effective configuration for a guild, in priority order"""
+        keywords = self._keywords.get(guild_id, {})
+        rates = self._rates.get(guild_id, {})
+        categories = {}
+        for name, category in self.defaults.items():
+            words = set(category['keywords'])
+            for (cat, keyword), enabled in keywords.items():
+                if cat == name:
+                    (words.add if enabled else words.discard)(keyword)
+            categories[name] = {
+                'emoji': category['emoji'],
+                'probability': rates.get(name, category['probability']),
+                'keywords': sorted(words),
+            }
+        return categories
+
+    def matcher_for(self, guild_id):
+        if guild_id not in self._keywords and guild_id not in self._rates:
+            return self.default_matcher
+        matcher = self._matchers.get(guild_id)
+        if matcher is None:
+            matcher = self._matchers[guild_id] = KeywordMatcher(self.categories_for(guild_id))
+        return matcher
+
+    def match(self, guild_id, content):
+        return self.matcher_for(guild_id).match(content)
+
+    async def set_keyword(self, guild_id, category, keyword, enabled):
+        """Add (enabled=True) or remove (enabled=False) a keyword for one guild"""
+        await self.db.execute(
+            'INSERT OR REPLACE INTO guild_keywords (guild_id, category, keyword, enabled) VALUES (?, ?, ?, ?)',
+            (guild_id, category, keyword, int(enabled))
+        )
+        self._keywords.setdefault(guild_id, {})[(category, keyword)] = enabled
+        self._matchers.pop(guild_id, None)
+
+    async def set_probability(self, guild_id, category, probability):
+        await self.db.execute(
+            'INSERT OR REPLACE INTO guild_keyword_rates (guild_id, category, probability) VALUES (?, ?, ?)',
+            (guild_id, category, probability)
+        )
+        self._rates.setdefault(guild_id, {})[category] = probability
+        self._matchers.pop(guild_id, None)
+
+    async def reset(self, guild_id):
+        """Drop a guild's overrides so it uses the defaults again"""
+        await self.db.execute('DELETE FROM guild_keywords WHERE guild_id = ?', (guild_id,))
+        await self.db.execute('DELETE FROM guild_keyword_rates WHERE guild_id = ?', (guild_id,))
+        self._keywords.pop(guild_id, None)
+        self._rates.pop(guild_id, None)
+        self._matchers.pop(guild_id, None)
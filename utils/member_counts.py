@@ -0,0 +1,109 @@
+"""Per-guild member counters kept current from gateway events"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger("mochabot.members")
+
+STATUSES = ('online', 'idle', 'dnd', 'offline')
+
+
+def status_key(member):
+    # Anything unusual (e.g. 'invisible', which only the bot itself can have) counts as offline
+    status = str(member.status)
+    return status if status in STATUSES else 'offline'
+
+
+class MemberCounters:
+    """Humans, bots and members per status for each guild, read in O(1)
+
+    A guild is counted in one pass when it becomes available (or on first
+    read), then adjusted from member join/remove and presence events. A
+    background check recounts every `check_interval` seconds, one guild at a
+    time, and logs and corrects any drift.
+    """
+
+    def __init__(self, bot, check_interval=1800.0):
+        self.bot = bot
+        self.check_interval = check_interval
+        self._counts = {}  # guild_id -> {'humans', 'bots', 'online', 'idle', 'dnd', 'offline'}
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._check_loop(), name='member-counters')
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @staticmethod
+    def count(guild):
+        counts = dict.fromkeys(('humans', 'bots') + STATUSES, 0)
+        for member in guild.members:
+            counts['bots' if member.bot else 'humans'] += 1
+            counts[status_key(member)] += 1
+        return counts
+
+    def initialize(self, guild):
+        self._counts[guild.id] = self.count(guild)
+
+    def forget(self, guild_id):
+        self._counts.pop(guild_id, None)
+
+    def get(self, guild):
+        counts = self._counts.get(guild.id)
+        if counts is None:
+            self.initialize(guild)
+            counts = self._counts[guild.id]
+        return counts
+
+    def _adjust(self, member, delta):
+        counts = self._counts.get(member.guild.id)
+        if counts is None:
+            return  # counted from scratch on first read
+        counts['bots' if member.bot else 'humans'] += delta
+        counts[status_key(member)] += delta
+
+    def member_joined(self, member):
+        self._adjust(member, 1)
+
+    def member_removed(self, member):
+        self._adjust(member, -1)
+
+    def presence_updated(self, before, after):
+        counts = self._counts.get(after.guild.id)
+        if counts is None:
+            return
+        old, new = status_key(before), status_key(after)
+        if old != new:
+            counts[old] -= 1
+            counts[new] += 1
+
+    async def check_drift(self):
+        """Recount every tracked guild; returns how many had drifted"""
+        drifted = 0
+        for guild_id in list(self._counts):
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                self.forget(guild_id)
+                continue
+            actual = self.count(guild)
+            cached = self._counts.get(guild_id)
+            if cached is not None and cached != actual:
+                drifted += 1
+                diff = ', '.join(f'{k} {cached[k]}→{actual[k]}' for k in actual if cached[k] != actual[k])
+                logger.warning(f"👥 Member counters drifted in {guild.name} ({guild_id}): {diff}")
+            self._counts[guild_id] = actual
+            # Recounting a big guild is a tight loop; let other tasks run between guilds
+            await asyncio.sleep(0)
+        return drifted
+
+    async def _check_loop(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check_drift()
+            except Exception as e:
+                logger.warning(f"Member counter check failed: {e}")
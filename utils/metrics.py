@@ -0,0 +1,133 @@
+"""Background sampler for process, event loop and gateway metrics"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+
+logger = logging.getLogger("mochabot.metrics")
+
+# Seconds to wait after start() before importing psutil
+STARTUP_GRACE = 5.0
+
+# Fields summarised by !stats, with their display labels and units
+FIELDS = {
+    'cpu': ('System CPU', '%'),
+    'process_cpu': ('Bot CPU', '%'),
+    'rss_mb': ('Bot Memory', 'MB'),
+    'loop_lag_ms': ('Event Loop Lag', 'ms'),
+    'latency_ms': ('Gateway Latency', 'ms'),
+    'guilds': ('Servers', ''),
+    'users': ('Users', ''),
+}
+
+
+class MetricsSampler:
+    """Samples every `interval` seconds into ring buffers, without blocking the loop
+
+    psutil's CPU figures are taken with `interval=None`, i.e. usage since the
+    previous sample, so nothing ever sleeps inside a command. Event-loop lag is
+    how late the sampler's own sleep woke up. psutil itself is only imported
+    when the sampler task first runs, keeping it off the startup path.
+
+    Raw samples cover the last `hour_window` seconds; older data is kept as
+    `(min, avg, max)` rollups of `rollup_seconds` each for the last day.
+    """
+
+    def __init__(self, bot, interval=10.0, hour_window=3600, rollup_seconds=300, day_window=86400):
+        self.bot = bot
+        self.interval = interval
+        self.rollup_seconds = rollup_seconds
+        self.psutil = None
+        self.process = None
+        self.recent = deque(maxlen=int(hour_window / interval))
+        self.rollups = deque(maxlen=int(day_window / rollup_seconds))
+        self._pending = []
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sample_loop(), name='metrics-sampler')
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def latest(self):
+        """The most recent sample in O(1), or None before the first one"""
+        return self.recent[-1] if self.recent else None
+
+    def sample(self, loop_lag_ms=0.0):
+        latency = self.bot.latency
+        return {
+            'time': time.time(),
+            'cpu': self.psutil.cpu_percent(interval=None),
+            'process_cpu': self.process.cpu_percent(interval=None),
+            'rss_mb': self.process.memory_info().rss / (1024 * 1024),
+            'memory': self.psutil.virtual_memory().percent,
+            'loop_lag_ms': loop_lag_ms,
+            'latency_ms': latency * 1000 if math.isfinite(latency) else None,
+            'guilds': len(self.bot.guilds),
+            'users': len(self.bot.users),
+        }
+
+    def record(self, sample):
+        self.recent.append(sample)
+        self._pending.append(sample)
+        if sample['time'] - self._pending[0]['time'] >= self.rollup_seconds:
+            self.rollups.append(self._rollup(self._pending))
+            self._pending = []
+
+    @staticmethod
+    def _rollup(samples):
+        rollup = {'time': samples[-1]['time']}
+        for field in FIELDS:
+            values = [s[field] for s in samples if s[field] is not None]
+            rollup[field] = (min(values), sum(values) / len(values), max(values)) if values else None
+        return rollup
+
+    def summary(self, seconds):
+        """{field: (min, avg, max) or None} over the last `seconds`
+
+        Windows within the raw buffer use raw samples; longer ones use the
+        rollups (plus whatever hasn't been rolled up yet).
+        """
+        since = time.time() - seconds
+        if self.recent and seconds <= self.recent.maxlen * self.interval:
+            return self._rollup([s for s in self.recent if s['time'] >= since] or [self.recent[-1]])
+        parts = [r for r in self.rollups if r['time'] >= since]
+        if self._pending:
+            parts.append(self._rollup(self._pending))
+        result = {}
+        for field in FIELDS:
+            values = [p[field] for p in parts if p[field] is not None]
+            if not values:
+                result[field] = None
+                continue
+            result[field] = (min(v[0] for v in values), sum(v[1] for v in values) / len(values), max(v[2] for v in values))
+        return result
+
+    def _open(self):
+        import psutil
+        self.psutil = psutil
+        self.process = psutil.Process()
+        # Prime the CPU counters so the first real sample covers one interval
+        psutil.cpu_percent(interval=None)
+        self.process.cpu_percent(interval=None)
+
+    async def _sample_loop(self):
+        loop = asyncio.get_running_loop()
+        if self.psutil is None:
+            # Import psutil and prime its counters just after startup rather than during it
+            await asyncio.sleep(min(self.interval, STARTUP_GRACE))
+            self._open()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, loop.time() - expected) * 1000
+            try:
+                self.record(self.sample(lag_ms))
+            except Exception as e:
+                logger.warning(f"Metrics sample failed: {e}")
@@ -0,0 +1,210 @@
+"""Durable mood journal with write-behind batching and incremental rollups"""
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger("mochabot.mood")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mood_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    guild_id INTEGER,
+    mood INTEGER NOT NULL,
+    notes TEXT,
+    logged_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mood_entries_user_time ON mood_entries (user_id, logged_at);
+
+CREATE TABLE IF NOT EXISTS mood_daily (
+    user_id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    min_mood INTEGER NOT NULL,
+    max_mood INTEGER NOT NULL,
+    PRIMARY KEY (user_id, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS mood_weekly (
+    user_id INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    min_mood INTEGER NOT NULL,
+    max_mood INTEGER NOT NULL,
+    PRIMARY KEY (user_id, week)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS mood_streaks (
+    user_id INTEGER PRIMARY KEY,
+    last_day INTEGER NOT NULL,
+    current INTEGER NOT NULL,
+    best INTEGER NOT NULL
+);
+"""
+
+UPSERT_DAILY = """
+INSERT INTO mood_daily (user_id, day, count, total, min_mood, max_mood) VALUES (?, ?, 1, ?, ?, ?)
+ON CONFLICT (user_id, day) DO UPDATE SET
+    count = count + 1,
+    total = total + excluded.total,
+    min_mood = MIN(min_mood, excluded.min_mood),
+    max_mood = MAX(max_mood, excluded.max_mood)
+"""
+
+UPSERT_WEEKLY = """
+INSERT INTO mood_weekly (user_id, week, count, total, min_mood, max_mood) VALUES (?, ?, 1, ?, ?, ?)
+ON CONFLICT (user_id, week) DO UPDATE SET
+    count = count + 1,
+    total = total + excluded.total,
+    min_mood = MIN(min_mood, excluded.min_mood),
+    max_mood = MAX(max_mood, excluded.max_mood)
+"""
+
+
+def day_number(timestamp):
+    """UTC day index since the Unix epoch"""
+    return int(timestamp // 86400)
+
+
+def week_number(day):
+    """Monday-based week index (epoch day 0 was a Thursday)"""
+    return (day + 3) // 7
+
+
+class MoodStore:
+    """Mood entries plus daily/weekly aggregates and streaks, kept in step on write
+
+    `log()` only enqueues; a writer task commits queued entries in one
+    transaction per batch, so a burst of `!mood` calls costs one fsync.
+    Stats are read from the aggregate tables, never from raw entries.
+    """
+
+    def __init__(self, db, batch_size=200, flush_interval=1.0):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._writer_loop(), name='mood-writer')
+
+    async def stop(self):
+        """Stop the writer and commit anything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def log(self, user_id, guild_id, mood, notes=None, logged_at=None):
+        """Queue an entry for the next batch; never waits on disk"""
+        self._queue.append((user_id, guild_id, mood, notes, time.time() if logged_at is None else logged_at))
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        async with self._flush_lock:
+            while self._queue:
+                batch, self._queue = self._queue[:self.batch_size], self._queue[self.batch_size:]
+                try:
+                    await self.db.run(self._write_batch, batch)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(batch)} mood entries: {e}")
+                    self._queue[:0] = batch
+                    raise
+
+    async def _writer_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                await asyncio.sleep(self.flush_interval)
+
+    @staticmethod
+    def _write_batch(conn, batch):
+        conn.executemany(
+            'INSERT INTO mood_entries (user_id, guild_id, mood, notes, logged_at) VALUES (?, ?, ?, ?, ?)',
+            batch
+        )
+        daily, weekly, days_by_user = [], [], {}
+        for user_id, _, mood, _, logged_at in batch:
+            day = day_number(logged_at)
+            daily.append((user_id, day, mood, mood, mood))
+            weekly.append((user_id, week_number(day), mood, mood, mood))
+            days_by_user.setdefault(user_id, []).append(day)
+        conn.executemany(UPSERT_DAILY, daily)
+        conn.executemany(UPSERT_WEEKLY, weekly)
+
+        streaks = []
+        for user_id, days in days_by_user.items():
+            row = conn.execute(
+                'SELECT last_day, current, best FROM mood_streaks WHERE user_id = ?', (user_id,)
+            ).fetchone()
+            last_day, current, best = row if row else (None, 0, 0)
+            for day in sorted(days):
+                if last_day is None or day > last_day + 1:
+                    current = 1
+                elif day == last_day + 1:
+                    current += 1
+                else:
+                    continue  # Same day (or backdated): the streak is unchanged
+                last_day = day
+                best = max(best, current)
+            streaks.append((user_id, last_day, current, best))
+        conn.executemany(
+            'INSERT OR REPLACE INTO mood_streaks (user_id, last_day, current, best) VALUES (?, ?, ?, ?)',
+            streaks
+        )
+
+    async def stats(self, user_id, days, now=None):
+        """Count/mean/min/max over the last `days` days, weekly averages and streaks"""
+        # Anything still queued belongs in the answer, so commit it first
+        if self._queue:
+            await self.flush()
+        today = day_number(time.time() if now is None else now)
+        first_day = today - days + 1
+        return await self.db.run(self._read_stats, user_id, first_day, today)
+
+    @staticmethod
+    def _read_stats(conn, user_id, first_day, today):
+        count, total, lowest, highest = conn.execute(
+            'SELECT SUM(count), SUM(total), MIN(min_mood), MAX(max_mood) FROM mood_daily '
+            'WHERE user_id = ? AND day BETWEEN ? AND ?',
+            (user_id, first_day, today)
+        ).fetchone()
+        weeks = conn.execute(
+            'SELECT week, count, total FROM mood_weekly WHERE user_id = ? AND week BETWEEN ? AND ? ORDER BY week',
+            (user_id, week_number(first_day), week_number(today))
+        ).fetchall()
+        streak = conn.execute(
+            'SELECT last_day, current, best FROM mood_streaks WHERE user_id = ?', (user_id,)
+        ).fetchone()
+        current = best = 0
+        if streak:
+            last_day, current, best = streak
+            if today - last_day > 1:
+                current = 0  # Missed a whole day: the streak is broken
+        return {
+            'count': count or 0,
+            'mean': (total / count) if count else None,
+            'min': lowest,
+            'max': highest,
+            # (first day of the week, entries, average)
+            'weekly': [(week * 7 - 3, week_count, week_total / week_count) for week, week_count, week_total in weeks],
+            'current_streak': current,
+            'best_streak': best,
+        }
@@ -0,0 +1,159 @@
+"""Per-command latency histograms in fixed memory, with error counts and rates, for !perf"""
+
+import math
+import time
+from collections import deque
+
+# Latency buckets grow 20% at a time from 0.5ms, so a reported percentile is
+# within 10% of the true value; everything past the last bucket (~2 min) lands in it
+MIN_LATENCY = 0.0005
+GROWTH = 1.2
+BUCKETS = 70
+_LOG_GROWTH = math.log(GROWTH)
+
+# (slot seconds, slots kept): minute slots for the last 5m, 5-minute slots for
+# the last hour and hourly ones for the last day, each with one extra for the slot in progress
+TIERS = ((60, 6), (300, 13), (3600, 25))
+WINDOWS = {'5m': 300, '1h': 3600, '24h': 86400}
+
+
+def bucket_of(seconds):
+    if seconds <= MIN_LATENCY:
+        return 0
+    return min(BUCKETS - 1, math.ceil(math.log(seconds / MIN_LATENCY) / _LOG_GROWTH))
+
+
+def bucket_value(bucket):
+    """The geometric middle of a bucket in seconds, what its calls are reported as"""
+    return MIN_LATENCY * GROWTH ** (bucket - 0.5)
+
+
+class Histogram:
+    """Counts per latency bucket (only the ones used), plus count, errors, total and max"""
+
+    __slots__ = ('counts', 'count', 'errors', 'total', 'max')
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, bucket, seconds, failed):
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, q):
+        """Latency in seconds that `q` (0-1) of calls were at or under; None when empty"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(bucket_value(bucket), self.max)
+        return self.max
+
+
+class LatencySeries:
+    """One histogram per time slot in each tier, for a command or event handler; old slots fall off the end"""
+
+    __slots__ = ('tiers',)
+
+    def __init__(self):
+        self.tiers = [deque(maxlen=kept) for _, kept in TIERS]
+
+    def record(self, now, seconds, failed):
+        bucket = bucket_of(seconds)
+        for (slot, _), slots in zip(TIERS, self.tiers):
+            start = now - now % slot
+            if not slots or slots[-1][0] != start:
+                slots.append((start, Histogram()))
+            slots[-1][1].add(bucket, seconds, failed)
+
+    def window(self, seconds, now):
+        """Everything recorded in the last `seconds`, give or take one slot of the tier that covers it"""
+        tier = next((i for i, (slot, kept) in enumerate(TIERS) if slot * (kept - 1) >= seconds), len(TIERS) - 1)
+        slot = TIERS[tier][0]
+        merged = Histogram()
+        for start, histogram in self.tiers[tier]:
+            if start + slot > now - seconds:
+                merged.merge(histogram)
+        return merged
+
+
+class CommandStats:
+    """Latency, errors and call rates for every command, for leaving on in production
+
+    `started(ctx)` and `finished(ctx)` are the bot's before/after invoke hooks;
+    together they cost a couple of microseconds per command. Each command keeps
+    at most 44 slot histograms of at most BUCKETS counters, so memory is
+    bounded by the number of commands, not by how often they run.
+    """
+
+    def __init__(self):
+        self.series = {}  # qualified command name -> LatencySeries
+        self.cogs = {}  # qualified command name -> cog name
+        self.since = time.time()
+
+    def started(self, ctx):
+        ctx.perf_started = time.perf_counter()
+
+    def finished(self, ctx):
+        started = getattr(ctx, 'perf_started', None)
+        if started is None or ctx.command is None:
+            return
+        self.record(ctx.command.qualified_name, ctx.cog.qualified_name if ctx.cog else None,
+                    time.perf_counter() - started, ctx.command_failed)
+
+    def record(self, name, cog, seconds, failed=False, now=None):
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = LatencySeries()
+            self.cogs[name] = cog
+        series.record(time.time() if now is None else now, seconds, failed)
+
+    def report(self, window='5m', limit=10, now=None):
+        """Slowest commands by p95 over a window: (name, cog, histogram, calls per minute)"""
+        seconds = WINDOWS[window]
+        now = time.time() if now is None else now
+        # Rates are over the time actually covered (at least a minute), so they aren't diluted right after a restart
+        covered = max(60.0, min(seconds, now - self.since))
+        rows = []
+        for name, series in self.series.items():
+            histogram = series.window(seconds, now)
+            if histogram.count:
+                rows.append((name, self.cogs[name], histogram, histogram.count * 60 / covered))
+        rows.sort(key=lambda row: row[2].percentile(0.95), reverse=True)
+        return rows[:limit]
+
+    def by_cog(self, window='5m', now=None):
+        """{cog name: every command in it merged into one histogram} over a window"""
+        now = time.time() if now is None else now
+        cogs = {}
+        for name, series in self.series.items():
+            histogram = series.window(WINDOWS[window], now)
+            if histogram.count:
+                cogs.setdefault(self.cogs[name] or 'No cog', Histogram()).merge(histogram)
+        return cogs
+
+    def totals(self, window='5m', now=None):
+        merged = Histogram()
+        for histogram in self.by_cog(window, now).values():
+            merged.merge(histogram)
+        return merged
@@ -0,0 +1,203 @@
+"""Button polls: in-memory tallies persisted to SQLite, debounced message edits, timed close"""
+
+import asyncio
+import heapq
+import json
+import logging
+import time
+
+logger = logging.getLogger("mochabot.polls")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS polls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER,
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER,
+    author_id INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    options TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    closes_at REAL NOT NULL,
+    closed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_polls_open ON polls (closed, closes_at);
+
+CREATE TABLE IF NOT EXISTS poll_votes (
+    poll_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    option INTEGER NOT NULL,
+    PRIMARY KEY (poll_id, user_id)
+) WITHOUT ROWID;
+"""
+
+# Upper bound on a single dispatcher sleep, so wall-clock jumps are noticed
+MAX_SLEEP = 300.0
+
+
+class Poll:
+    """One poll's state; `tallies[i]` always equals the number of votes for option i"""
+
+    def __init__(self, poll_id, guild_id, channel_id, message_id, author_id, question, options, closes_at, closed=False):
+        self.id = poll_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.author_id = author_id
+        self.question = question
+        self.options = options
+        self.closes_at = closes_at
+        self.closed = closed
+        self.votes = {}  # user_id -> option index
+        self.tallies = [0] * len(options)
+        self.last_edit = 0.0
+
+    @property
+    def total(self):
+        return len(self.votes)
+
+    def winners(self):
+        best = max(self.tallies)
+        return [option for option, count in zip(self.options, self.tallies) if count == best] if best else []
+
+
+class PollManager:
+    """Owns every open poll: votes, persistence, message refreshes and closing
+
+    Votes update the in-memory tallies and are written straight to SQLite
+    (one small upsert each on the database thread). Message edits go through
+    `refresh(poll)`, a coroutine function supplied by the cog, at most once per
+    `edit_interval` seconds per poll: the first vote after a quiet spell edits
+    right away, and votes during the cool-down are folded into one trailing
+    edit. Polls close from one dispatcher task, like reminders, and closing
+    triggers a final `refresh`. `owns(guild_id)` limits which open polls are
+    restored when several processes share the database.
+    """
+
+    def __init__(self, db, refresh, edit_interval=10.0, owns=None):
+        self.db = db
+        self.refresh = refresh
+        self.edit_interval = edit_interval
+        self.owns = owns
+        self.polls = {}  # open polls by id
+        self._edits = {}  # poll id -> pending refresh task
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.edits = 0
+
+    async def load(self):
+        """Create the tables and restore open polls with their votes"""
+        await self.db.executescript(SCHEMA)
+        rows = await self.db.fetchall(
+            'SELECT id, guild_id, channel_id, message_id, author_id, question, options, closes_at '
+            'FROM polls WHERE closed = 0 AND message_id IS NOT NULL'
+        )
+        for poll_id, guild_id, channel_id, message_id, author_id, question, options, closes_at in rows:
+            if self.owns is not None and not self.owns(guild_id):
+                continue
+            poll = Poll(poll_id, guild_id, channel_id, message_id, author_id, question, json.loads(options), closes_at)
+            self.polls[poll_id] = poll
+            heapq.heappush(self._heap, (closes_at, poll_id))
+        if self.polls:
+            placeholders = ','.join('?' * len(self.polls))
+            for poll_id, user_id, option in await self.db.fetchall(
+                    f'SELECT poll_id, user_id, option FROM poll_votes WHERE poll_id IN ({placeholders})',
+                    list(self.polls)):
+                poll = self.polls[poll_id]
+                poll.votes[user_id] = option
+                poll.tallies[option] += 1
+        logger.info(f"📊 Loaded {len(self.polls)} open polls")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._dispatch_loop(), name='poll-dispatcher')
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._edits.values():
+            task.cancel()
+        self._edits.clear()
+
+    async def create(self, guild_id, channel_id, author_id, question, options, closes_at):
+        poll_id, _ = await self.db.execute(
+            'INSERT INTO polls (guild_id, channel_id, author_id, question, options, created_at, closes_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (guild_id, channel_id, author_id, question, json.dumps(options), time.time(), closes_at)
+        )
+        return Poll(poll_id, guild_id, channel_id, None, author_id, question, options, closes_at)
+
+    async def attach(self, poll, message_id):
+        """Start tracking a poll once its message has been sent"""
+        await self.db.execute('UPDATE polls SET message_id = ? WHERE id = ?', (message_id, poll.id))
+        poll.message_id = message_id
+        poll.last_edit = time.monotonic()
+        self.polls[poll.id] = poll
+        heapq.heappush(self._heap, (poll.closes_at, poll.id))
+        if self._heap[0][1] == poll.id:
+            self._wakeup.set()
+
+    async def vote(self, poll, user_id, option):
+        """Record a user's vote; returns their previous option index (None if first vote)"""
+        previous = poll.votes.get(user_id)
+        if previous == option or poll.closed:
+            return previous
+        poll.votes[user_id] = option
+        poll.tallies[option] += 1
+        if previous is not None:
+            poll.tallies[previous] -= 1
+        await self.db.execute(
+            'INSERT OR REPLACE INTO poll_votes (poll_id, user_id, option) VALUES (?, ?, ?)',
+            (poll.id, user_id, option)
+        )
+        self.request_refresh(poll)
+        return previous
+
+    def request_refresh(self, poll):
+        if poll.id not in self._edits:
+            delay = max(0.0, poll.last_edit + self.edit_interval - time.monotonic())
+            self._edits[poll.id] = asyncio.create_task(self._refresh_later(poll, delay))
+
+    async def _refresh_later(self, poll, delay):
+        await asyncio.sleep(delay)
+        # Votes arriving while the edit is in flight schedule the next one
+        del self._edits[poll.id]
+        poll.last_edit = time.monotonic()
+        await self._refresh(poll)
+
+    async def _refresh(self, poll):
+        self.edits += 1
+        try:
+            await self.refresh(poll)
+        except Exception as e:
+            logger.warning(f"Couldn't update poll #{poll.id}: {e}")
+
+    async def close(self, poll):
+        """Close a poll now and render its final results; False if it was already closed"""
+        if poll.closed:
+            return False
+        poll.closed = True
+        self.polls.pop(poll.id, None)
+        pending = self._edits.pop(poll.id, None)
+        if pending:
+            pending.cancel()
+        await self.db.execute('UPDATE polls SET closed = 1 WHERE id = ?', (poll.id,))
+        await self._refresh(poll)
+        return True
+
+    async def _dispatch_loop(self):
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                _, poll_id = heapq.heappop(self._heap)
+                poll = self.polls.get(poll_id)
+                if poll:
+                    await self.close(poll)
+            delay = min(self._heap[0][0] - now, MAX_SLEEP) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,97 @@
+"""Background prefetch buffers for random-content APIs"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger("mochabot.prefetch")
+
+# Running buffers by name, so diagnostics can report on all of them
+BUFFERS = {}
+
+
+class PrefetchBuffer:
+    """Ring buffer of ready items, topped up by one background task
+
+    `fetch` is a coroutine function returning a single item (or raising on
+    failure). Commands call `pop()`, which never waits on the network.
+    """
+
+    def __init__(self, name, fetch, size=10, low_water=3, max_backoff=300.0):
+        self.name = name
+        self.fetch = fetch
+        self.size = size
+        self.low_water = low_water
+        self.max_backoff = max_backoff
+        self.items = deque(maxlen=size)
+        self.served = 0
+        self.empty_hits = 0
+        self.failures = 0
+        self.last_refill_ms = None
+        self.avg_refill_ms = None
+        self._wanted = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        """Start the refill task and register the buffer"""
+        if self._task is None or self._task.done():
+            self._wanted.set()
+            self._task = asyncio.create_task(self._refill_loop(), name=f'prefetch-{self.name}')
+        BUFFERS[self.name] = self
+
+    def stop(self):
+        """Cancel the refill task and unregister the buffer"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if BUFFERS.get(self.name) is self:
+            del BUFFERS[self.name]
+
+    def pop(self):
+        """Return a ready item in O(1), or None when the buffer is empty"""
+        try:
+            item = self.items.popleft()
+        except IndexError:
+            self.empty_hits += 1
+            self._wanted.set()
+            return None
+        self.served += 1
+        if len(self.items) < self.low_water:
+            self._wanted.set()
+        return item
+
+    def stats(self):
+        return {
+            'depth': len(self.items),
+            'size': self.size,
+            'served': self.served,
+            'empty_hits': self.empty_hits,
+            'failures': self.failures,
+            'last_refill_ms': self.last_refill_ms,
+            'avg_refill_ms': self.avg_refill_ms,
+        }
+
+    async def _refill_loop(self):
+        backoff = 1.0
+        while True:
+            await self._wanted.wait()
+            # Clear before filling so a pop() during the fill schedules another pass
+            self._wanted.clear()
+            while len(self.items) < self.size:
+                started = time.perf_counter()
+                try:
+                    item = await self.fetch()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.failures += 1
+                    logger.warning(f"Prefetch '{self.name}' failed ({e!r}); retrying in {backoff:.0f}s")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self.max_backoff)
+                    continue
+                backoff = 1.0
+                elapsed = (time.perf_counter() - started) * 1000
+                self.last_refill_ms = elapsed
+                self.avg_refill_ms = elapsed if self.avg_refill_ms is None else 0.8 * self.avg_refill_ms + 0.2 * elapsed
+                self.items.append(item)
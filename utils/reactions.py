@@ -0,0 +1,47 @@
+"""Background reaction adding for commands that react with several emoji"""
+
+import asyncio
+import logging
+
+import discord
+
+logger = logging.getLogger("mochabot.reactions")
+
+# Running appliers; holding a reference keeps them from being garbage collected mid-flight
+_RUNNING = set()
+
+
+def apply_reactions(message, emojis):
+    """Add `emojis` to `message` in order without making the caller wait
+
+    The reactions go out one after another from a background task. Discord's
+    reaction bucket only allows about one request per quarter second per
+    channel, so firing them all at once gains nothing and lets discord.py's
+    rate-limit queue reorder them; the command just no longer waits for them.
+    If the message is deleted midway the rest are skipped.
+
+    Returns a task whose result is the list of `(emoji, error)` pairs that
+    failed; failures are also logged. Callers that don't care can ignore it.
+    """
+    task = asyncio.create_task(_apply(message, list(emojis)))
+    _RUNNING.add(task)
+    task.add_done_callback(_RUNNING.discard)
+    return task
+
+
+async def _apply(message, emojis):
+    failures = []
+    for i, emoji in enumerate(emojis):
+        try:
+            await message.add_reaction(emoji)
+        except discord.NotFound as e:
+            # Message is gone; every remaining reaction would fail the same way
+            failures.extend((rest, e) for rest in emojis[i:])
+            break
+        except Exception as e:
+            failures.append((emoji, e))
+    if failures:
+        missing = ', '.join(f'{emoji} ({type(error).__name__})' for emoji, error in failures)
+        level = logging.INFO if all(isinstance(e, (discord.Forbidden, discord.NotFound)) for _, e in failures) else logging.WARNING
+        logger.log(level, f"😶 {len(failures)}/{len(emojis)} reactions failed on message {message.id}: {missing}")
+    return failures
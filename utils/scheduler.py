@@ -0,0 +1,160 @@
+"""Persistent reminder scheduler: SQLite storage, a min-heap and one dispatcher task"""
+
+import asyncio
+import heapq
+import logging
+import time
+
+logger = logging.getLogger("mochabot.scheduler")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reminders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    channel_id INTEGER,
+    guild_id INTEGER,
+    message TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    due_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_user_due ON reminders (user_id, due_at);
+"""
+
+# Upper bound on a single dispatcher sleep, so wall-clock jumps are noticed
+MAX_SLEEP = 300.0
+# A batch that failed (e.g. the database was locked) is tried again this much later
+RETRY_DELAY = 60.0
+
+
+class ReminderScheduler:
+    """Fires due reminders in batches from a single task
+
+    Only `(due_at, id)` pairs live in memory; the reminder text is read from
+    SQLite when a batch fires. Cancelling just deletes the row, and the stale
+    heap entry is skipped when it comes due. Reminders that fell due while
+    the bot was offline fire on the first pass after `load()`.
+
+    `deliver` is a coroutine function called with a list of
+    `(id, user_id, channel_id, guild_id, message, created_at, due_at)` rows.
+    When several processes share the database, `owns(guild_id)` picks the
+    reminders this one loads, so each fires exactly once.
+    """
+
+    def __init__(self, db, deliver, batch_size=100, owns=None):
+        self.db = db
+        self.deliver = deliver
+        self.owns = owns
+        self.batch_size = batch_size
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.fired = 0
+
+    async def load(self):
+        """Create the table and load every pending reminder into the heap"""
+        await self.db.executescript(SCHEMA)
+        rows = await self.db.fetchall('SELECT due_at, id, guild_id FROM reminders')
+        self._heap = [(due_at, reminder_id) for due_at, reminder_id, guild_id in rows
+                      if self.owns is None or self.owns(guild_id)]
+        heapq.heapify(self._heap)
+        overdue = sum(1 for due_at, _ in self._heap if due_at <= time.time())
+        logger.info(f"⏰ Loaded {len(self._heap)} pending reminders ({overdue} overdue)")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._dispatch_loop(), name='reminder-dispatcher')
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    async def schedule(self, user_id, channel_id, guild_id, message, due_at):
+        """Persist a reminder and queue it; returns the reminder id"""
+        reminder_id, _ = await self.db.execute(
+            'INSERT INTO reminders (user_id, channel_id, guild_id, message, created_at, due_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (user_id, channel_id, guild_id, message, time.time(), due_at)
+        )
+        self._push(due_at, reminder_id)
+        return reminder_id
+
+    def _push(self, due_at, reminder_id):
+        heapq.heappush(self._heap, (due_at, reminder_id))
+        # Only a new earliest deadline changes how long the dispatcher should sleep
+        if self._heap[0][1] == reminder_id:
+            self._wakeup.set()
+
+    async def cancel(self, user_id, reminder_id):
+        """Delete one of a user's reminders; returns True if it existed"""
+        _, rowcount = await self.db.execute(
+            'DELETE FROM reminders WHERE id = ? AND user_id = ?', (reminder_id, user_id)
+        )
+        return rowcount > 0
+
+    async def pending_for(self, user_id, limit=10):
+        return await self.db.fetchall(
+            'SELECT id, message, due_at FROM reminders WHERE user_id = ? ORDER BY due_at LIMIT ?',
+            (user_id, limit)
+        )
+
+    async def count_for(self, user_id):
+        row = await self.db.fetchone('SELECT COUNT(*) FROM reminders WHERE user_id = ?', (user_id,))
+        return row[0]
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    async def fire_due(self, now=None):
+        """Fire one batch of due reminders; returns how many were delivered
+
+        A reminder's row is only deleted once it has been delivered. If any
+        step fails, the whole batch goes back on the heap RETRY_DELAY seconds
+        out and the error is raised.
+        """
+        now = time.time() if now is None else now
+        ids = self._pop_due(now)
+        if not ids:
+            return 0
+        try:
+            placeholders = ','.join('?' * len(ids))
+            rows = await self.db.fetchall(
+                'SELECT id, user_id, channel_id, guild_id, message, created_at, due_at '
+                f'FROM reminders WHERE id IN ({placeholders})', ids
+            )
+            if rows:
+                await self.deliver(rows)
+                await self.db.executemany('DELETE FROM reminders WHERE id = ?', [(row[0],) for row in rows])
+        except Exception:
+            for reminder_id in ids:
+                heapq.heappush(self._heap, (now + RETRY_DELAY, reminder_id))
+            raise
+        self.fired += len(rows)
+        return len(rows)
+
+    async def _dispatch_loop(self):
+        failures = 0
+        while True:
+            self._wakeup.clear()
+            if self._heap and self._heap[0][0] <= time.time():
+                try:
+                    await self.fire_due()
+                    failures = 0
+                except Exception as e:
+                    # Keep dispatching; a dead task would mean no reminder fires until restart
+                    failures += 1
+                    backoff = min(2 ** failures, RETRY_DELAY)
+                    logger.error(f"Reminder batch failed, trying it again in {RETRY_DELAY:.0f}s: {e!r}")
+                    await asyncio.sleep(backoff)
+                continue
+            delay = min(self._heap[0][0] - time.time(), MAX_SLEEP) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
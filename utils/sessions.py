@@ -0,0 +1,154 @@
+"""Interactive message sessions routed by (message_id, user_id), with one shared timeout heap"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter
+
+logger = logging.getLogger("mochabot.sessions")
+
+# Upper bound on a single timeout sleep, like the other dispatchers
+MAX_SLEEP = 300.0
+
+
+class Session:
+    """One interactive message and who may use it (user_id None means anyone)"""
+
+    __slots__ = ('message_id', 'user_id', 'kind', 'timeout', 'sliding', 'expires',
+                 'on_component', 'on_timeout', 'closed')
+
+    def __init__(self, message_id, user_id, kind, timeout, sliding, on_component, on_timeout):
+        self.message_id = message_id
+        self.user_id = user_id
+        self.kind = kind
+        self.timeout = timeout
+        self.sliding = sliding
+        self.expires = time.monotonic() + timeout if timeout is not None else None
+        self.on_component = on_component
+        self.on_timeout = on_timeout
+        self.closed = False
+
+
+class SessionRouter:
+    """Delivers button presses to the session that owns the message
+
+    Sessions are keyed by message id and then user id, so routing a press is
+    at most two dict lookups (the user's own session, then one open to
+    anyone) however many sessions are live; no per-session predicate ever
+    runs. Timeouts share one heap watched by a single task. A sliding
+    session's deadline is pushed back by every press, the way a discord.py
+    View's timeout is; a fixed one (a trivia round) ends on time regardless.
+
+    Handlers are coroutine functions: `on_component(interaction, action)`
+    and `on_timeout()`. Components are DynamicItems whose callback calls
+    `dispatch_component`, so sending one stores nothing per message.
+    """
+
+    def __init__(self):
+        self._sessions = {}  # message_id -> {user_id or None: Session}
+        self._heap = []  # (expires, seq, session); closed sessions drop out when they surface
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._expiring = set()
+        self.live = Counter()  # kind -> live sessions
+        self.opened = 0
+        self.expired = 0
+        self.routed = 0
+
+    def __len__(self):
+        return sum(self.live.values())
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._timeout_loop(), name='session-timeouts')
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._expiring:
+            task.cancel()
+
+    def open(self, message_id, user_id=None, *, kind='session', timeout=180.0, sliding=True,
+             on_component=None, on_timeout=None):
+        """Route presses on `message_id` from `user_id` (anyone if None) to these handlers"""
+        session = Session(message_id, user_id, kind, timeout, sliding, on_component, on_timeout)
+        sessions = self._sessions.setdefault(message_id, {})
+        previous = sessions.get(user_id)
+        if previous is not None:
+            self.close(previous)
+            sessions = self._sessions.setdefault(message_id, {})
+        sessions[user_id] = session
+        self.live[kind] += 1
+        self.opened += 1
+        if timeout is not None:
+            heapq.heappush(self._heap, (session.expires, next(self._seq), session))
+            if self._heap[0][2] is session:
+                self._wakeup.set()
+        return session
+
+    def close(self, session):
+        """Stop routing to a session; its timeout handler won't run"""
+        if session.closed:
+            return
+        session.closed = True
+        sessions = self._sessions.get(session.message_id)
+        if sessions and sessions.get(session.user_id) is session:
+            del sessions[session.user_id]
+            if not sessions:
+                del self._sessions[session.message_id]
+        self.live[session.kind] -= 1
+        if not self.live[session.kind]:
+            del self.live[session.kind]
+
+    def find(self, message_id, user_id):
+        sessions = self._sessions.get(message_id)
+        if not sessions:
+            return None
+        return sessions.get(user_id) or sessions.get(None)
+
+    async def dispatch_component(self, interaction, action):
+        """Hand a button press to its session; False (with the interaction unanswered) if there is none"""
+        message_id = interaction.message.id if interaction.message else None
+        session = self.find(message_id, interaction.user.id)
+        if session is None or session.on_component is None:
+            return False
+        self.routed += 1
+        if session.sliding and session.timeout is not None:
+            # The heap entry stays put; the timeout loop re-files it when it comes up early
+            session.expires = time.monotonic() + session.timeout
+        await session.on_component(interaction, action)
+        return True
+
+    async def _expire(self, session):
+        try:
+            await session.on_timeout()
+        except Exception as e:
+            logger.warning(f"Timeout handler for {session.kind} session on message {session.message_id} failed: {e}")
+
+    async def _timeout_loop(self):
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                _, seq, session = heapq.heappop(self._heap)
+                if session.closed:
+                    continue
+                if session.expires > now:
+                    heapq.heappush(self._heap, (session.expires, seq, session))
+                    continue
+                self.close(session)
+                self.expired += 1
+                if session.on_timeout is not None:
+                    # Run handlers side by side so one slow edit doesn't hold up the rest
+                    task = asyncio.create_task(self._expire(session))
+                    self._expiring.add(task)
+                    task.add_done_callback(self._expiring.discard)
+            delay = min(self._heap[0][0] - now, MAX_SLEEP) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
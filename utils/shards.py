@@ -0,0 +1,132 @@
+"""Per-shard connection health, latency and guild counts"""
+
+import logging
+import math
+import time
+from collections import Counter
+
+import discord
+
+logger = logging.getLogger("mochabot.shards")
+
+STATUS_EMOJI = {'connected': '🟢', 'resumed': '🟢', 'connecting': '🟡', 'disconnected': '🔴'}
+
+
+def format_latency(seconds):
+    # A shard that hasn't heartbeated yet reports inf (or nan before it's connected)
+    return f'{round(seconds * 1000)}ms' if math.isfinite(seconds) else '—'
+
+
+class ShardState:
+    __slots__ = ('status', 'since', 'disconnects', 'resumes')
+
+    def __init__(self):
+        self.status = 'connecting'
+        self.since = time.time()
+        self.disconnects = 0
+        self.resumes = 0
+
+
+class ShardMonitor:
+    """Connection state for each shard this process runs, fed by gateway events
+
+    With AutoShardedBot every shard reports its own connect, disconnect and
+    resume; a plain Bot is treated as shard 0 and reports through the
+    unsharded events instead. Latency always comes from the live gateway
+    connection, and guild counts are tallied on demand from the guild cache.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._states = {}  # shard_id -> ShardState
+
+    @property
+    def sharded(self):
+        return isinstance(self.bot, discord.AutoShardedClient)
+
+    def _state(self, shard_id):
+        state = self._states.get(shard_id)
+        if state is None:
+            state = self._states[shard_id] = ShardState()
+        return state
+
+    def _set(self, shard_id, status):
+        state = self._state(shard_id)
+        state.status = status
+        state.since = time.time()
+        return state
+
+    def connected(self, shard_id):
+        self._set(shard_id, 'connected')
+        logger.info(f"🔌 Shard {shard_id} connected")
+
+    def disconnected(self, shard_id):
+        state = self._state(shard_id)
+        if state.status == 'disconnected':
+            return
+        self._set(shard_id, 'disconnected').disconnects += 1
+        logger.warning(f"📴 Shard {shard_id} disconnected (disconnect #{state.disconnects})")
+
+    def resumed(self, shard_id):
+        self._set(shard_id, 'resumed').resumes += 1
+        logger.info(f"🔁 Shard {shard_id} resumed its session")
+
+    def latency(self, shard_id=0):
+        if self.sharded:
+            shard = self.bot.get_shard(shard_id)
+            return shard.latency if shard else float('nan')
+        return self.bot.latency
+
+    def latencies(self):
+        """(shard_id, seconds) for every shard this process runs"""
+        if self.sharded:
+            return sorted(self.bot.latencies)
+        return [(0, self.bot.latency)]
+
+    def guild_counts(self):
+        return Counter(guild.shard_id for guild in self.bot.guilds)
+
+    def shard_of(self, guild):
+        return guild.shard_id if guild is not None else 0
+
+    def owns(self, guild_id):
+        """Whether this process runs the shard for a guild id; DMs (None) belong to whoever runs shard 0"""
+        shard_ids = getattr(self.bot, 'shard_ids', None)
+        if not shard_ids:
+            return True
+        shard_id = (guild_id >> 22) % self.bot.shard_count if guild_id else 0
+        return shard_id in shard_ids
+
+    def summary(self):
+        """(shard_id, status, latency, guilds, disconnects) for every shard, in id order"""
+        counts = self.guild_counts()
+        rows = []
+        for shard_id, latency in self.latencies():
+            state = self._states.get(shard_id)
+            if self.sharded and self.bot.get_shard(shard_id).is_closed():
+                status = 'disconnected'
+            else:
+                status = state.status if state else 'connecting'
+            rows.append((shard_id, status, latency, counts.get(shard_id, 0), state.disconnects if state else 0))
+        return rows
+
+    def snapshot(self):
+        """This process's guilds, users and shards as plain JSON-friendly data"""
+        return {
+            'guilds': len(self.bot.guilds),
+            'users': len(self.bot.users),
+            'shards': [{'id': shard_id, 'status': status,
+                        'latency': latency if math.isfinite(latency) else None,
+                        'guilds': guilds, 'disconnects': disconnects}
+                       for shard_id, status, latency, guilds, disconnects in self.summary()],
+        }
+
+    def lines(self, limit=10):
+        """One line per shard for an embed field, capped at `limit` with a note for the rest"""
+        rows = self.summary()
+        lines = [f"{STATUS_EMOJI[status]} #{shard_id} • {format_latency(latency)} • {guilds:,} servers"
+                 + (f" • {disconnects} drops" if disconnects else '')
+                 for shard_id, status, latency, guilds, disconnects in rows[:limit]]
+        if len(rows) > limit:
+            lines.append(f"…and {len(rows) - limit} more")
+        return '\n'.join(lines)
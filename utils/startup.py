@@ -0,0 +1,128 @@
+"""Startup timeline: import times, per-cog load times and the road to READY and the first command"""
+
+import builtins
+import contextlib
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger("mochabot.startup")
+
+
+def ms(seconds):
+    return f'{seconds * 1000:.0f}ms'
+
+
+class StartupTimeline:
+    """Timestamps from the moment bot.py starts running to the first command served
+
+    Everything is in seconds since `origin`. While `track_imports()` is on,
+    every first-time import made directly by our code is timed, including
+    whatever it pulls in, so the slow ones show up without `-X importtime`.
+    Cogs load side by side, so each records when its extension started, when
+    its setup() reached add_cog (the end of its import) and when it finished,
+    which keeps import and setup time apart even though they overlap.
+    """
+
+    def __init__(self, origin=None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.phases = []  # (name, start, end)
+        self.marks = {}  # name -> first time it happened
+        self.imports = []  # (importer, module, seconds)
+        self.cogs = {}  # extension -> {'start', 'setup', 'end', 'error'}
+        self._original_import = None
+        self._importing = threading.local()
+
+    def now(self):
+        return time.perf_counter() - self.origin
+
+    def mark(self, name):
+        """Record the first time something happens; True if this was it"""
+        if name in self.marks:
+            return False
+        self.marks[name] = self.now()
+        return True
+
+    def add_phase(self, name, start, end=None):
+        self.phases.append((name, start, self.now() if end is None else end))
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add_phase(name, start)
+
+    def track_imports(self):
+        if self._original_import is not None:
+            return
+        original = self._original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Only the outermost first-time import is timed; what it pulls in is part of its cost
+            if level or name in sys.modules or getattr(self._importing, 'active', False):
+                return original(name, globals, locals, fromlist, level)
+            self._importing.active = True
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self._importing.active = False
+                importer = (globals or {}).get('__name__', '?')
+                self.imports.append((importer, name, time.perf_counter() - start))
+
+        builtins.__import__ = timed_import
+
+    def stop_tracking_imports(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def cog_started(self, extension):
+        self.cogs[extension] = {'start': self.now(), 'setup': None, 'end': None, 'error': None}
+
+    def cog_setup(self, module):
+        """A cog from `module` reached add_cog: its extension is imported and setup() is running"""
+        entry = self.cogs.get(module)
+        if entry is not None and entry['setup'] is None and entry['end'] is None:
+            entry['setup'] = self.now()
+
+    def cog_finished(self, extension, error=None):
+        entry = self.cogs[extension]
+        entry['end'] = self.now()
+        entry['error'] = str(error) if error else None
+
+    def slowest_imports(self, limit=8):
+        return sorted(self.imports, key=lambda row: row[2], reverse=True)[:limit]
+
+    def timeline_lines(self):
+        """'+start  duration  name' for each phase and mark, in time order"""
+        rows = [(start, f'{ms(end - start):>7}', name) for name, start, end in self.phases]
+        rows += [(at, f'{"":>7}', name) for name, at in self.marks.items()]
+        return [f'+{ms(start):>7} {duration}  {name}' for start, duration, name in sorted(rows)]
+
+    def cog_lines(self):
+        lines = []
+        for extension, entry in sorted(self.cogs.items(), key=lambda item: item[1]['start']):
+            if entry['end'] is None:
+                lines.append(f'{extension}: still loading')
+                continue
+            setup = entry['setup'] if entry['setup'] is not None else entry['end']
+            line = (f'{extension}: import {ms(setup - entry["start"])}, setup {ms(entry["end"] - setup)} '
+                    f'(+{ms(entry["start"])} to +{ms(entry["end"])})')
+            lines.append(line + (f' ❌ {entry["error"]}' if entry['error'] else ''))
+        return lines
+
+    def import_lines(self, limit=8):
+        return [f'{module} {ms(seconds)} (from {importer})' for importer, module, seconds in self.slowest_imports(limit)]
+
+    def report(self):
+        lines = ['⏱️ Startup timeline:']
+        lines += [f'    {line}' for line in self.timeline_lines()]
+        lines.append('  Cogs (loaded concurrently):')
+        lines += [f'    {line}' for line in self.cog_lines()]
+        lines.append('  Slowest imports:')
+        lines += [f'    {line}' for line in self.import_lines()]
+        return '\n'.join(lines)
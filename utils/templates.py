@@ -0,0 +1,48 @@
+"""Prebuilt embed templates for static informational commands"""
+
+from datetime import datetime
+
+import discord
+
+
+class EmbedTemplates:
+    """Embeds built once per (name, key) and handed out as cheap copies
+
+    A builder is a function `builder(key) -> discord.Embed`. Every key passed
+    to `register()` is built straight away and kept as its slot values;
+    `render()` sets those on a bare Embed (much cheaper than `copy.copy` or
+    `Embed.copy`) and adds a fresh timestamp. When the underlying content changes, `clear()`
+    and register again. Copies share their field list with the template,
+    so callers may set the timestamp, footer, author or thumbnail (which
+    replace attributes) but must not add or edit fields.
+    """
+
+    def __init__(self):
+        self._keys = {}
+        self._cache = {}
+
+    def register(self, name, builder, keys=(None,)):
+        self._keys[name] = tuple(keys)
+        for key in self._keys[name]:
+            embed = builder(key)
+            self._cache[(name, key)] = tuple(
+                (slot, getattr(embed, slot)) for slot in discord.Embed.__slots__ if hasattr(embed, slot)
+            )
+
+    def render(self, name, key=None):
+        """Copy of the template for `key`, or None if there isn't one"""
+        template = self._cache.get((name, key))
+        if template is None:
+            return None
+        embed = object.__new__(discord.Embed)
+        for slot, value in template:
+            object.__setattr__(embed, slot, value)
+        embed.timestamp = datetime.utcnow()
+        return embed
+
+    def keys(self, name):
+        return self._keys.get(name, ())
+
+    def clear(self):
+        self._keys.clear()
+        self._cache.clear()
@@ -0,0 +1,291 @@
+"""Trivia: an indexed question bank, multiplayer games run as router sessions, and a leaderboard"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+
+logger = logging.getLogger("mochabot.trivia")
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+POINTS = {'easy': 10, 'medium': 20, 'hard': 30}
+# Bonus for answering instantly, shrinking to nothing at the buzzer
+SPEED_BONUS = 10
+MAX_OPTIONS = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trivia_scores (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    answered INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_trivia_scores_rank ON trivia_scores (guild_id, points DESC);
+"""
+
+UPSERT_SCORE = """
+INSERT INTO trivia_scores (guild_id, user_id, points, correct, answered) VALUES (?, ?, ?, ?, 1)
+ON CONFLICT (guild_id, user_id) DO UPDATE SET
+    points = points + excluded.points,
+    correct = correct + excluded.correct,
+    answered = answered + 1
+"""
+
+
+def questions_path():
+    """Resolve the question bank from TRIVIA_QUESTIONS (data/trivia_questions.json by default)"""
+    default = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'trivia_questions.json')
+    return os.getenv('TRIVIA_QUESTIONS', default)
+
+
+def _problem(question):
+    """Why a raw question can't be used, or None if it's fine"""
+    if not isinstance(question, dict):
+        return 'not an object'
+    for field in ('category', 'difficulty', 'question', 'answer', 'explanation'):
+        if not isinstance(question.get(field), str) or not question[field].strip():
+            return f'missing {field}'
+    options = question.get('options')
+    if not isinstance(options, list) or not 2 <= len(options) <= MAX_OPTIONS:
+        return f'needs 2-{MAX_OPTIONS} options'
+    if any(not isinstance(o, str) or not 0 < len(o) <= 80 for o in options):
+        return 'options must be 1-80 characters'
+    if question['answer'] not in options:
+        return 'answer is not one of the options'
+    if question['difficulty'].lower() not in DIFFICULTIES:
+        return f'difficulty must be one of {", ".join(DIFFICULTIES)}'
+    return None
+
+
+class QuestionBank:
+    """Questions indexed by (category, difficulty), where None in either slot means any
+
+    Every combination is indexed up front, so picking a question is a dict
+    lookup and a random choice no matter how large the bank is.
+    """
+
+    def __init__(self, questions=()):
+        self.questions = list(questions)
+        self._index = {}
+        for i, question in enumerate(self.questions):
+            category, difficulty = question['category'], question['difficulty']
+            for key in ((category, difficulty), (category, None), (None, difficulty), (None, None)):
+                self._index.setdefault(key, []).append(i)
+        self.categories = sorted({question['category'] for question in self.questions})
+
+    @classmethod
+    def load(cls, path=None):
+        """Read a JSON list of questions; malformed entries are logged and skipped"""
+        path = path or questions_path()
+        with open(path, encoding='utf-8') as f:
+            raw = json.load(f)
+        if not isinstance(raw, list):
+            raise ValueError(f'{path} must contain a JSON list of questions')
+        questions = []
+        for n, question in enumerate(raw):
+            problem = _problem(question)
+            if problem:
+                logger.warning(f"Skipping trivia question #{n} in {path}: {problem}")
+                continue
+            questions.append({
+                **question,
+                'category': question['category'].strip().lower(),
+                'difficulty': question['difficulty'].lower(),
+            })
+        return cls(questions)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def count(self, category=None, difficulty=None):
+        return len(self._index.get((category, difficulty), ()))
+
+    def pick(self, category=None, difficulty=None, avoid=()):
+        """Index of a random matching question, trying to skip those in `avoid`; None if nothing matches"""
+        pool = self._index.get((category, difficulty))
+        if not pool:
+            return None
+        for _ in range(5):
+            question_id = random.choice(pool)
+            if question_id not in avoid:
+                break
+        return question_id
+
+
+class TriviaGame:
+    """One question in one channel; anyone can answer once until the timer runs out"""
+
+    def __init__(self, question_id, question, guild_id, channel_id, host_id, duration):
+        self.question_id = question_id
+        self.question = question
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.host_id = host_id
+        self.duration = duration
+        self.message_id = None
+        self.session = None
+        self.started = None
+        self.ends_at = None
+        self.finished = False
+        self.answers = {}  # user_id -> (option index, seconds taken)
+        self.counts = [0] * len(question['options'])
+
+    @property
+    def correct_option(self):
+        return self.question['options'].index(self.question['answer'])
+
+    def points_for(self, option, seconds):
+        if option != self.correct_option:
+            return 0
+        remaining = max(0.0, 1 - seconds / self.duration)
+        return POINTS[self.question['difficulty']] + round(SPEED_BONUS * remaining)
+
+    def results(self):
+        """(user_id, option, seconds, points) for every player, right answers first, fastest first"""
+        rows = [(user_id, option, seconds, self.points_for(option, seconds))
+                for user_id, (option, seconds) in self.answers.items()]
+        rows.sort(key=lambda row: (row[3] == 0, row[2]))
+        return rows
+
+
+class TriviaEngine:
+    """Runs every trivia game: question picking, answers, timing and scores
+
+    Each running game is a fixed-length session on the bot's SessionRouter,
+    open to anyone: answer buttons reach it by message id in one dict lookup
+    however many games are running, and rounds end from the router's single
+    timeout heap. Each answer is handed to `answered(interaction, game,
+    option, previous)` to reply to; finishing a game writes all its players'
+    scores in one transaction and hands the results to
+    `finish(game, results)`. Both are coroutine functions supplied by the cog.
+    """
+
+    def __init__(self, db, sessions, finish, answered, duration=30.0, recent=20):
+        self.db = db
+        self.sessions = sessions
+        self.finish = finish
+        self.answered = answered
+        self.duration = duration
+        self.bank = QuestionBank()
+        self.games = {}  # message_id -> running game
+        self._channels = {}  # channel_id -> running game
+        self._recent = {}  # channel_id -> recently asked question ids
+        self._recent_size = recent
+        self.played = 0
+
+    async def load(self, path=None):
+        """Create the leaderboard table and (re)load the question bank"""
+        await self.db.executescript(SCHEMA)
+        try:
+            self.bank = await asyncio.to_thread(QuestionBank.load, path)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Couldn't load trivia questions: {e}")
+            return
+        logger.info(f"🧠 Loaded {len(self.bank)} trivia questions in {len(self.bank.categories)} categories")
+
+    def stop(self):
+        """Drop every running game without posting results (the cog is going away)"""
+        for game in list(self.games.values()):
+            self.cancel(game)
+
+    def running(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def new_game(self, guild_id, channel_id, host_id, category=None, difficulty=None):
+        """Pick a question for a new game; None if no question matches"""
+        recent = self._recent.setdefault(channel_id, deque(maxlen=self._recent_size))
+        question_id = self.bank.pick(category, difficulty, avoid=recent)
+        if question_id is None:
+            return None
+        recent.append(question_id)
+        return TriviaGame(question_id, self.bank.questions[question_id], guild_id, channel_id, host_id, self.duration)
+
+    def reserve(self, game):
+        """Claim the channel for a game before its message is sent; False if one is already running"""
+        if game.channel_id in self._channels:
+            return False
+        self._channels[game.channel_id] = game
+        return True
+
+    def release(self, game):
+        if self._channels.get(game.channel_id) is game:
+            del self._channels[game.channel_id]
+
+    def attach(self, game, message_id):
+        """Start the clock once the game's message has been sent"""
+        game.message_id = message_id
+        game.started = time.monotonic()
+        game.ends_at = time.time() + game.duration
+        self.games[message_id] = game
+        game.session = self.sessions.open(
+            message_id, kind='trivia', timeout=game.duration, sliding=False,
+            on_component=functools.partial(self._on_answer, game),
+            on_timeout=functools.partial(self._finish, game)
+        )
+
+    def cancel(self, game):
+        """End a game early with no results or scores"""
+        game.finished = True
+        if game.session is not None:
+            self.sessions.close(game.session)
+        self.games.pop(game.message_id, None)
+        self.release(game)
+
+    def answer(self, game, user_id, option):
+        """Lock in a player's answer; returns the option they already locked in, or None"""
+        previous = game.answers.get(user_id)
+        if previous is not None:
+            return previous[0]
+        game.answers[user_id] = (option, time.monotonic() - game.started)
+        game.counts[option] += 1
+        return None
+
+    async def _on_answer(self, game, interaction, option):
+        await self.answered(interaction, game, option, self.answer(game, interaction.user.id, option))
+
+    async def top(self, guild_id, limit=10):
+        """The highest scorers in a guild as (user_id, points, correct, answered), best first"""
+        return await self.db.fetchall(
+            'SELECT user_id, points, correct, answered FROM trivia_scores '
+            'WHERE guild_id = ? ORDER BY points DESC LIMIT ?',
+            (guild_id, limit)
+        )
+
+    async def standing(self, guild_id, user_id):
+        """A player's (rank, points, correct, answered), or None if they haven't played here"""
+        row = await self.db.fetchone(
+            'SELECT points, correct, answered FROM trivia_scores WHERE guild_id = ? AND user_id = ?',
+            (guild_id, user_id)
+        )
+        if row is None:
+            return None
+        ahead, = await self.db.fetchone(
+            'SELECT COUNT(*) FROM trivia_scores WHERE guild_id = ? AND points > ?',
+            (guild_id, row[0])
+        )
+        return (ahead + 1, *row)
+
+    async def _finish(self, game):
+        game.finished = True
+        self.games.pop(game.message_id, None)
+        self.release(game)
+        self.played += 1
+        results = game.results()
+        if game.guild_id is not None and results:
+            try:
+                await self.db.executemany(
+                    UPSERT_SCORE,
+                    [(game.guild_id, user_id, points, int(points > 0)) for user_id, _, _, points in results]
+                )
+            except Exception as e:
+                logger.warning(f"Couldn't save trivia scores for message {game.message_id}: {e}")
+        try:
+            await self.finish(game, results)
+        except Exception as e:
+            logger.warning(f"Couldn't post trivia results for message {game.message_id}: {e}")
@@ -0,0 +1,142 @@
+"""Per-guild local times for the daily wellness reminder"""
+
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta, time as dt_time
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger("mochabot.wellness")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_wellness_times (
+    guild_id INTEGER PRIMARY KEY,
+    minute INTEGER NOT NULL,
+    timezone TEXT NOT NULL
+);
+"""
+
+# Upper bound on a single dispatcher sleep, so wall-clock jumps are noticed
+MAX_SLEEP = 300.0
+
+
+def next_occurrence(minute, timezone, now=None):
+    """Unix time of the next `minute`-past-midnight in `timezone` after `now`"""
+    tz = ZoneInfo(timezone)
+    local_now = datetime.fromtimestamp(time.time() if now is None else now, tz)
+    at = dt_time(minute // 60, minute % 60)
+    candidate = datetime.combine(local_now.date(), at, tzinfo=tz)
+    if candidate <= local_now:
+        candidate = datetime.combine(local_now.date() + timedelta(days=1), at, tzinfo=tz)
+    return candidate.timestamp()
+
+
+class WellnessSchedule:
+    """Fires each configured guild's reminder once a day at its local time
+
+    Same shape as the reminder scheduler: a heap of `(due_at, guild_id)` and
+    one dispatcher task. Entries whose guild was rescheduled or cleared are
+    skipped when they come due. `fire` is a coroutine function called with
+    the list of guild ids that are due together.
+    """
+
+    def __init__(self, db, fire):
+        self.db = db
+        self.fire = fire
+        self._times = {}  # guild_id -> (minute, timezone)
+        self._due = {}  # guild_id -> the due_at of its live heap entry
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._running = set()
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+        for guild_id, minute, timezone in await self.db.fetchall(
+                'SELECT guild_id, minute, timezone FROM guild_wellness_times'):
+            self._times[guild_id] = (minute, timezone)
+            self._push(guild_id)
+        logger.info(f"🌸 Loaded wellness times for {len(self._times)} guilds")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._dispatch_loop(), name='wellness-dispatcher')
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._running:
+            task.cancel()
+
+    def is_scheduled(self, guild_id):
+        return guild_id in self._times
+
+    def get(self, guild_id):
+        """(minute, timezone, next due unix time) for a guild, or None"""
+        if guild_id not in self._times:
+            return None
+        minute, timezone = self._times[guild_id]
+        return minute, timezone, self._due[guild_id]
+
+    async def set(self, guild_id, minute, timezone):
+        """Send this guild's reminder daily at `minute` past midnight, local to `timezone`"""
+        ZoneInfo(timezone)  # raises for unknown zones before anything is stored
+        await self.db.execute(
+            'INSERT OR REPLACE INTO guild_wellness_times (guild_id, minute, timezone) VALUES (?, ?, ?)',
+            (guild_id, minute, timezone)
+        )
+        self._times[guild_id] = (minute, timezone)
+        self._push(guild_id)
+
+    async def clear(self, guild_id):
+        """Return the guild to the shared 12-hour broadcast; False if it had no time set"""
+        if guild_id not in self._times:
+            return False
+        await self.db.execute('DELETE FROM guild_wellness_times WHERE guild_id = ?', (guild_id,))
+        del self._times[guild_id]
+        self._due.pop(guild_id, None)
+        return True
+
+    def _push(self, guild_id, now=None):
+        minute, timezone = self._times[guild_id]
+        due_at = next_occurrence(minute, timezone, now)
+        self._due[guild_id] = due_at
+        heapq.heappush(self._heap, (due_at, guild_id))
+        if self._heap[0] == (due_at, guild_id):
+            self._wakeup.set()
+
+    def pop_due(self, now):
+        """Guild ids due at `now`, each rescheduled for its next day"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, guild_id = heapq.heappop(self._heap)
+            if self._due.get(guild_id) != due_at:
+                continue  # cleared or moved since this entry was pushed
+            due.append(guild_id)
+            self._push(guild_id, now)
+        return due
+
+    async def _fire(self, guild_ids):
+        try:
+            await self.fire(guild_ids)
+        except Exception as e:
+            logger.error(f"Wellness broadcast failed for {len(guild_ids)} guilds: {e}")
+
+    async def _dispatch_loop(self):
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            due = self.pop_due(now)
+            if due:
+                # Run each due group on its own so a long broadcast doesn't hold up the next one
+                task = asyncio.create_task(self._fire(due))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+                continue
+            delay = min(self._heap[0][0] - now, MAX_SLEEP) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass